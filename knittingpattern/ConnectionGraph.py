@@ -0,0 +1,263 @@
+"""A compiled graph of the mesh connections in a knitting pattern.
+
+The :class:`meshes <knittingpattern.Mesh.Mesh>` of a knitting pattern connect
+the :class:`instructions <knittingpattern.Instruction.InstructionInRow>`.
+Following them from instruction to instruction is slow for large patterns.
+A :class:`ConnectionGraph` numbers all instructions and meshes and stores the
+connections in integer arrays in compressed sparse row (CSR) form.
+
+- The instructions have the same numbers as in the
+  :class:`~knittingpattern.PatternArray.PatternArray` of the pattern.
+- The meshes produced by instruction ``i`` have the numbers
+  ``produced_mesh_offsets[i]`` up to ``produced_mesh_offsets[i + 1]``.
+- The meshes consumed by instruction ``i`` have the numbers
+  ``consumed_mesh_offsets[i]`` up to ``consumed_mesh_offsets[i + 1]``.
+- A produced mesh ``p`` is connected to the consumed mesh
+  ``consumed_mesh_of_produced_mesh[p]`` or to none if this is
+  :data:`NOT_CONNECTED`.
+
+The graph is read-only. It does not change when the pattern changes.
+
+.. note:: NumPy is not required to import this module. It is imported when a
+  :class:`ConnectionGraph` is created.
+"""
+
+#: The value of a mesh in a graph that is not connected to any other mesh.
+NOT_CONNECTED = -1
+
+
+class ConnectionGraph(object):
+    """The mesh connections of a knitting pattern in integer arrays."""
+
+    def __init__(self, knitting_pattern):
+        """Compile the connections of a knitting pattern.
+
+        :param knittingpattern.KnittingPattern.KnittingPattern
+          knitting_pattern: the pattern to take the connections from
+        :raises ImportError: if NumPy is not installed
+        """
+        import numpy
+        self._arrays = arrays = knitting_pattern.to_arrays()
+        instructions = arrays.instructions
+        self._produced_mesh_offsets = self._offsets(
+            arrays.number_of_produced_meshes)
+        self._consumed_mesh_offsets = self._offsets(
+            arrays.number_of_consumed_meshes)
+        self._instruction_of_produced_mesh = numpy.repeat(
+            numpy.arange(len(instructions), dtype=numpy.intp),
+            arrays.number_of_produced_meshes)
+        self._instruction_of_consumed_mesh = numpy.repeat(
+            numpy.arange(len(instructions), dtype=numpy.intp),
+            arrays.number_of_consumed_meshes)
+        index_of_row = {id(row): index
+                        for index, row in enumerate(arrays.rows)}
+        produced_mesh_offsets = self._produced_mesh_offsets
+        consumed_mesh_offsets = self._consumed_mesh_offsets
+        row_offsets = arrays.row_offsets
+        connections = numpy.full(produced_mesh_offsets[-1],
+                                 NOT_CONNECTED, dtype=numpy.intp)
+        for row_index, row in enumerate(arrays.rows):
+            first_produced_mesh = produced_mesh_offsets[row_offsets[row_index]]
+            for index, consuming_row, index_in_consuming_row in \
+                    row.produced_mesh_connections():
+                consuming_row_index = index_of_row.get(id(consuming_row))
+                if consuming_row_index is not None:
+                    first_consumed_mesh = consumed_mesh_offsets[
+                        row_offsets[consuming_row_index]]
+                    connections[first_produced_mesh + index] = \
+                        first_consumed_mesh + index_in_consuming_row
+        self._consumed_mesh_of_produced_mesh = connections
+        reverse_connections = numpy.full(self._consumed_mesh_offsets[-1],
+                                         NOT_CONNECTED, dtype=numpy.intp)
+        connected = numpy.flatnonzero(connections != NOT_CONNECTED)
+        reverse_connections[connections[connected]] = connected
+        self._produced_mesh_of_consumed_mesh = reverse_connections
+
+    @staticmethod
+    def _offsets(counts):
+        """:return: the offsets of consecutive ranges with the lengths
+          :paramref:`counts`"""
+        import numpy
+        offsets = numpy.zeros(len(counts) + 1, dtype=numpy.intp)
+        numpy.cumsum(counts, out=offsets[1:])
+        return offsets
+
+    @property
+    def arrays(self):
+        """The arrays that number the instructions and rows.
+
+        :rtype: knittingpattern.PatternArray.PatternArray
+        """
+        return self._arrays
+
+    @property
+    def instructions(self):
+        """The instructions in the order of their numbers.
+
+        :rtype: list
+        """
+        return self._arrays.instructions
+
+    @property
+    def rows(self):
+        """The rows in the order of their numbers.
+
+        :rtype: list
+        """
+        return self._arrays.rows
+
+    @property
+    def row_offsets(self):
+        """The offsets of the instructions of the rows.
+
+        :rtype: numpy.ndarray
+
+        .. seealso:: :attr:`PatternArray.row_offsets
+          <knittingpattern.PatternArray.PatternArray.row_offsets>`
+        """
+        return self._arrays.row_offsets
+
+    @property
+    def row_of_instruction(self):
+        """The number of the row of each instruction.
+
+        :rtype: numpy.ndarray
+        """
+        return self._arrays.row_index
+
+    @property
+    def produced_mesh_offsets(self):
+        """The offsets of the produced meshes of the instructions.
+
+        :rtype: numpy.ndarray
+        """
+        return self._produced_mesh_offsets
+
+    @property
+    def consumed_mesh_offsets(self):
+        """The offsets of the consumed meshes of the instructions.
+
+        :rtype: numpy.ndarray
+        """
+        return self._consumed_mesh_offsets
+
+    @property
+    def instruction_of_produced_mesh(self):
+        """The number of the instruction that produces each mesh.
+
+        :rtype: numpy.ndarray
+        """
+        return self._instruction_of_produced_mesh
+
+    @property
+    def instruction_of_consumed_mesh(self):
+        """The number of the instruction that consumes each mesh.
+
+        :rtype: numpy.ndarray
+        """
+        return self._instruction_of_consumed_mesh
+
+    @property
+    def consumed_mesh_of_produced_mesh(self):
+        """The consumed mesh that each produced mesh is connected to.
+
+        :return: an array with an entry for every produced mesh which is a
+          consumed mesh number or :data:`NOT_CONNECTED`
+        :rtype: numpy.ndarray
+        """
+        return self._consumed_mesh_of_produced_mesh
+
+    @property
+    def produced_mesh_of_consumed_mesh(self):
+        """The produced mesh that each consumed mesh is connected to.
+
+        :return: an array with an entry for every consumed mesh which is a
+          produced mesh number or :data:`NOT_CONNECTED`
+        :rtype: numpy.ndarray
+        """
+        return self._produced_mesh_of_consumed_mesh
+
+    def instructions_above(self, instruction):
+        """The instructions that consume the meshes of an instruction.
+
+        :param int instruction: the number of an instruction
+        :return: the numbers of the instructions, one for each connected
+          produced mesh
+        :rtype: numpy.ndarray
+        """
+        start, stop = self._produced_mesh_offsets[instruction:instruction + 2]
+        consumed_meshes = self._consumed_mesh_of_produced_mesh[start:stop]
+        consumed_meshes = consumed_meshes[consumed_meshes != NOT_CONNECTED]
+        return self._instruction_of_consumed_mesh[consumed_meshes]
+
+    def instructions_below(self, instruction):
+        """The instructions that produce the meshes of an instruction.
+
+        :param int instruction: the number of an instruction
+        :return: the numbers of the instructions, one for each connected
+          consumed mesh
+        :rtype: numpy.ndarray
+        """
+        start, stop = self._consumed_mesh_offsets[instruction:instruction + 2]
+        produced_meshes = self._produced_mesh_of_consumed_mesh[start:stop]
+        produced_meshes = produced_meshes[produced_meshes != NOT_CONNECTED]
+        return self._instruction_of_produced_mesh[produced_meshes]
+
+    def column(self, instruction, index_in_instruction=0):
+        """Trace a column of stitches upwards.
+
+        :param int instruction: the number of the instruction to start at
+        :param int index_in_instruction: the index of the produced mesh of
+          :paramref:`instruction` to follow
+        :return: the numbers of the instructions in the column, starting with
+          :paramref:`instruction`
+        :rtype: list
+
+        The column follows the consumed meshes upwards. If an instruction
+        consumes more meshes than it produces, the column continues with its
+        last produced mesh.
+        """
+        produced_offsets = self._produced_mesh_offsets
+        column = [instruction]
+        produced_mesh = produced_offsets[instruction] + index_in_instruction
+        while produced_mesh < produced_offsets[instruction + 1] and \
+                len(column) <= len(self.instructions):
+            consumed_mesh = \
+                self._consumed_mesh_of_produced_mesh[produced_mesh]
+            if consumed_mesh == NOT_CONNECTED:
+                break
+            instruction = self._instruction_of_consumed_mesh[consumed_mesh]
+            column.append(int(instruction))
+            index = consumed_mesh - self._consumed_mesh_offsets[instruction]
+            start, stop = produced_offsets[instruction:instruction + 2]
+            produced_mesh = start + min(index, stop - start - 1)
+        return column
+
+    def connected_components(self):
+        """Label the instructions that are connected through meshes.
+
+        :return: an array with a label for each instruction. Instructions
+          have the same label if they are connected. The label is the
+          smallest instruction number in the component.
+        :rtype: numpy.ndarray
+        """
+        import numpy
+        connections = self._consumed_mesh_of_produced_mesh
+        connected = numpy.flatnonzero(connections != NOT_CONNECTED)
+        below = self._instruction_of_produced_mesh[connected]
+        above = self._instruction_of_consumed_mesh[connections[connected]]
+        labels = numpy.arange(len(self.instructions), dtype=numpy.intp)
+        while True:
+            old_labels = labels.copy()
+            numpy.minimum.at(labels, below, labels[above])
+            numpy.minimum.at(labels, above, labels[below])
+            labels = labels[labels]
+            if numpy.array_equal(labels, old_labels):
+                return labels
+
+    def __len__(self):
+        """:return: the number of instructions"""
+        return len(self.instructions)
+
+
+__all__ = ["ConnectionGraph", "NOT_CONNECTED"]
@@ -1,7 +1,10 @@
 """Save strings to files."""
-from io import StringIO, BytesIO
+from io import StringIO, BytesIO, TextIOWrapper
 from tempfile import NamedTemporaryFile
+from copy import copy
+from threading import Lock
 from .FileWrapper import BytesWrapper, TextWrapper
+from ..utils import run_in_executor
 
 
 class ContentDumper(object):
@@ -46,6 +49,7 @@ class ContentDumper(object):
         self.__dump_to_file = on_dump
         self.__text_is_expected = text_is_expected
         self.__encoding = encoding
+        self.__is_cached = False
 
     @property
     def encoding(self):
@@ -53,6 +57,73 @@ class ContentDumper(object):
         :rtype: str"""
         return self.__encoding
 
+    def cached(self):
+        """A dumper that creates the content only once.
+
+        :return: a copy of this dumper that saves the content to a buffer
+          the first time it is dumped and serves all further dumps from
+          this buffer
+        :rtype: ContentDumper
+
+        Dumping some content, e.g. an SVG of a knitting pattern, can take a
+        long time. If the same content is saved in several places, e.g. as
+        a string and in a file, the cached dumper saves this time.
+
+        .. code:: python
+
+            svg = knitting_pattern_set.to_svg(25).cached()
+            svg.paths("pattern.svg", "backup/pattern.svg")
+            response = svg.bytes()
+
+        The buffered content is written to files in the same mode and
+        :attr:`encoding` as the content of a dumper that is not cached.
+        Changes to the dumped object after the first dump are not seen by
+        the cached dumper. Call :meth:`cached` again to get a new buffer.
+        """
+        if self.__is_cached:
+            return self
+        dumper = copy(self)
+        dumper.__is_cached = True
+        dumper.__render = self.__dump_to_file
+        dumper.__content = None
+        dumper.__encoded_content = None
+        dumper.__lock = Lock()
+        dumper.__dump_to_file = dumper.__write_cached_content
+        return dumper
+
+    @property
+    def is_cached(self):
+        """Whether the content is only created once.
+
+        :rtype: bool
+
+        .. seealso:: :meth:`cached`
+        """
+        return self.__is_cached
+
+    def __cached_content(self):
+        """:return: the buffered content as :class:`str` in text mode or as
+        :class:`bytes` in binary mode"""
+        with self.__lock:
+            if self.__content is None:
+                file = StringIO() if self.__text_is_expected else BytesIO()
+                self.__render(file)
+                self.__content = file.getvalue()
+        return self.__content
+
+    def __cached_bytes(self):
+        """:return: the buffered content as :class:`bytes`"""
+        if not self.__text_is_expected:
+            return self.__cached_content()
+        if self.__encoded_content is None:
+            encoded_content = self.__cached_content().encode(self.__encoding)
+            self.__encoded_content = encoded_content
+        return self.__encoded_content
+
+    def __write_cached_content(self, file):
+        """Write the buffered content to a file."""
+        file.write(self.__cached_content())
+
     def string(self):
         """:return: the dump as a string"""
         if self.__text_is_expected:
@@ -62,6 +133,8 @@ class ContentDumper(object):
 
     def _string(self):
         """:return: the string from a :class:`io.StringIO`"""
+        if self.__is_cached:
+            return self.__cached_content()
         file = StringIO()
         self.__dump_to_file(file)
         file.seek(0)
@@ -69,6 +142,8 @@ class ContentDumper(object):
 
     def bytes(self):
         """:return: the dump as bytes."""
+        if self.__is_cached:
+            return self.__cached_bytes()
         if self.__text_is_expected:
             return self.string().encode(self.__encoding)
         else:
@@ -76,6 +151,8 @@ class ContentDumper(object):
 
     def _bytes(self):
         """:return: bytes from a :class:`io.BytesIO`"""
+        if self.__is_cached:
+            return self.__cached_content()
         file = BytesIO()
         self.__dump_to_file(file)
         file.seek(0)
@@ -139,6 +216,94 @@ class ContentDumper(object):
         with open(path, mode, encoding=encoding) as file:
             self.__dump_to_file(file)
 
+    def apath(self, path, executor=None):
+        """Save the dump in a file without blocking the :mod:`asyncio` loop.
+
+        :param str path: a valid path to a file location, see :meth:`path`
+        :param concurrent.futures.Executor executor: the executor to dump
+          the content in or :obj:`None` to use the default executor of the
+          event loop
+        :return: an awaitable :class:`asyncio.Future` that is done when the
+          file is written
+
+        Creating the content, e.g. the layout of an SVG, and writing the file
+        both happen in the :paramref:`executor`.
+
+        .. code:: python
+
+            await knitting_pattern_set.to_svg(25).apath("pattern.svg")
+        """
+        return run_in_executor(self.path, path, executor=executor)
+
+    def astring(self, executor=None):
+        """The dump as a string without blocking the :mod:`asyncio` loop.
+
+        :param executor: see :meth:`apath`
+        :return: an awaitable :class:`asyncio.Future` for the result of
+          :meth:`string`
+        """
+        return run_in_executor(self.string, executor=executor)
+
+    def abytes(self, executor=None):
+        """The dump as bytes without blocking the :mod:`asyncio` loop.
+
+        :param executor: see :meth:`apath`
+        :return: an awaitable :class:`asyncio.Future` for the result of
+          :meth:`bytes`
+        """
+        return run_in_executor(self.bytes, executor=executor)
+
+    def paths(self, *paths):
+        """Saves the dump in several files.
+
+        :param paths: the paths to save the dump to, see :meth:`path`
+
+        The content is created once and then written to all the
+        :paramref:`paths`.
+
+        .. seealso:: :meth:`cached`
+        """
+        dumper = self.cached()
+        for path in paths:
+            dumper.path(path)
+
+    def gzip_path(self, path, compresslevel=9):
+        """Saves the dump compressed with gzip in a file named
+        :paramref:`path`.
+
+        :param str path: a valid path to a file location. The file can exist.
+        :param int compresslevel: the compression level from ``0`` to ``9``,
+          see :class:`gzip.GzipFile`
+
+        The content is compressed while it is dumped.
+        The compressed file does not contain the time of the dump.
+        Thus, the same content is always compressed to the same bytes.
+        """
+        with open(path, "wb") as file:
+            self._gzip_file(file, compresslevel)
+
+    def gzip_bytes(self, compresslevel=9):
+        """:return: the dump compressed with gzip as bytes
+
+        :param int compresslevel: see :meth:`gzip_path`
+        """
+        file = BytesIO()
+        self._gzip_file(file, compresslevel)
+        return file.getvalue()
+
+    def _gzip_file(self, file, compresslevel):
+        """Dump the content compressed into a binary file."""
+        from gzip import GzipFile
+        with GzipFile(fileobj=file, mode="wb", compresslevel=compresslevel,
+                      mtime=0) as gzip_file:
+            if self.__text_is_expected:
+                text_file = TextIOWrapper(gzip_file, encoding=self.__encoding)
+                self.__dump_to_file(text_file)
+                text_file.flush()
+                text_file.detach()
+            else:
+                self.__dump_to_file(gzip_file)
+
     def _temporary_file(self, delete):
         """:return: a temporary file where the content is dumped to."""
         file = NamedTemporaryFile("w+", delete=delete,
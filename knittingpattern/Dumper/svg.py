@@ -21,4 +21,21 @@ class SVGDumper(XMLDumper):
         finally:
             remove_file(path)
 
+    def svgz(self, path=None):
+        """The SVG compressed with gzip.
+
+        :param str path: the path to save the compressed SVG to or
+          :obj:`None`
+        :return: the compressed SVG as bytes if :paramref:`path` is
+          :obj:`None`
+
+        Compressed SVG files usually have the extension ``".svgz"``.
+
+        .. seealso:: :meth:`gzip_path
+          <knittingpattern.Dumper.file.ContentDumper.gzip_path>`
+        """
+        if path is None:
+            return self.gzip_bytes()
+        self.gzip_path(path)
+
 __all__ = ["SVGDumper"]
@@ -1,19 +1,36 @@
-"""Dump objects to XML."""
-import xmltodict
+"""Dump objects to XML.
+
+:mod:`xmltodict` is imported when the first object is dumped.
+"""
 from .file import ContentDumper
+from ..instrumentation import span, XML_UNPARSE
 
 
 class XMLDumper(ContentDumper):
 
     """Used to dump objects as XML."""
 
-    def __init__(self, on_dump):
+    def __init__(self, on_dump, compact=False):
         """Create a new XMLDumper object with the callable `on_dump`.
 
         `on_dump` takes no aguments and returns the object that should be
-        serialized to XML."""
+        serialized to XML.
+
+        :param bool compact: whether to leave out the indentation and the
+          line breaks (:obj:`True`) or to indent the XML (:obj:`False`,
+          default)
+        """
         super().__init__(self._dump_to_file)
         self.__dump_object = on_dump
+        self.__compact = compact
+
+    @property
+    def compact(self):
+        """Whether the XML is written without indentation.
+
+        :rtype: bool
+        """
+        return self.__compact
 
     def object(self):
         """Return the object that should be dumped."""
@@ -21,6 +38,9 @@ class XMLDumper(ContentDumper):
 
     def _dump_to_file(self, file):
         """dump to the file"""
-        xmltodict.unparse(self.object(), file, pretty=True)
+        import xmltodict
+        object_ = self.object()
+        with span(XML_UNPARSE):
+            xmltodict.unparse(object_, file, pretty=not self.__compact)
 
 __all__ = ["XMLDumper"]
@@ -5,9 +5,10 @@ The :class:`instructions <Instruction>`. that are used in the
 They have certain attributes in common.
 
 """
-from .Prototype import Prototype
+from .Prototype import Prototype, CompactPrototype
 from .Mesh import ProducedMesh, ConsumedMesh
 from .convert.color import convert_color_to_rrggbb
+from .counters import hit, miss, INDEX_IN_ROW
 
 
 # pattern specification
@@ -74,6 +75,8 @@ class Instruction(Prototype):
     :mod:`InstructionLibrary <knittingpattern.InstructionLibrary>`.
     """
 
+    __slots__ = ()
+
     @property
     def id(self):
         """The id of the instruction.
@@ -238,6 +241,9 @@ class InstructionInRow(Instruction):
     Then, they have additional attributes and properties.
     """
 
+    __slots__ = ("_row", "_produced_meshes", "_consumed_meshes",
+                 "_cached_index_in_row")
+
     def __init__(self, row, spec):
         """Create a new instruction in a row with a specification.
 
@@ -247,6 +253,16 @@ class InstructionInRow(Instruction):
         """
         super().__init__(spec)
         self._row = row
+        self._produced_meshes = None
+        self._consumed_meshes = None
+        self._cached_index_in_row = None
+
+    def _create_meshes(self):
+        """Create the mesh objects of this instruction.
+
+        The meshes are created when they are first accessed.
+        Until then, the :attr:`row` stores the connections.
+        """
         self._produced_meshes = [
             self._new_produced_mesh(self, index)
             for index in range(self.number_of_produced_meshes)
@@ -255,7 +271,12 @@ class InstructionInRow(Instruction):
             self._new_consumed_mesh(self, index)
             for index in range(self.number_of_consumed_meshes)
         ]
-        self._cached_index_in_row = None
+
+    def _meshes_are_created(self):
+        """:return: whether the mesh objects of this instruction exist
+        :rtype: bool
+        """
+        return self._produced_meshes is not None
 
     def transfer_to_row(self, new_row):
         """Transfer this instruction to a new row.
@@ -313,12 +334,10 @@ class InstructionInRow(Instruction):
         if expected_index is not None and \
                 0 <= expected_index < len(instructions) and \
                 instructions[expected_index] is self:
+            hit(INDEX_IN_ROW)
             return expected_index
-        for index, instruction_in_row in enumerate(instructions):
-            if instruction_in_row is self:
-                self._cached_index_in_row = index
-                return index
-        return None
+        miss(INDEX_IN_ROW)
+        return self._row._index_of_instruction(self)
 
     @property
     def index_in_row(self):
@@ -428,14 +447,7 @@ class InstructionInRow(Instruction):
                 index = instruction.index_of_first_produced_mesh_in_row
 
         """
-        index = 0
-        for instruction in self.row_instructions:
-            if instruction is self:
-                break
-            index += instruction.number_of_produced_meshes
-        else:
-            self._raise_not_found_error()
-        return index
+        return self._row._mesh_offsets()[0][self.index_in_row]
 
     @property
     def index_of_last_produced_mesh_in_row(self):
@@ -462,14 +474,7 @@ class InstructionInRow(Instruction):
         Same as :attr:`index_of_first_produced_mesh_in_row`
         but for consumed meshes.
         """
-        index = 0
-        for instruction in self.row_instructions:
-            if instruction is self:
-                break
-            index += instruction.number_of_consumed_meshes
-        else:
-            self._raise_not_found_error()
-        return index
+        return self._row._mesh_offsets()[1][self.index_in_row]
 
     @property
     def index_of_last_consumed_mesh_in_row(self):
@@ -496,6 +501,8 @@ class InstructionInRow(Instruction):
 
         .. seealso:: :attr:`consumed_meshes`, :attr:`consuming_instructions`
         """
+        if self._produced_meshes is None:
+            self._create_meshes()
         return self._produced_meshes
 
     @property
@@ -513,6 +520,8 @@ class InstructionInRow(Instruction):
 
         .. seealso:: :attr:`produced_meshes`, :attr:`producing_instructions`
         """
+        if self._consumed_meshes is None:
+            self._create_meshes()
         return self._consumed_meshes
 
     def __repr__(self):
@@ -581,7 +590,7 @@ class InstructionInRow(Instruction):
 
         .. seealso:: :attr:`Instruction.number_of_produced_meshes`
         """
-        return self._produced_meshes[-1]
+        return self.produced_meshes[-1]
 
     @property
     def last_consumed_mesh(self):
@@ -593,7 +602,7 @@ class InstructionInRow(Instruction):
 
         .. seealso:: :attr:`Instruction.number_of_consumed_meshes`
         """
-        return self._consumed_meshes[-1]
+        return self.consumed_meshes[-1]
 
     @property
     def first_produced_mesh(self):
@@ -605,7 +614,7 @@ class InstructionInRow(Instruction):
 
         .. seealso:: :attr:`Instruction.number_of_produced_meshes`
         """
-        return self._produced_meshes[0]
+        return self.produced_meshes[0]
 
     @property
     def first_consumed_mesh(self):
@@ -617,7 +626,27 @@ class InstructionInRow(Instruction):
 
         .. seealso:: :attr:`Instruction.number_of_consumed_meshes`
         """
-        return self._consumed_meshes[0]
+        return self.consumed_meshes[0]
+
+
+class CompactInstruction(CompactPrototype, Instruction):
+    """An :class:`Instruction` that shares its inherited values.
+
+    .. seealso:: :class:`CompactSpecification
+      <knittingpattern.ParsingSpecification.CompactSpecification>`
+    """
+
+    __slots__ = ()
+
+
+class CompactInstructionInRow(CompactPrototype, InstructionInRow):
+    """An :class:`InstructionInRow` that shares its inherited values.
+
+    .. seealso:: :class:`CompactSpecification
+      <knittingpattern.ParsingSpecification.CompactSpecification>`
+    """
+
+    __slots__ = ()
 
 
 class InstructionNotFoundInRow(ValueError):
@@ -626,6 +655,7 @@ class InstructionNotFoundInRow(ValueError):
 
 
 __all__ = ["Instruction", "InstructionInRow", "InstructionNotFoundInRow",
+           "CompactInstruction", "CompactInstructionInRow",
            "ID", "TYPE", "KNIT_TYPE", "PURL_TYPE", "DEFAULT_TYPE", "COLOR",
            "NUMBER_OF_CONSUMED_MESHES", "DEFAULT_NUMBER_OF_CONSUMED_MESHES",
            "NUMBER_OF_PRODUCED_MESHES", "DEFAULT_NUMBER_OF_PRODUCED_MESHES",
@@ -0,0 +1,162 @@
+"""Indexes of the instructions of a knitting pattern by type and color.
+
+Finding all instructions of a type or a color requires to look at every
+instruction of a :class:`knitting pattern
+<knittingpattern.KnittingPattern.KnittingPattern>`.
+An :class:`InstructionIndex` maps the types and colors to the instructions
+so that such queries only look at the instructions they find.
+
+.. code:: python
+
+    knitting_pattern.index_instructions()
+    decreases = knitting_pattern.find(type="k2tog")
+    mocha = knitting_pattern.find(color="mocha latte")
+
+The index is kept up to date when the rows of the pattern change. Rows that
+changed are indexed again with the next query.
+"""
+
+#: Use this value in :meth:`InstructionIndex.find` to match all values.
+ANY = object()
+
+
+class InstructionIndex(object):
+    """An index of the instructions of a knitting pattern."""
+
+    def __init__(self, knitting_pattern):
+        """Create a new index.
+
+        :param knittingpattern.KnittingPattern.KnittingPattern
+          knitting_pattern: the pattern to index
+
+        Call :meth:`row_changed` when a row of the pattern changes.
+        :meth:`KnittingPattern.index_instructions()
+        <knittingpattern.KnittingPattern.KnittingPattern.index_instructions>`
+        does this for you.
+        """
+        self._knitting_pattern = knitting_pattern
+        self._types = {}
+        self._colors = {}
+        self._keys_of_row = {}
+        self._changed_rows = set(knitting_pattern.rows)
+        self._row_numbers = {}
+
+    @property
+    def knitting_pattern(self):
+        """The knitting pattern this index was created for.
+
+        :rtype: knittingpattern.KnittingPattern.KnittingPattern
+        """
+        return self._knitting_pattern
+
+    def row_changed(self, row):
+        """Index a row again with the next query.
+
+        :param knittingpattern.Row.Row row: a row of the pattern that was
+          changed or added
+        """
+        self._changed_rows.add(row)
+
+    def _update(self):
+        """Index the rows that changed."""
+        for row in self._changed_rows:
+            self._remove_row(row)
+            self._add_row(row)
+        self._changed_rows.clear()
+        rows = self._knitting_pattern.rows
+        if len(self._row_numbers) != len(rows):
+            self._row_numbers = {row: number
+                                 for number, row in enumerate(rows)}
+
+    def _remove_row(self, row):
+        """Remove the instructions of a row from the index."""
+        types, colors = self._keys_of_row.pop(row, ((), ()))
+        for type_ in types:
+            self._remove_key(self._types, type_, row)
+        for color in colors:
+            self._remove_key(self._colors, color, row)
+
+    @staticmethod
+    def _remove_key(index, key, row):
+        """Remove the instructions of a row from the entry of a key."""
+        rows = index[key]
+        del rows[row]
+        if not rows:
+            del index[key]
+
+    def _add_row(self, row):
+        """Add the instructions of a row to the index."""
+        types = {}
+        colors = {}
+        for instruction in row.instructions:
+            types.setdefault(instruction.type, []).append(instruction)
+            for color in instruction.colors:
+                colors.setdefault(color, []).append(instruction)
+        for type_, instructions in types.items():
+            self._types.setdefault(type_, {})[row] = instructions
+        for color, instructions in colors.items():
+            self._colors.setdefault(color, {})[row] = instructions
+        self._keys_of_row[row] = (tuple(types), tuple(colors))
+
+    @property
+    def types(self):
+        """The types of the instructions.
+
+        :rtype: list
+        """
+        self._update()
+        return list(self._types)
+
+    @property
+    def colors(self):
+        """The colors of the instructions.
+
+        :rtype: list
+        """
+        self._update()
+        return list(self._colors)
+
+    def find(self, type=ANY, color=ANY):
+        """Find instructions by type and color.
+
+        :param type: the :attr:`type
+          <knittingpattern.Instruction.Instruction.type>` of the instructions
+          or :data:`ANY`
+        :param color: the :attr:`color
+          <knittingpattern.Instruction.Instruction.color>` of the
+          instructions or :data:`ANY`
+        :return: the instructions that match the arguments ordered by their
+          row in :attr:`KnittingPattern.rows
+          <knittingpattern.KnittingPattern.KnittingPattern.rows>` and their
+          position in the row
+        :rtype: list
+        """
+        self._update()
+        if type is ANY and color is ANY:
+            return [instruction for row in self._knitting_pattern.rows
+                    for instruction in row.instructions]
+        if type is ANY:
+            return self._instructions_in_rows(self._colors.get(color, {}))
+        rows_of_type = self._types.get(type, {})
+        if color is ANY:
+            return self._instructions_in_rows(rows_of_type)
+        rows_of_color = self._colors.get(color, {})
+        rows = {}
+        for row, instructions in rows_of_type.items():
+            instructions_of_color = rows_of_color.get(row)
+            if instructions_of_color is not None:
+                ids = set(map(id, instructions_of_color))
+                rows[row] = [instruction for instruction in instructions
+                             if id(instruction) in ids]
+        return self._instructions_in_rows(rows)
+
+    def _instructions_in_rows(self, rows):
+        """:return: the instructions of the rows in the order of the rows"""
+        row_numbers = self._row_numbers
+        result = []
+        for row in sorted(rows, key=row_numbers.__getitem__):
+            result.extend(rows[row])
+        return result
+
+
+__all__ = ["InstructionIndex", "ANY"]
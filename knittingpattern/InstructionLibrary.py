@@ -6,8 +6,10 @@ This module provides the functionality to load default values for instructions
 from various locations.
 """
 from .Instruction import TYPE
-from .Loader import JSONLoader
-from .Instruction import Instruction
+from .Loader import JSONLoader, has_extension
+from .Instruction import Instruction, CompactInstruction
+from .resources import read_resource, INSTRUCTIONS
+from .counters import hit, miss, DEFAULT_INSTRUCTIONS
 
 
 class InstructionLibrary(object):
@@ -58,8 +60,10 @@ class InstructionLibrary(object):
                 }
             ]
 
+        Folders are loaded from their ``.json`` files, compressed or not.
         """
-        return self._loader_class(self._process_loaded_object)
+        return self._loader_class(self._process_loaded_object,
+                                  has_extension(".json"))
 
     def _process_loaded_object(self, obj):
         """add the loaded instructions from :attr:`load`
@@ -123,9 +127,60 @@ class DefaultInstructions(InstructionLibrary):
         """Create the default instruction library without arguments.
 
         The default specifications are loaded automatically form this package.
+        They are read from the :mod:`resource bundle
+        <knittingpattern.resources>` if it was built and loaded from the
+        :attr:`INSTRUCTIONS_FOLDER` otherwise.
         """
         super().__init__()
-        self.load.relative_folder(__file__, self.INSTRUCTIONS_FOLDER)
+        instructions = read_resource(INSTRUCTIONS)
+        if instructions is None:
+            self.load.relative_folder(__file__, self.INSTRUCTIONS_FOLDER)
+        else:
+            self.load.object([dict(instruction)
+                              for instruction in instructions])
+
+
+class CompactDefaultInstructions(DefaultInstructions):
+    """The :class:`DefaultInstructions` as
+    :class:`~knittingpattern.Instruction.CompactInstruction` objects.
+
+    Instructions of the same type share the tuple of specifications they
+    inherit from.
+
+    .. seealso:: :class:`CompactSpecification
+      <knittingpattern.ParsingSpecification.CompactSpecification>`
+    """
+
+    def __init__(self):
+        """Create the compact default instruction library."""
+        self._inherited_values = {}
+        super().__init__()
+
+    @property
+    def _instruction_class(self):
+        """:return: the class for the specifications
+        """
+        return CompactInstruction
+
+    def add_instruction(self, specification):
+        """Same as :meth:`InstructionLibrary.add_instruction`."""
+        super().add_instruction(specification)
+        self._inherited_values.clear()
+
+    def as_instruction(self, specification):
+        """Same as :meth:`InstructionLibrary.as_instruction`."""
+        instruction = self._instruction_class(specification)
+        type_ = instruction.type
+        inherited_values = self._inherited_values.get(type_)
+        if inherited_values is None:
+            if type_ in self._type_to_instruction:
+                inherited_values = (self._type_to_instruction[type_],)
+            else:
+                inherited_values = ()
+            self._inherited_values[type_] = inherited_values
+        if inherited_values:
+            instruction.inherit_from_all(inherited_values)
+        return instruction
 
 
 def default_instructions():
@@ -140,9 +195,13 @@ def default_instructions():
     """
     global _default_instructions
     if _default_instructions is None:
+        miss(DEFAULT_INSTRUCTIONS)
         _default_instructions = DefaultInstructions()
+    else:
+        hit(DEFAULT_INSTRUCTIONS)
     return _default_instructions
 
 
 _default_instructions = None
-__all__ = ["InstructionLibrary", "DefaultInstructions", "default_instructions"]
+__all__ = ["InstructionLibrary", "DefaultInstructions", "default_instructions",
+           "CompactDefaultInstructions"]
@@ -5,8 +5,18 @@ A :class:`knitting pattern set
 consists of several :class:`KnittingPatterns
 <knittingpattern.KnittingPattern.KnittingPattern>`.
 Their functionality can be found in this module.
+
+Results that are derived from a knitting pattern, such as the knit order or
+the layout, can be memoized with :meth:`KnittingPattern.cached`.
+They are computed again after the pattern changed.
+
+.. code:: python
+
+    layout = knitting_pattern.cached(GridLayout)
 """
 from .walk import walk
+from .InstructionIndex import InstructionIndex, ANY
+from collections import Counter
 from .utils import unique
 
 
@@ -33,6 +43,11 @@ class KnittingPattern(object):
         self._name = name
         self._rows = rows
         self._parser = parser
+        self._generation = 0
+        self._cache = {}
+        self._instruction_index = None
+        for row in rows:
+            row.register_change_observer(self._row_changed)
 
     @property
     def id(self):
@@ -62,17 +77,69 @@ class KnittingPattern(object):
         """
         row = self._parser.new_row(id_)
         self._rows.append(row)
+        row.register_change_observer(self._row_changed)
+        self._row_changed(row)
         return row
 
+    def _row_changed(self, row):
+        """Call when a row of this pattern changed."""
+        self._generation += 1
+        if self._instruction_index is not None:
+            self._instruction_index.row_changed(row)
+
+    @property
+    def generation(self):
+        """The modification generation of this pattern.
+
+        :rtype: int
+
+        The generation increases when a row is added, when instructions are
+        added to or removed from a row and when meshes are connected or
+        disconnected. If the generation is the same as before, the pattern
+        did not change.
+
+        .. seealso:: :meth:`cached`, :meth:`Row.register_change_observer
+          <knittingpattern.Row.Row.register_change_observer>`
+        """
+        return self._generation
+
+    def cached(self, compute, key=None):
+        """Return the result of a computation for the current generation.
+
+        :param compute: a callable that is called with this pattern as
+          argument and returns the result
+        :param key: the key to identify the result, by default
+          :paramref:`compute`
+        :return: the result of :paramref:`compute`
+
+        :paramref:`compute` is only called if there is no result for the
+        :paramref:`key` computed in the current :attr:`generation`.
+        The results are shared and should not be modified.
+
+        .. code:: python
+
+            layout = knitting_pattern.cached(GridLayout)
+            assert layout is knitting_pattern.cached(GridLayout)
+        """
+        if key is None:
+            key = compute
+        generation, result = self._cache.get(key, (None, None))
+        if generation != self._generation:
+            result = compute(self)
+            self._cache[key] = (self._generation, result)
+        return result
+
     def rows_in_knit_order(self):
         """Return the rows in the order that they should be knit.
 
         :rtype: list
         :return: the :attr:`rows` in the order that they should be knit
 
+        The order is computed once per :attr:`generation`.
+
         .. seealso:: :mod:`knittingpattern.walk`
         """
-        return walk(self)
+        return list(self.cached(walk))
 
     @property
     def instruction_colors(self):
@@ -81,8 +148,107 @@ class KnittingPattern(object):
         :return: the colors of the instructions listed in first appearance in
           knit order
         :rtype: list
+
+        The colors are computed once per :attr:`generation` from the colors
+        of the rows.
         """
+        return list(self.cached(self._instruction_colors))
+
+    def _instruction_colors(self, _):
+        """:return: the :attr:`instruction_colors`"""
         return unique([row.instruction_colors
                        for row in self.rows_in_knit_order()])
 
+    @property
+    def instruction_color_counts(self):
+        """The number of instructions of each color.
+
+        :return: a mapping from each of the :attr:`instruction_colors` to the
+          number of instructions that have this color
+        :rtype: collections.Counter
+
+        This can be used to estimate the amount of yarn needed of each color.
+        """
+        return Counter(self.cached(self._instruction_color_counts))
+
+    def _instruction_color_counts(self, _):
+        """:return: the :attr:`instruction_color_counts`"""
+        counts = Counter()
+        for row in self._rows:
+            counts.update(row.instruction_color_counts)
+        return counts
+
+    def index_instructions(self):
+        """Create an index of the instructions by type and color.
+
+        :return: the index that is used by :meth:`find`
+        :rtype: knittingpattern.InstructionIndex.InstructionIndex
+
+        The index is kept up to date when the rows change.
+        If the instructions are already indexed, the index is returned.
+        """
+        if self._instruction_index is None:
+            self._instruction_index = InstructionIndex(self)
+        return self._instruction_index
+
+    @property
+    def instruction_index(self):
+        """The index of the instructions.
+
+        :return: the index created by :meth:`index_instructions` or
+          :obj:`None`
+        :rtype: knittingpattern.InstructionIndex.InstructionIndex
+        """
+        return self._instruction_index
+
+    def find(self, type=ANY, color=ANY):
+        """Find instructions by type and color.
+
+        :param type: the type of the instructions or
+          :data:`~knittingpattern.InstructionIndex.ANY`
+        :param color: the color of the instructions or
+          :data:`~knittingpattern.InstructionIndex.ANY`
+        :return: the instructions that match the arguments ordered by their
+          row in :attr:`rows` and their position in the row
+        :rtype: list
+
+        .. code:: python
+
+            knitting_pattern.find(type="k2tog", color="mocha latte")
+
+        If the instructions are indexed with :meth:`index_instructions`, the
+        index answers the query. Otherwise, all instructions are checked.
+        """
+        if self._instruction_index is not None:
+            return self._instruction_index.find(type, color)
+        return [instruction for row in self._rows
+                for instruction in row.instructions
+                if (type is ANY or instruction.type == type) and
+                (color is ANY or color in instruction.colors)]
+
+    def to_arrays(self):
+        """Create a column-oriented view of the instructions.
+
+        :return: the instructions of this pattern in NumPy arrays
+        :rtype: knittingpattern.PatternArray.PatternArray
+        :raises ImportError: if NumPy is not installed
+
+        .. seealso:: :mod:`knittingpattern.PatternArray`
+        """
+        from .PatternArray import PatternArray
+        return PatternArray(self)
+
+    def connection_graph(self):
+        """Compile the mesh connections into a read-only graph.
+
+        :return: the connections between the instructions of this pattern in
+          integer arrays
+        :rtype: knittingpattern.ConnectionGraph.ConnectionGraph
+        :raises ImportError: if NumPy is not installed
+
+        .. seealso:: :mod:`knittingpattern.ConnectionGraph`
+        """
+        from .ConnectionGraph import ConnectionGraph
+        return ConnectionGraph(self)
+
 __all__ = ["KnittingPattern"]
@@ -1,11 +1,8 @@
-"""A set of knitting patterns that can be dumped and loaded."""
+"""A set of knitting patterns that can be dumped and loaded.
 
-from .convert.AYABPNGDumper import AYABPNGDumper
-from .Dumper import XMLDumper
-from .convert.InstructionSVGCache import default_instruction_svg_cache
-from .convert.Layout import GridLayout
-from .convert.SVGBuilder import SVGBuilder
-from .convert.KnittingPatternToSVG import KnittingPatternToSVG
+The converters are imported when they are used for the first time.
+Thus, loading and inspecting patterns does not import Pillow or xmltodict.
+"""
 
 
 class KnittingPatternSet(object):
@@ -100,14 +97,45 @@ class KnittingPatternSet(object):
             "/the/path/to/the/file.png"
 
         """
+        from .convert.AYABPNGDumper import AYABPNGDumper
         return AYABPNGDumper(lambda: self)
 
-    def to_svg(self, zoom):
+    def to_png_preview(self, zoom):
+        """Draw a preview of the knitting pattern as png.
+
+        :param int zoom: the height and width of a mesh in pixels
+        :return: a dumper to save the preview to
+        :rtype: knittingpattern.convert.PreviewPNGDumper.PreviewPNGDumper
+
+        The preview is drawn directly from the layout of the pattern without
+        creating an SVG, see :mod:`knittingpattern.convert.PreviewPNGBuilder`.
+
+        Example:
+
+        .. code:: python
+
+            >>> knitting_pattern_set.to_png_preview(4).temporary_path()
+            "/the/path/to/the/file.png"
+
+        """
+        from .convert.PreviewPNGDumper import PreviewPNGDumper
+        return PreviewPNGDumper(lambda: self, zoom)
+
+    def to_svg(self, zoom, level_of_detail_zoom=None, merge_runs=False,
+               compact=False):
         """Create an SVG from the knitting pattern set.
 
         :param float zoom: the height and width of a knit instruction
+        :param float level_of_detail_zoom: below this :paramref:`zoom`, runs
+          of instructions with the same color are drawn as rectangles, see
+          :class:`~knittingpattern.convert.KnittingPatternToSVG.KnittingPatternToSVG`
+        :param bool merge_runs: whether to draw runs of the same instruction
+          in a row as one element, see
+          :class:`~knittingpattern.convert.KnittingPatternToSVG.KnittingPatternToSVG`
+        :param bool compact: whether to save the svg without indentation, see
+          :class:`~knittingpattern.Dumper.xml.XMLDumper`
         :return: a dumper to save the svg to
-        :rtype: knittingpattern.Dumper.XMLDumper
+        :rtype: knittingpattern.Dumper.SVGDumper
 
         Example:
 
@@ -116,19 +144,106 @@ class KnittingPatternSet(object):
             >>> knitting_pattern_set.to_svg(25).temporary_path(".svg")
             "/the/path/to/the/file.svg"
         """
+        from .Dumper import SVGDumper
+
         def on_dump():
             """Dump the knitting pattern to the file.
 
             :return: the SVG XML structure as dictionary.
             """
+            from .convert.InstructionSVGCache import \
+                default_instruction_svg_cache
             knitting_pattern = self.patterns.at(0)
-            layout = GridLayout(knitting_pattern)
             instruction_to_svg = default_instruction_svg_cache()
-            builder = SVGBuilder()
-            kp_to_svg = KnittingPatternToSVG(knitting_pattern, layout,
-                                             instruction_to_svg, builder, zoom)
-            return kp_to_svg.build_SVG_dict()
-        return XMLDumper(on_dump)
+            return self._svg_dict(knitting_pattern, instruction_to_svg, zoom,
+                                  level_of_detail_zoom, merge_runs)
+        return SVGDumper(on_dump, compact)
+
+    @staticmethod
+    def _svg_dict(knitting_pattern, instruction_to_svg, zoom,
+                  level_of_detail_zoom=None, merge_runs=False):
+        """:return: the SVG XML structure of a knitting pattern"""
+        from .convert.Layout import GridLayout
+        from .convert.SVGBuilder import SVGBuilder
+        from .convert.KnittingPatternToSVG import KnittingPatternToSVG
+        layout = knitting_pattern.cached(GridLayout)
+        builder = SVGBuilder()
+        kp_to_svg = KnittingPatternToSVG(knitting_pattern, layout,
+                                         instruction_to_svg, builder, zoom,
+                                         level_of_detail_zoom, merge_runs)
+        return kp_to_svg.build_SVG_dict()
+
+    def to_svg_all(self, zoom, max_workers=None, level_of_detail_zoom=None,
+                   merge_runs=False, compact=False):
+        """Create an SVG for each knitting pattern in the set.
+
+        :param float zoom: the height and width of a knit instruction
+        :param int max_workers: the maximum number of threads that render
+          the patterns, see :class:`concurrent.futures.ThreadPoolExecutor`
+        :param float level_of_detail_zoom: see :meth:`to_svg`
+        :param bool merge_runs: see :meth:`to_svg`
+        :param bool compact: see :meth:`to_svg`
+        :return: a dictionary that maps the id of each pattern to a dumper to
+          save its svg to
+        :rtype: dict
+
+        The patterns are rendered by several threads before this method
+        returns. They share the :func:`default instruction svg cache
+        <knittingpattern.convert.InstructionSVGCache.default_svg_cache>`
+        which is filled with the instructions of all patterns first.
+
+        Example:
+
+        .. code:: python
+
+            >>> for id_, svg in knitting_pattern_set.to_svg_all(25).items():
+            ...     svg.path(id_ + ".svg")
+
+        """
+        from .Dumper import SVGDumper
+        from .convert.InstructionSVGCache import default_instruction_svg_cache
+        instruction_to_svg = default_instruction_svg_cache()
+        instruction_to_svg.precompute(
+            instruction for pattern in self._patterns
+            for row in pattern.rows for instruction in row.instructions)
+
+        def render(knitting_pattern):
+            """:return: the SVG XML structure of the knitting pattern"""
+            return self._svg_dict(knitting_pattern, instruction_to_svg, zoom,
+                                  level_of_detail_zoom, merge_runs)
+        svg_dicts = self._render_all(render, max_workers)
+        return {id_: SVGDumper(lambda svg_dict=svg_dict: svg_dict, compact)
+                for id_, svg_dict in svg_dicts.items()}
+
+    def to_ayabpng_all(self, max_workers=None):
+        """Convert each knitting pattern in the set to a png.
+
+        :param int max_workers: the maximum number of threads that render
+          the patterns, see :class:`concurrent.futures.ThreadPoolExecutor`
+        :return: a dictionary that maps the id of each pattern to a dumper to
+          save it as png for the AYAB software
+        :rtype: dict
+
+        The patterns are rendered by several threads before this method
+        returns, see :func:`render_ayabpng
+        <knittingpattern.convert.AYABPNGDumper.render_ayabpng>`.
+        """
+        from .convert.AYABPNGDumper import AYABPNGDumper, render_ayabpng
+        self._render_all(render_ayabpng, max_workers)
+        return {pattern.id: AYABPNGDumper(lambda: self, pattern.id)
+                for pattern in self._patterns}
+
+    def _render_all(self, render, max_workers):
+        """Call :paramref:`render` with each pattern in several threads.
+
+        :return: a dictionary that maps the pattern ids to the results
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        patterns = list(self._patterns)
+        with ThreadPoolExecutor(max_workers) as executor:
+            results = executor.map(render, patterns)
+            return {pattern.id: result
+                    for pattern, result in zip(patterns, results)}
 
     def add_new_pattern(self, id_, name=None):
         """Add a new, empty knitting pattern to the set.
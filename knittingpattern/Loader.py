@@ -2,10 +2,28 @@
 This module provides functionality to load objects from different locations
 while preserving a simple interface to the consumer.
 
+Files and urls compressed with :mod:`gzip`, :mod:`bz2` or :mod:`lzma` are
+decompressed while they are loaded. The compression is recognized by the
+extension of the file, e.g. ``".json.gz"``, or by the first bytes of the
+content.
 """
+import importlib
 import json
 import os
 import sys
+from .utils import run_in_executor
+from .instrumentation import span, JSON_DECODE
+
+#: The first bytes of compressed content and the modules that decompress it.
+COMPRESSION_MAGIC_BYTES = ((b"\x1f\x8b", "gzip"), (b"BZh", "bz2"),
+                           (b"\xfd7zXZ\x00", "lzma"))
+
+#: The extensions of compressed files and the modules that decompress them.
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma",
+                          ".lzma": "lzma"}
+
+#: The encoding of compressed text files.
+COMPRESSED_TEXT_ENCODING = "UTF-8"
 
 
 def identity(object_):
@@ -20,6 +38,79 @@ def true(_):
     return True
 
 
+def has_extension(*extensions):
+    """Create a function that chooses paths by their extension.
+
+    :param extensions: the extensions of the files to choose, e.g.
+      ``".json"``
+    :return: a function that can be used as :paramref:`chooses_path
+      <PathLoader.__init__.chooses_path>` for a :class:`PathLoader`
+
+    Compressed files are also chosen, e.g. ``"pattern.json.gz"`` if
+    ``".json"`` is in :paramref:`extensions`.
+
+    .. code:: python
+
+        loader = JSONLoader(process, has_extension(".json"))
+    """
+    extensions = tuple(extension.lower() for extension in extensions)
+
+    def chooses_path(path):
+        """:return: whether the path has one of the extensions"""
+        path, extension = os.path.splitext(path.lower())
+        if extension in COMPRESSION_EXTENSIONS:
+            extension = os.path.splitext(path)[1]
+        return extension in extensions
+    return chooses_path
+
+
+def compression_of_path(path):
+    """The compression of a file.
+
+    :param str path: the path to the file
+    :return: the name of the module to decompress the file with or
+      :obj:`None` if the file is not compressed
+    :rtype: str
+
+    The extension of the :paramref:`path` is checked first. If the extension
+    is not known, the first bytes of the file are compared to
+    :data:`COMPRESSION_MAGIC_BYTES`.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in COMPRESSION_EXTENSIONS:
+        return COMPRESSION_EXTENSIONS[extension]
+    with open(path, "rb") as file:
+        return compression_of_bytes(file.read(6))
+
+
+def compression_of_bytes(content):
+    """The compression of some content.
+
+    :param bytes content: the content or its first bytes
+    :return: the name of the module to decompress the content with or
+      :obj:`None` if the content is not compressed
+    :rtype: str
+    """
+    for magic_bytes, module_name in COMPRESSION_MAGIC_BYTES:
+        if content.startswith(magic_bytes):
+            return module_name
+    return None
+
+
+def decompress(content):
+    """Decompress content if it is compressed.
+
+    :param bytes content: the content
+    :return: the decompressed :paramref:`content` or the
+      :paramref:`content` if it is not compressed
+    :rtype: bytes
+    """
+    module_name = compression_of_bytes(content)
+    if module_name is None:
+        return content
+    return importlib.import_module(module_name).decompress(content)
+
+
 class PathLoader(object):
     """Load paths and folders from the local file system.
 
@@ -77,6 +168,22 @@ class PathLoader(object):
         """
         return self._process(path)
 
+    def apath(self, path, executor=None):
+        """Load a :paramref:`path` without blocking the :mod:`asyncio` loop.
+
+        :param str path: the path to the file to be processed
+        :param concurrent.futures.Executor executor: the executor to load
+          and process the :paramref:`path` in or :obj:`None` to use the
+          default executor of the event loop
+        :return: an awaitable :class:`asyncio.Future` for the result of
+          :meth:`path`
+
+        .. code:: python
+
+            knitting_pattern_set = await load_from().apath("pattern.json")
+        """
+        return run_in_executor(self.path, path, executor=executor)
+
     def _relative_to_absolute(self, module_location, folder):
         """:return: the absolute path for the `folder` relative to
         the module_location.
@@ -191,25 +298,74 @@ class ContentLoader(PathLoader):
         """:return: the processed result of a :paramref:`path's <path>` content.
         :param str path: the path where to load the content from.
           It should exist on the local file system.
+          The file can be compressed.
         """
-        with open(path) as file:
+        compression = compression_of_path(path)
+        if compression is None:
+            with open(path) as file:
+                return self.file(file)
+        module = importlib.import_module(compression)
+        with module.open(path, "rt",
+                         encoding=COMPRESSED_TEXT_ENCODING) as file:
             return self.file(file)
 
-    def url(self, url, encoding="UTF-8"):
+    def url(self, url, encoding="UTF-8", fetcher=None):
         """load and process the content behind a url
 
         :return: the processed result of the :paramref:`url's <url>` content
-        :param str url: the url to retrieve the content from
+        :param str url: the url to retrieve the content from.
+          The content can be compressed.
         :param str encoding: the encoding of the retrieved content.
           The default encoding is UTF-8.
+        :param knittingpattern.URLFetcher.URLFetcher fetcher: the fetcher to
+          download the :paramref:`url` with or :obj:`None` to use the
+          :func:`~knittingpattern.URLFetcher.default_url_fetcher`
 
         """
-        import urllib.request
-        with urllib.request.urlopen(url) as file:
-            webpage_content = file.read()
+        webpage_content = decompress(_fetcher(fetcher).url(url))
         webpage_content = webpage_content.decode(encoding)
         return self.string(webpage_content)
 
+    def urls(self, urls, encoding="UTF-8", fetcher=None):
+        """load and process the contents behind several urls
+
+        :return: a list of the processed results of the :paramref:`urls'
+          <urls>` contents in the same order
+        :rtype: list
+        :param urls: an iterable over the urls to retrieve the contents from
+        :param str encoding: the encoding of the retrieved contents
+        :param knittingpattern.URLFetcher.URLFetcher fetcher: see :meth:`url`
+
+        The contents are downloaded at the same time, see
+        :meth:`URLFetcher.urls <knittingpattern.URLFetcher.URLFetcher.urls>`.
+        """
+        contents = _fetcher(fetcher).urls(urls)
+        return [self.string(decompress(content).decode(encoding))
+                for content in contents]
+
+    def aurl(self, url, encoding="UTF-8", executor=None, fetcher=None):
+        """Load a :paramref:`url` without blocking the :mod:`asyncio` loop.
+
+        :param str url: the url to retrieve the content from
+        :param str encoding: the encoding of the retrieved content
+        :param concurrent.futures.Executor executor: the executor to load
+          and process the :paramref:`url` in or :obj:`None` to use the
+          default executor of the event loop
+        :param knittingpattern.URLFetcher.URLFetcher fetcher: see :meth:`url`
+        :return: an awaitable :class:`asyncio.Future` for the result of
+          :meth:`url`
+        """
+        return run_in_executor(self.url, url, encoding, fetcher,
+                               executor=executor)
+
+
+def _fetcher(fetcher):
+    """:return: the `fetcher` or the default url fetcher"""
+    if fetcher is None:
+        from .URLFetcher import default_url_fetcher
+        fetcher = default_url_fetcher()
+    return fetcher
+
 
 class JSONLoader(ContentLoader):
     """Load an process JSON from various locations.
@@ -232,8 +388,12 @@ class JSONLoader(ContentLoader):
         :return: the result of the processing step
         :param str string: the string to load the JSON from
         """
-        object_ = json.loads(string)
+        with span(JSON_DECODE):
+            object_ = json.loads(string)
         return self.object(object_)
 
 
-__all__ = ["JSONLoader", "ContentLoader", "PathLoader", "true", "identity"]
+__all__ = ["JSONLoader", "ContentLoader", "PathLoader", "true", "identity",
+           "has_extension", "compression_of_path", "compression_of_bytes",
+           "decompress", "COMPRESSION_MAGIC_BYTES", "COMPRESSION_EXTENSIONS",
+           "COMPRESSED_TEXT_ENCODING"]
@@ -16,6 +16,8 @@ class Mesh(metaclass=ABCMeta):
 
     """
 
+    __slots__ = ("__weakref__",)
+
     @abstractmethod
     def _producing_instruction_and_index(self):
         """Replace this method."""
@@ -299,7 +301,9 @@ class Mesh(metaclass=ABCMeta):
         After disconnecting this mesh, it can be connected anew.
         """
         if self.is_connected():
+            rows = self._rows()
             self._disconnect()
+            self._rows_changed(rows)
 
     def connect_to(self, other_mesh):
         """Create a connection to an other mesh.
@@ -314,6 +318,24 @@ class Mesh(metaclass=ABCMeta):
         other_mesh.disconnect()
         self.disconnect()
         self._connect_to(other_mesh)
+        self._rows_changed(self._rows())
+
+    def _rows(self):
+        """:return: the rows of the instructions of this mesh"""
+        instructions = []
+        if self._is_produced():
+            instructions.append(self._producing_instruction_and_index()[0])
+        if self._is_consumed():
+            instructions.append(self._consuming_instruction_and_index()[0])
+        rows = [getattr(instruction, "row", None)
+                for instruction in instructions]
+        return [row for row in rows if row is not None]
+
+    @staticmethod
+    def _rows_changed(rows):
+        """Notify the rows that the connection of a mesh changed."""
+        for row in rows:
+            row._changed()
 
     def is_connected(self):
         """Returns whether this mesh is already connected.
@@ -372,6 +394,9 @@ class ProducedMesh(Mesh):
     """A :class:`~knittingpattern.Mesh.Mesh` that has a producing instruction
     """
 
+    __slots__ = ("__producing_instruction", "__index_in_producing_instruction",
+                 "__consumed_part")
+
     def __init__(self, producing_instruction,
                  index_in_producing_instruction):
         """
@@ -388,17 +413,35 @@ class ProducedMesh(Mesh):
           to access the :class:`meshes <knittingpattern.Mesh.Mesh>`.
 
         """
-        self.__producing_instruction_and_index = (
-            producing_instruction,
+        self.__producing_instruction = producing_instruction
+        self.__index_in_producing_instruction = \
             index_in_producing_instruction
-        )
-        self._consumed_part = None
+        self.__consumed_part = None
+
+    @property
+    def _consumed_part(self):
+        """The consumed mesh this mesh is connected to or :obj:`None`.
+
+        The :class:`row <knittingpattern.Row.Row>` may store the connection
+        without mesh objects. It is resolved when it is accessed.
+        """
+        if self.__consumed_part is None:
+            instruction = self.__producing_instruction
+            index = self.__index_in_producing_instruction
+            instruction.row._resolve_produced_mesh(instruction, index)
+        return self.__consumed_part
+
+    @_consumed_part.setter
+    def _consumed_part(self, consumed_mesh):
+        self.__consumed_part = consumed_mesh
 
     def _producing_instruction_and_index(self):
-        return self.__producing_instruction_and_index
+        return (self.__producing_instruction,
+                self.__index_in_producing_instruction)
 
     def _producing_row_and_index(self):
-        instruction, index = self.__producing_instruction_and_index
+        instruction = self.__producing_instruction
+        index = self.__index_in_producing_instruction
         producing_row = instruction.row
         return (producing_row,
                 index + instruction.index_of_first_produced_mesh_in_row)
@@ -442,6 +485,9 @@ class ProducedMesh(Mesh):
 class ConsumedMesh(Mesh):
     """A mesh that is only consumed by an instruction"""
 
+    __slots__ = ("__consuming_instruction", "__index_in_consuming_instruction",
+                 "__produced_part")
+
     def __init__(self, consuming_instruction,
                  index_in_consuming_instruction):
         """
@@ -458,11 +504,27 @@ class ConsumedMesh(Mesh):
           to access the :class:`meshes <knittingpattern.Mesh.Mesh>`.
 
         """
-        self.__consuming_instruction_and_index = (
-            consuming_instruction,
+        self.__consuming_instruction = consuming_instruction
+        self.__index_in_consuming_instruction = \
             index_in_consuming_instruction
-        )
-        self._produced_part = None
+        self.__produced_part = None
+
+    @property
+    def _produced_part(self):
+        """The produced mesh this mesh is connected to or :obj:`None`.
+
+        The :class:`row <knittingpattern.Row.Row>` may store the connection
+        without mesh objects. It is resolved when it is accessed.
+        """
+        if self.__produced_part is None:
+            instruction = self.__consuming_instruction
+            index = self.__index_in_consuming_instruction
+            instruction.row._resolve_consumed_mesh(instruction, index)
+        return self.__produced_part
+
+    @_produced_part.setter
+    def _produced_part(self, produced_mesh):
+        self.__produced_part = produced_mesh
 
     def _producing_instruction_and_index(self):
         return self._produced_part._producing_instruction_and_index()
@@ -471,10 +533,12 @@ class ConsumedMesh(Mesh):
         return self._produced_part._producing_row_and_index()
 
     def _consuming_instruction_and_index(self):
-        return self.__consuming_instruction_and_index
+        return (self.__consuming_instruction,
+                self.__index_in_consuming_instruction)
 
     def _consuming_row_and_index(self):
-        instruction, index = self.__consuming_instruction_and_index
+        instruction = self.__consuming_instruction
+        index = self.__index_in_consuming_instruction
         consuming_row = instruction.row
         return (
             consuming_row, index +
@@ -1,4 +1,5 @@
 """In this module you can find the parsing of knitting pattern structures."""
+from .instrumentation import spanned, FINISH_INHERITANCE, CONNECT_ROWS
 # attributes
 
 ID = "id"  #: the id of a row, an instruction or a pattern
@@ -89,6 +90,7 @@ class Parser(object):
         self._create_pattern_set(pattern_collection, values)
         return self._pattern_set
 
+    @spanned(FINISH_INHERITANCE)
     def _finish_inheritance(self):
         """Finish those who still need to inherit."""
         while self._inheritance_todos:
@@ -198,6 +200,7 @@ class Parser(object):
             rows.append(self._row(row))
         return rows
 
+    @spanned(CONNECT_ROWS)
     def _connect_rows(self, connections):
         """Connect the parsed rows."""
         for connection in connections:
@@ -218,15 +221,17 @@ class Parser(object):
             from_row_stop_index = from_row_start_index + number_of_meshes
             to_row_stop_index = to_row_start_index + number_of_meshes
             assert 0 <= from_row_start_index <= from_row_stop_index
-            produced_meshes = from_row.produced_meshes[
-                from_row_start_index:from_row_stop_index]
+            number_of_produced_meshes = min(
+                from_row_stop_index, from_row.number_of_produced_meshes
+            ) - from_row_start_index
             assert 0 <= to_row_start_index <= to_row_stop_index
-            consumed_meshes = to_row.consumed_meshes[
-                to_row_start_index:to_row_stop_index]
-            assert len(produced_meshes) == len(consumed_meshes)
-            mesh_pairs = zip(produced_meshes, consumed_meshes)
-            for produced_mesh, consumed_mesh in mesh_pairs:
-                produced_mesh.connect_to(consumed_mesh)
+            number_of_consumed_meshes = min(
+                to_row_stop_index, to_row.number_of_consumed_meshes
+            ) - to_row_start_index
+            assert number_of_produced_meshes == number_of_consumed_meshes
+            from_row.connect_produced_meshes(
+                from_row_start_index, to_row, to_row_start_index,
+                max(number_of_produced_meshes, 0))
 
     def _get_type(self, values):
         """:return: the type of a knitting pattern set."""
@@ -23,14 +23,14 @@ These functions should do the same:
     kp = new_knitting_pattern_set_loader().file("my_pattern")
 
 """
-from .Loader import JSONLoader
+from .Loader import JSONLoader, has_extension
 from .Parser import Parser, ParsingError
 from .KnittingPatternSet import KnittingPatternSet
 from .IdCollection import IdCollection
 from .KnittingPattern import KnittingPattern
-from .Row import Row
-from .InstructionLibrary import DefaultInstructions
-from .Instruction import InstructionInRow
+from .Row import Row, CompactRow
+from .InstructionLibrary import DefaultInstructions, CompactDefaultInstructions
+from .Instruction import InstructionInRow, CompactInstructionInRow
 
 
 class ParsingSpecification(object):
@@ -88,6 +88,32 @@ class DefaultSpecification(ParsingSpecification):
         return "<{}.{}>".format(cls.__module__, cls.__qualname__)
 
 
+class CompactSpecification(ParsingSpecification):
+
+    """This specification creates compact rows and instructions.
+
+    Instructions of the same type share the tuple of specifications that they
+    inherit from the instruction library.
+    This reduces the memory used per instruction in large patterns.
+
+    .. code:: python
+
+        loader = new_knitting_pattern_set_loader(CompactSpecification())
+        knitting_pattern_set = loader.path("large_pattern.json")
+
+    .. seealso:: :class:`knittingpattern.Row.CompactRow`,
+      :class:`knittingpattern.Instruction.CompactInstructionInRow`,
+      :class:`knittingpattern.InstructionLibrary.CompactDefaultInstructions`
+    """
+
+    def __init__(self):
+        """Initialize the compact specification with no arguments."""
+        super().__init__(
+            new_row=CompactRow,
+            new_default_instructions=CompactDefaultInstructions,
+            new_instruction_in_row=CompactInstructionInRow)
+
+
 def new_knitting_pattern_set_loader(specification=DefaultSpecification()):
     """Create a loader for a knitting pattern set.
 
@@ -95,11 +121,14 @@ def new_knitting_pattern_set_loader(specification=DefaultSpecification()):
       <knittingpattern.ParsingSpecification.ParsingSpecification>`
       for the knitting pattern set, default
       :class:`DefaultSpecification`
+
+    Folders are loaded from their ``.json`` files, compressed or not.
     """
     parser = specification.new_parser(specification)
-    loader = specification.new_loader(parser.knitting_pattern_set)
+    loader = specification.new_loader(parser.knitting_pattern_set,
+                                      has_extension(".json"))
     return loader
 
 
 __all__ = ["ParsingSpecification", "new_knitting_pattern_set_loader",
-           "DefaultSpecification"]
+           "DefaultSpecification", "CompactSpecification"]
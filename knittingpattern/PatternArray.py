@@ -0,0 +1,244 @@
+"""A column-oriented view of a knitting pattern.
+
+:class:`Rows <knittingpattern.Row.Row>` and :class:`instructions
+<knittingpattern.Instruction.InstructionInRow>` are Python objects.
+Analyzing them one by one can be slow for large patterns.
+A :class:`PatternArray` stores the attributes of all instructions in
+`NumPy <http://www.numpy.org/>`__ arrays, one entry per instruction.
+Statistics can then be computed with vectorized operations.
+
+.. code:: python
+
+    arrays = knitting_pattern.to_arrays()
+    for color, count in zip(arrays.colors, arrays.color_counts()):
+        print(color, count)
+
+.. note:: NumPy is not required to import this module. It is imported when a
+  :class:`PatternArray` is created.
+"""
+
+
+class PatternArray(object):
+    """The instructions of a knitting pattern in arrays.
+
+    The instructions are ordered by their :attr:`rows` and then by their
+    position in the row.
+    The rows are in :meth:`knit order
+    <knittingpattern.KnittingPattern.KnittingPattern.rows_in_knit_order>`.
+    The instructions of the row at index ``i`` are located between
+    ``row_offsets[i]`` and ``row_offsets[i + 1]``.
+
+    .. code:: python
+
+        start, stop = arrays.row_offsets[i:i + 2]
+        assert arrays.instructions[start:stop] == arrays.rows[i].instructions
+    """
+
+    def __init__(self, knitting_pattern):
+        """Create a new array view of a knitting pattern.
+
+        :param knittingpattern.KnittingPattern.KnittingPattern
+          knitting_pattern: the pattern to take the instructions from
+        :raises ImportError: if NumPy is not installed
+
+        The view is not updated when the :paramref:`knitting_pattern` changes.
+        """
+        import numpy
+        self._knitting_pattern = knitting_pattern
+        if knitting_pattern.rows:
+            rows = knitting_pattern.rows_in_knit_order()
+        else:
+            rows = []
+        self._rows = rows
+        instructions = []
+        row_offsets = [0]
+        for row in rows:
+            instructions.extend(row.instructions)
+            row_offsets.append(len(instructions))
+        self._instructions = instructions
+        types = {}
+        colors = {}
+        type_ids = []
+        color_ids = []
+        consumed = []
+        produced = []
+        for instruction in instructions:
+            type_ids.append(types.setdefault(instruction.type, len(types)))
+            color_ids.append(colors.setdefault(instruction.color, len(colors)))
+            consumed.append(instruction.number_of_consumed_meshes)
+            produced.append(instruction.number_of_produced_meshes)
+        self._types = list(types)
+        self._colors = list(colors)
+        self._row_offsets = numpy.array(row_offsets, dtype=numpy.intp)
+        self._row_index = numpy.repeat(
+            numpy.arange(len(rows), dtype=numpy.intp),
+            numpy.diff(self._row_offsets))
+        self._type_id = numpy.array(type_ids, dtype=numpy.intp)
+        self._color_id = numpy.array(color_ids, dtype=numpy.intp)
+        self._number_of_consumed_meshes = numpy.array(consumed,
+                                                      dtype=numpy.intp)
+        self._number_of_produced_meshes = numpy.array(produced,
+                                                      dtype=numpy.intp)
+        self._xy = None
+
+    @property
+    def knitting_pattern(self):
+        """The knitting pattern this view was created from.
+
+        :rtype: knittingpattern.KnittingPattern.KnittingPattern
+        """
+        return self._knitting_pattern
+
+    @property
+    def rows(self):
+        """The rows in knit order.
+
+        :rtype: list
+        """
+        return self._rows
+
+    @property
+    def instructions(self):
+        """The instructions in the order of the arrays.
+
+        :rtype: list
+        """
+        return self._instructions
+
+    @property
+    def types(self):
+        """The instruction types in order of their first appearance.
+
+        :rtype: list
+
+        .. seealso:: :attr:`type_id`
+        """
+        return self._types
+
+    @property
+    def colors(self):
+        """The instruction colors in order of their first appearance.
+
+        :rtype: list
+
+        Instructions without color have the color :obj:`None`.
+
+        .. seealso:: :attr:`color_id`
+        """
+        return self._colors
+
+    @property
+    def row_offsets(self):
+        """The offsets of the rows in the instruction arrays.
+
+        :return: an array with ``len(rows) + 1`` entries
+        :rtype: numpy.ndarray
+        """
+        return self._row_offsets
+
+    @property
+    def row_index(self):
+        """The index of the row of each instruction in :attr:`rows`.
+
+        :rtype: numpy.ndarray
+        """
+        return self._row_index
+
+    @property
+    def type_id(self):
+        """The index of the type of each instruction in :attr:`types`.
+
+        :rtype: numpy.ndarray
+        """
+        return self._type_id
+
+    @property
+    def color_id(self):
+        """The index of the color of each instruction in :attr:`colors`.
+
+        :rtype: numpy.ndarray
+        """
+        return self._color_id
+
+    @property
+    def number_of_consumed_meshes(self):
+        """The number of meshes each instruction consumes.
+
+        :rtype: numpy.ndarray
+        """
+        return self._number_of_consumed_meshes
+
+    @property
+    def number_of_produced_meshes(self):
+        """The number of meshes each instruction produces.
+
+        :rtype: numpy.ndarray
+        """
+        return self._number_of_produced_meshes
+
+    def _grid_positions(self):
+        """:return: the x and y arrays, computed by a layout once."""
+        if self._xy is None:
+            import numpy
+            from .convert.Layout import GridLayout
+            x = numpy.zeros(len(self._instructions))
+            y = numpy.zeros(len(self._instructions))
+            if self._instructions:
+                layout = self._knitting_pattern.cached(GridLayout)
+                offsets = self._row_offsets
+                for index, row in enumerate(self._rows):
+                    row_in_grid = layout.row_in_grid(row)
+                    start = offsets[index]
+                    for i, instruction in enumerate(row_in_grid.instructions,
+                                                    start):
+                        x[i] = instruction.x
+                        y[i] = instruction.y
+            self._xy = x, y
+        return self._xy
+
+    @property
+    def x(self):
+        """The x coordinate of each instruction in the grid.
+
+        :rtype: numpy.ndarray
+
+        .. seealso:: :class:`knittingpattern.convert.Layout.GridLayout`
+        """
+        return self._grid_positions()[0]
+
+    @property
+    def y(self):
+        """The y coordinate of each instruction in the grid.
+
+        :rtype: numpy.ndarray
+
+        .. seealso:: :class:`knittingpattern.convert.Layout.GridLayout`
+        """
+        return self._grid_positions()[1]
+
+    def color_counts(self):
+        """The number of instructions for each color.
+
+        :return: an array with the number of instructions for each color in
+          :attr:`colors`
+        :rtype: numpy.ndarray
+        """
+        import numpy
+        return numpy.bincount(self._color_id, minlength=len(self._colors))
+
+    def type_counts(self):
+        """The number of instructions for each type.
+
+        :return: an array with the number of instructions for each type in
+          :attr:`types`
+        :rtype: numpy.ndarray
+        """
+        import numpy
+        return numpy.bincount(self._type_id, minlength=len(self._types))
+
+    def __len__(self):
+        """:return: the number of instructions"""
+        return len(self._instructions)
+
+
+__all__ = ["PatternArray"]
@@ -1,6 +1,7 @@
 """This module contains the :class:`~knittingpattern.Prototype.Prototype`
 that can be used to create inheritance on object level instead of class level.
 """
+from .counters import lookup_depth
 
 
 class Prototype(object):
@@ -11,8 +12,14 @@ class Prototype(object):
     Throughout this class `specification key` refers to a
     :func:`hashable <hash>` object
     to look up a value in the specification.
+
+    Prototypes store their attributes in :ref:`slots <slots>` to save memory.
+    Subclasses that do not define ``__slots__`` get a
+    :attr:`~object.__dict__`.
     """
 
+    __slots__ = ("__specification", "__inherited", "__weakref__")
+
     def __init__(self, specification, inherited_values=()):
         """create a new prototype
 
@@ -31,19 +38,47 @@ class Prototype(object):
         :paramref:`inherited_values`, by calling :meth:`inherit_from`.
 
         """
-        self.__specification = [specification] + list(inherited_values)
+        self.__specification = specification
+        self.__inherited = self._new_inherited_values(inherited_values)
+
+    @staticmethod
+    def _new_inherited_values(inherited_values):
+        """:return: the container for the inherited values"""
+        return list(inherited_values)
 
-    def get(self, key, default=None):
+    def _get(self, key, default=None):
         """
         :return: the value behind :paramref:`key` in the specification.
           If no value was found, :paramref:`default` is returned.
         :param key: a :ref:`specification key <prototype-key>`
         """
-        for base in self.__specification:
+        specification = self.__specification
+        if key in specification:
+            return specification[key]
+        for base in self.__inherited:
             if key in base:
                 return base[key]
         return default
 
+    get = _get
+
+    def _counting_get(self, key, default=None):
+        """Same as :meth:`get` but counts the depth of the lookup.
+
+        :meth:`knittingpattern.counters.count_lookup_depths` replaces
+        :meth:`get` with this method.
+        """
+        specification = self.__specification
+        if key in specification:
+            lookup_depth(0)
+            return specification[key]
+        for depth, base in enumerate(self.__inherited, 1):
+            if key in base:
+                lookup_depth(depth)
+                return base[key]
+        lookup_depth(None)
+        return default
+
     def __getitem__(self, key):
         """``prototype[key]``
 
@@ -91,7 +126,43 @@ class Prototype(object):
         3. :paramref:`~__init__.inherited_values`
 
         """
-        self.__specification.insert(1, new_specification)
+        self.__inherited.insert(0, new_specification)
+
+
+class CompactPrototype(Prototype):
+    """A :class:`Prototype` that shares its inherited values.
+
+    The inherited values are stored in a :class:`tuple` instead of a
+    :class:`list`. Prototypes can share this tuple, see
+    :meth:`inherit_from_all`.
+    Use this as the first base class together with a subclass of
+    :class:`Prototype`.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def _new_inherited_values(inherited_values):
+        """:return: the container for the inherited values"""
+        return tuple(inherited_values)
+
+    def inherit_from(self, new_specification):
+        """Same as :meth:`Prototype.inherit_from`."""
+        self.inherit_from_all((new_specification,))
+
+    def inherit_from_all(self, new_specifications):
+        """Inherit from several specifications at once.
+
+        :param tuple new_specifications: specifications in lookup order
+
+        If nothing was inherited before, the tuple
+        :paramref:`new_specifications` is used without a copy.
+        Thus, prototypes that inherit from the same tuple share it.
+        """
+        inherited = self._Prototype__inherited
+        if inherited:
+            new_specifications = new_specifications + inherited
+        self._Prototype__inherited = new_specifications
 
 
-__all__ = ["Prototype"]
+__all__ = ["Prototype", "CompactPrototype"]
@@ -6,16 +6,77 @@ They contain :class:`instructions
 <knittingpattern.Instruction.InstructionInRow>` and can be connected to other
 rows.
 """
-from .Prototype import Prototype
-from itertools import chain
+from .Prototype import Prototype, CompactPrototype
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain, repeat
 from ObservableList import ObservableList
 from .utils import unique
+from .counters import rescan, INDEX_IN_ROW
 
 COLOR = "color"  #: the color of the row
 
 #: an error message
 CONISTENCY_MESSAGE = "The data structure must be consistent."
 
+_NO_CONNECTION = -1  #: a mesh index without a pending connection
+
+
+class _PendingConnections(object):
+    """The connections of meshes in a row that have no mesh objects, yet.
+
+    Entry ``i`` is the connection of the mesh at index ``i`` in the row.
+    It is stored as the number of the connected row and the index of the
+    connected mesh in that row. This takes less memory than the
+    :class:`meshes <knittingpattern.Mesh.Mesh>`.
+    """
+
+    __slots__ = ("_rows", "_row_numbers", "_indices")
+
+    def __init__(self):
+        """Create an empty collection of connections."""
+        self._rows = []
+        self._row_numbers = array("l")
+        self._indices = array("l")
+
+    def get(self, index):
+        """:return: a tuple ``(row, index_in_row)`` or :obj:`None`"""
+        if index < len(self._row_numbers):
+            row_number = self._row_numbers[index]
+            if row_number != _NO_CONNECTION:
+                return self._rows[row_number], self._indices[index]
+        return None
+
+    def set(self, index, row, index_in_row):
+        """Store that the mesh at :paramref:`index` is connected."""
+        missing = index + 1 - len(self._row_numbers)
+        if missing > 0:
+            self._row_numbers.extend(repeat(_NO_CONNECTION, missing))
+            self._indices.extend(repeat(0, missing))
+        for row_number, known_row in enumerate(self._rows):
+            if known_row is row:
+                break
+        else:
+            row_number = len(self._rows)
+            self._rows.append(row)
+        self._row_numbers[index] = row_number
+        self._indices[index] = index_in_row
+
+    def remove(self, index):
+        """Remove the connection of the mesh at :paramref:`index`."""
+        if index < len(self._row_numbers):
+            self._row_numbers[index] = _NO_CONNECTION
+
+    def items(self):
+        """:return: a list of tuples ``(index, row, index_in_row)``"""
+        rows = self._rows
+        indices = self._indices
+        return [(index, rows[row_number], indices[index])
+                for index, row_number in enumerate(self._row_numbers)
+                if row_number != _NO_CONNECTION]
+
 
 class Row(Prototype):
 
@@ -25,6 +86,11 @@ class Row(Prototype):
     <knittingpattern.KnittingPattern.KnittingPattern>`.
     """
 
+    __slots__ = ("_id", "_instructions", "_parser", "_pending_produced",
+                 "_pending_consumed", "_mesh_offsets_cache",
+                 "_positions_are_valid", "_numbered_length",
+                 "_change_observers", "_color_counts", "_colors_in_order")
+
     def __init__(self, row_id, values, parser):
         """Create a new row.
 
@@ -42,16 +108,463 @@ class Row(Prototype):
         self._instructions = ObservableList()
         self._instructions.register_observer(self._instructions_changed)
         self._parser = parser
+        self._pending_produced = None
+        self._pending_consumed = None
+        self._mesh_offsets_cache = None
+        self._positions_are_valid = True
+        self._numbered_length = 0
+        self._change_observers = None
+        self._color_counts = None
+        self._colors_in_order = None
+
+    def register_change_observer(self, observer):
+        """Register an observer for the changes of this row.
+
+        :param observer: a callable that is called with this row as argument
+          after instructions were added or removed and after the connections
+          of the meshes of this row changed
+
+        .. seealso:: :attr:`KnittingPattern.generation
+          <knittingpattern.KnittingPattern.KnittingPattern.generation>`
+        """
+        if self._change_observers is None:
+            self._change_observers = []
+        self._change_observers.append(observer)
+
+    def _changed(self):
+        """Notify the change observers of this row."""
+        self._mesh_offsets_cache = None
+        if self._change_observers is not None:
+            for observer in self._change_observers:
+                observer(self)
 
     def _instructions_changed(self, change):
         """Call when there is a change in the instructions."""
-        if change.adds():
+        self._mesh_offsets_cache = None
+        if not change.length:
+            return
+        instructions = self._instructions
+        if change.removes():
+            if change.stop != len(instructions):
+                self._positions_are_valid = False
+            elif self._numbered_length == change.stop:
+                self._numbered_length = change.start
+            self._create_pending_connections(instructions)
+            self._remove_colors(instructions[change.start:change.stop],
+                                change.stop == len(instructions))
+        elif change.adds():
+            old_length = len(instructions) - change.length
+            if change.start < old_length:
+                self._positions_are_valid = False
+                self._create_pending_connections(
+                    instructions[:change.start] + instructions[change.stop:])
+            elif not self._positions_are_valid or \
+                    self._numbered_length < old_length:
+                self._positions_are_valid = False
             for index, instruction in change.items():
                 if isinstance(instruction, dict):
                     in_row = self._parser.instruction_in_row(self, instruction)
-                    self.instructions[index] = in_row
+                    # replace without notifying the observers again
+                    list.__setitem__(instructions, index, in_row)
+                    instruction = in_row
                 else:
                     instruction.transfer_to_row(self)
+                instruction._cached_index_in_row = index
+            if self._positions_are_valid:
+                self._numbered_length = len(instructions)
+            self._add_colors(instructions[change.start:change.stop],
+                             change.start == old_length)
+        self._changed()
+
+    def _remove_colors(self, instructions, at_the_end):
+        """Update the colors before instructions are removed."""
+        counts = self._color_counts
+        if counts is None:
+            return
+        removed_colors = []
+        for instruction in instructions:
+            for color in instruction.colors:
+                counts[color] -= 1
+                if not counts[color]:
+                    del counts[color]
+                    removed_colors.append(color)
+        if not at_the_end:
+            self._colors_in_order = None
+        elif removed_colors and self._colors_in_order is not None:
+            self._colors_in_order = [color for color in self._colors_in_order
+                                     if color in counts]
+
+    def _add_colors(self, instructions, at_the_end):
+        """Update the colors after instructions were added."""
+        counts = self._color_counts
+        if counts is None:
+            return
+        colors_in_order = self._colors_in_order if at_the_end else None
+        for instruction in instructions:
+            for color in instruction.colors:
+                if color not in counts and colors_in_order is not None:
+                    colors_in_order.append(color)
+                counts[color] += 1
+        self._colors_in_order = colors_in_order
+
+    def _index_of_instruction(self, instruction):
+        """The index of an instruction in the :attr:`instructions`.
+
+        :return: the index or :obj:`None` if the instruction is not in this
+          row
+        :rtype: int
+
+        The positions of the instructions are kept up to date when
+        instructions are added at the end. Other changes renumber the
+        instructions once they are needed.
+        This is used by :meth:`InstructionInRow.get_index_in_row()
+        <knittingpattern.Instruction.InstructionInRow.get_index_in_row>`.
+        """
+        instructions = self._instructions
+        if not self._positions_are_valid or \
+                self._numbered_length != len(instructions):
+            rescan(INDEX_IN_ROW)
+            for index, instruction_in_row in enumerate(instructions):
+                instruction_in_row._cached_index_in_row = index
+            self._positions_are_valid = True
+            self._numbered_length = len(instructions)
+        index = instruction._cached_index_in_row
+        if index is not None and index < len(instructions) and \
+                instructions[index] is instruction:
+            return index
+        return None
+
+    def _instructions_in_row(self, specifications):
+        """:return: a list of instructions in this row
+
+        :param specifications: instructions and specifications of
+          instructions
+        """
+        instruction_in_row = self._parser.instruction_in_row
+        return [(instruction_in_row(self, specification)
+                 if isinstance(specification, dict) else specification)
+                for specification in specifications]
+
+    def extend_specs(self, specifications):
+        """Add instructions to the end of this row.
+
+        :param specifications: an iterable of instructions or specifications
+          of instructions as :class:`dicts <dict>`
+
+        The specifications are converted to :class:`instructions
+        <knittingpattern.Instruction.InstructionInRow>` first.
+        Then, they are added with one change of the :attr:`instructions`.
+
+        .. seealso:: :meth:`batch`
+        """
+        self._instructions.extend(self._instructions_in_row(specifications))
+
+    @contextmanager
+    def batch(self):
+        """Change the instructions of this row at once.
+
+        :return: a context manager that yields a :class:`list` with the
+          :attr:`instructions`
+
+        Change the yielded list in the ``with`` block.
+        At the end of the block, the :attr:`instructions` are replaced by the
+        content of the list.
+        Specifications are converted to :class:`instructions
+        <knittingpattern.Instruction.InstructionInRow>` and the observers of
+        the :attr:`instructions` are notified once.
+        If only instructions were added at the end, they are notified about
+        one addition. Otherwise, the changed part is removed and added.
+
+        .. code:: python
+
+            with row.batch() as instructions:
+                for color in colors:
+                    instructions.append({"color": color})
+
+        If an exception is raised in the ``with`` block, the instructions do
+        not change.
+
+        .. seealso:: :meth:`extend_specs`
+        """
+        old_instructions = list(self._instructions)
+        new_instructions = list(old_instructions)
+        yield new_instructions
+        new_instructions = self._instructions_in_row(new_instructions)
+        start = 0
+        for start, (old, new) in enumerate(zip(old_instructions,
+                                               new_instructions)):
+            if old is not new:
+                break
+        else:
+            start = min(len(old_instructions), len(new_instructions))
+        old_stop = len(old_instructions)
+        new_stop = len(new_instructions)
+        while old_stop > start and new_stop > start and \
+                old_instructions[old_stop - 1] is \
+                new_instructions[new_stop - 1]:
+            old_stop -= 1
+            new_stop -= 1
+        instructions = self._instructions
+        if start == old_stop == len(old_instructions):
+            instructions.extend(new_instructions[start:new_stop])
+            return
+        # ObservableList notifies wrong lengths when assigning to slices
+        if start != old_stop:
+            instructions._notify_remove_at(start, old_stop - start)
+        list.__setitem__(instructions, slice(start, old_stop),
+                         new_instructions[start:new_stop])
+        if start != new_stop:
+            instructions._notify_add_at(start, new_stop - start)
+
+    def _mesh_offsets(self, instructions=None):
+        """The indices of the first meshes of the instructions in the row.
+
+        :param list instructions: the instructions to compute the offsets for
+          or :obj:`None` for the :attr:`instructions` of this row
+        :return: a tuple ``(produced, consumed)`` of lists with one entry more
+          than there are instructions
+
+        The offsets of the :attr:`instructions` are cached until the
+        instructions or their connections change, see :meth:`_changed`.
+        Observers are notified before instructions are removed. Offsets
+        cached in the meantime have the wrong length and are computed again.
+        """
+        if instructions is None:
+            instructions = self._instructions
+            offsets = self._mesh_offsets_cache
+            if offsets is None or len(offsets[0]) != len(instructions) + 1:
+                offsets = self._mesh_offsets(instructions)
+                self._mesh_offsets_cache = offsets
+            return offsets
+        produced = [0]
+        consumed = [0]
+        for instruction in instructions:
+            produced.append(produced[-1] +
+                            instruction.number_of_produced_meshes)
+            consumed.append(consumed[-1] +
+                            instruction.number_of_consumed_meshes)
+        return produced, consumed
+
+    def _mesh_at(self, index, produced, instructions=None):
+        """:return: the mesh object at :paramref:`index` in the row
+
+        :param bool produced: whether to return a produced or consumed mesh
+        :param list instructions: the instructions to take the mesh from, see
+          :meth:`_mesh_offsets`
+        """
+        offsets = self._mesh_offsets(instructions)[0 if produced else 1]
+        if instructions is None:
+            instructions = self._instructions
+        position = bisect_right(offsets, index) - 1
+        if index < 0 or position >= len(instructions):
+            raise IndexError("{} has no mesh at index {}".format(self, index))
+        instruction = instructions[position]
+        if produced:
+            meshes = instruction.produced_meshes
+        else:
+            meshes = instruction.consumed_meshes
+        return meshes[index - offsets[position]]
+
+    def _instruction_at(self, index, produced):
+        """:return: the instruction with the mesh at :paramref:`index`"""
+        offsets = self._mesh_offsets()[0 if produced else 1]
+        position = bisect_right(offsets, index) - 1
+        if index < 0 or position >= len(self._instructions):
+            raise IndexError("{} has no mesh at index {}".format(self, index))
+        return self._instructions[position]
+
+    def _create_pending_connections(self, instructions):
+        """Create the mesh objects for the pending connections.
+
+        :param list instructions: the instructions that the pending
+          connections refer to
+
+        This is called before the instructions change.
+        """
+        pending_produced = self._pending_produced
+        pending_consumed = self._pending_consumed
+        self._pending_produced = self._pending_consumed = None
+        if pending_produced is not None:
+            for index, row, index_in_row in pending_produced.items():
+                produced_mesh = self._mesh_at(index, True, instructions)
+                if row is self:
+                    pending_consumed.remove(index_in_row)
+                    consumed_mesh = self._mesh_at(index_in_row, False,
+                                                  instructions)
+                else:
+                    row._pending_consumed.remove(index_in_row)
+                    consumed_mesh = row._mesh_at(index_in_row, False)
+                produced_mesh._connect_to(consumed_mesh)
+        if pending_consumed is not None:
+            for index, row, index_in_row in pending_consumed.items():
+                consumed_mesh = self._mesh_at(index, False, instructions)
+                row._pending_produced.remove(index_in_row)
+                produced_mesh = row._mesh_at(index_in_row, True)
+                produced_mesh._connect_to(consumed_mesh)
+
+    def _resolve_produced_mesh(self, instruction, index_in_instruction):
+        """Create the pending connection of a produced mesh object."""
+        pending = self._pending_produced
+        if pending is None:
+            return
+        position = instruction.get_index_in_row()
+        if position is None:
+            return
+        index = self._mesh_offsets()[0][position] + index_in_instruction
+        connection = pending.get(index)
+        if connection is None:
+            return
+        consuming_row, consuming_index = connection
+        pending.remove(index)
+        consuming_row._pending_consumed.remove(consuming_index)
+        produced_mesh = instruction.produced_meshes[index_in_instruction]
+        produced_mesh._connect_to(
+            consuming_row._mesh_at(consuming_index, False))
+
+    def _resolve_consumed_mesh(self, instruction, index_in_instruction):
+        """Create the pending connection of a consumed mesh object."""
+        pending = self._pending_consumed
+        if pending is None:
+            return
+        position = instruction.get_index_in_row()
+        if position is None:
+            return
+        index = self._mesh_offsets()[1][position] + index_in_instruction
+        connection = pending.get(index)
+        if connection is None:
+            return
+        producing_row, producing_index = connection
+        pending.remove(index)
+        producing_row._pending_produced.remove(producing_index)
+        consumed_mesh = instruction.consumed_meshes[index_in_instruction]
+        producing_row._mesh_at(producing_index, True)._connect_to(
+            consumed_mesh)
+
+    def connect_produced_meshes(self, start, consuming_row, consuming_start,
+                                number_of_meshes):
+        """Connect produced meshes of this row to consumed meshes of a row.
+
+        :param int start: the index of the first produced mesh in this row
+        :param knittingpattern.Row.Row consuming_row: the row that consumes
+          the meshes
+        :param int consuming_start: the index of the first consumed mesh in
+          the :paramref:`consuming_row`
+        :param int number_of_meshes: the number of meshes to connect
+        :raises IndexError: if a row has not enough meshes
+
+        This is the same as connecting the meshes one by one with
+        :meth:`Mesh.connect_to() <knittingpattern.Mesh.Mesh.connect_to>`.
+        However, meshes that were not accessed, yet, are not created.
+        Old connections of the meshes are removed.
+        """
+        for i in range(number_of_meshes):
+            self._connect_produced_mesh(start + i, consuming_row,
+                                        consuming_start + i)
+        if number_of_meshes:
+            self._changed()
+            consuming_row._changed()
+
+    def _connect_produced_mesh(self, index, consuming_row, consuming_index):
+        """Connect one produced mesh, see :meth:`connect_produced_meshes`."""
+        producing_instruction = self._instruction_at(index, True)
+        consuming_instruction = consuming_row._instruction_at(consuming_index,
+                                                              False)
+        if producing_instruction._meshes_are_created() or \
+                consuming_instruction._meshes_are_created():
+            produced_mesh = self._mesh_at(index, True)
+            produced_mesh.connect_to(
+                consuming_row._mesh_at(consuming_index, False))
+            return
+        self._remove_pending_connection(index, True)
+        consuming_row._remove_pending_connection(consuming_index, False)
+        if self._pending_produced is None:
+            self._pending_produced = _PendingConnections()
+        if consuming_row._pending_consumed is None:
+            consuming_row._pending_consumed = _PendingConnections()
+        self._pending_produced.set(index, consuming_row, consuming_index)
+        consuming_row._pending_consumed.set(consuming_index, self, index)
+
+    def _remove_pending_connection(self, index, produced):
+        """Remove the pending connection of the mesh at an index."""
+        if produced:
+            pending = self._pending_produced
+        else:
+            pending = self._pending_consumed
+        connection = pending and pending.get(index)
+        if connection is None:
+            return
+        row, index_in_row = connection
+        pending.remove(index)
+        if produced:
+            row._pending_consumed.remove(index_in_row)
+        else:
+            row._pending_produced.remove(index_in_row)
+
+    def produced_mesh_connections(self):
+        """The connections of the produced meshes of this row.
+
+        :return: a list of tuples ``(index, consuming_row,
+          index_in_consuming_row)`` with the index of a produced mesh in this
+          row, the row that consumes the mesh and the index of the mesh in
+          the consumed meshes of that row
+        :rtype: list
+
+        In contrast to :attr:`produced_meshes`, this creates no
+        :class:`meshes <knittingpattern.Mesh.Mesh>`.
+
+        .. seealso:: :meth:`consumed_mesh_connections`
+        """
+        return self._mesh_connections(True)
+
+    def consumed_mesh_connections(self):
+        """The connections of the consumed meshes of this row.
+
+        :return: a list of tuples ``(index, producing_row,
+          index_in_producing_row)`` with the index of a consumed mesh in this
+          row, the row that produces the mesh and the index of the mesh in
+          the produced meshes of that row
+        :rtype: list
+
+        .. seealso:: :meth:`produced_mesh_connections`
+        """
+        return self._mesh_connections(False)
+
+    def _mesh_connections(self, produced):
+        """See :meth:`produced_mesh_connections`."""
+        if produced:
+            pending = self._pending_produced
+        else:
+            pending = self._pending_consumed
+        connections = []
+        index = 0
+        for instruction in self._instructions:
+            if instruction._meshes_are_created():
+                if produced:
+                    for mesh in instruction.produced_meshes:
+                        if mesh.is_consumed():
+                            connections.append(
+                                (index, mesh.consuming_row,
+                                 mesh.index_in_consuming_row))
+                        index += 1
+                else:
+                    for mesh in instruction.consumed_meshes:
+                        if mesh.is_produced():
+                            connections.append(
+                                (index, mesh.producing_row,
+                                 mesh.index_in_producing_row))
+                        index += 1
+                continue
+            if produced:
+                number_of_meshes = instruction.number_of_produced_meshes
+            else:
+                number_of_meshes = instruction.number_of_consumed_meshes
+            if pending is not None:
+                for mesh_index in range(index, index + number_of_meshes):
+                    connection = pending.get(mesh_index)
+                    if connection is not None:
+                        connections.append((mesh_index,) + connection)
+            index += number_of_meshes
+        return connections
 
     @property
     def id(self):
@@ -83,8 +596,7 @@ class Row(Prototype):
           <knittingpattern.Instruction.Instruction.number_of_produced_meshes>`,
           :meth:`number_of_consumed_meshes`
         """
-        return sum(instruction.number_of_produced_meshes
-                   for instruction in self.instructions)
+        return self._mesh_offsets()[0][-1]
 
     @property
     def number_of_consumed_meshes(self):
@@ -98,8 +610,7 @@ class Row(Prototype):
           <knittingpattern.Instruction.Instruction.number_of_consumed_meshes>`,
           :meth:`number_of_produced_meshes`
         """
-        return sum(instruction.number_of_consumed_meshes
-                   for instruction in self.instructions)
+        return self._mesh_offsets()[1][-1]
 
     @property
     def produced_meshes(self):
@@ -141,8 +652,33 @@ class Row(Prototype):
         :return: a list of colors of the knitting pattern in the order that
           they appear in
         :rtype: list
+
+        The colors are computed once and updated when instructions are added
+        or removed.
+        """
+        if self._color_counts is None:
+            self._color_counts = Counter(
+                color for instruction in self._instructions
+                for color in instruction.colors)
+        if self._colors_in_order is None:
+            self._colors_in_order = unique(
+                instruction.colors for instruction in self._instructions)
+        return list(self._colors_in_order)
+
+    @property
+    def instruction_color_counts(self):
+        """The number of instructions of each color in the row.
+
+        :return: a mapping from each of the :attr:`instruction_colors` to the
+          number of instructions that have this color
+        :rtype: collections.Counter
+
+        The counts are computed once and updated when instructions are added
+        or removed.
         """
-        return unique(instruction.colors for instruction in self.instructions)
+        if self._color_counts is None:
+            self.instruction_colors
+        return Counter(self._color_counts)
 
     @property
     def last_produced_mesh(self):
@@ -214,11 +750,9 @@ class Row(Prototype):
           instructions.
         """
         rows_before = []
-        for mesh in self.consumed_meshes:
-            if mesh.is_produced():
-                row = mesh.producing_row
-                if rows_before not in rows_before:
-                    rows_before.append(row)
+        for _, row, _ in self.consumed_mesh_connections():
+            if rows_before not in rows_before:
+                rows_before.append(row)
         return rows_before
 
     @property
@@ -231,11 +765,9 @@ class Row(Prototype):
           instructions.
         """
         rows_after = []
-        for mesh in self.produced_meshes:
-            if mesh.is_consumed():
-                row = mesh.consuming_row
-                if rows_after not in rows_after:
-                    rows_after.append(row)
+        for _, row, _ in self.produced_mesh_connections():
+            if rows_after not in rows_after:
+                rows_after.append(row)
         return rows_after
 
     @property
@@ -256,4 +788,15 @@ class Row(Prototype):
         """
         return self.instructions[-1]
 
-__all__ = ["Row", "COLOR"]
+
+class CompactRow(CompactPrototype, Row):
+    """A :class:`Row` that shares its inherited values.
+
+    .. seealso:: :class:`CompactSpecification
+      <knittingpattern.ParsingSpecification.CompactSpecification>`
+    """
+
+    __slots__ = ()
+
+
+__all__ = ["Row", "COLOR", "CompactRow"]
@@ -120,6 +120,27 @@ def new_knitting_pattern(id_, name=None):
     return knitting_pattern_set.add_new_pattern(id_, name)
 
 
+def stats():
+    """The statistics of the caches of this library.
+
+    :rtype: knittingpattern.counters.Statistics
+
+    .. seealso:: :func:`knittingpattern.counters.stats`,
+      :func:`reset_stats`
+    """
+    from .counters import stats as stats_
+    return stats_()
+
+
+def reset_stats():
+    """Set the counts of the :func:`stats` to ``0``.
+
+    .. seealso:: :func:`knittingpattern.counters.reset_stats`
+    """
+    from .counters import reset_stats as reset_stats_
+    reset_stats_()
+
+
 def new_knitting_pattern_set():
     """Create a new, empty knitting pattern set.
 
@@ -131,4 +152,4 @@ def new_knitting_pattern_set():
 __all__ = ["load_from_object", "load_from_string", "load_from_file",
            "load_from_path", "load_from_url", "load_from_relative_file",
            "convert_from_image", "load_from", "new_knitting_pattern",
-           "new_knitting_pattern_set"]
+           "new_knitting_pattern_set", "stats", "reset_stats"]
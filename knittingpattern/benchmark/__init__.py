@@ -0,0 +1,22 @@
+"""Measure the performance of the knitting pattern library.
+
+The benchmarks run on synthetic knitting patterns of known sizes, see
+:mod:`knittingpattern.benchmark.generate`.
+:mod:`knittingpattern.benchmark.timing` measures how long each stage of the
+pipeline from parsing to rendering takes.
+:mod:`knittingpattern.benchmark.memory` measures how much memory they use
+and how many bytes the objects of a loaded pattern take.
+The results can be saved as baselines and compared to later runs, see
+:mod:`knittingpattern.benchmark.baseline`.
+
+Run the benchmarks from the command line:
+
+.. code:: bash
+
+    python -m knittingpattern.benchmark --save baseline.json
+    python -m knittingpattern.benchmark --compare baseline.json
+    python -m knittingpattern.benchmark --memory --save memory.json
+
+The sizes of the objects of a pattern are saved in the package, see
+:data:`~knittingpattern.benchmark.memory.MEMORY_BASELINE`.
+"""
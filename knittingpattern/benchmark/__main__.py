@@ -0,0 +1,117 @@
+"""Run the benchmarks from the command line.
+
+.. code:: bash
+
+    python -m knittingpattern.benchmark --help
+
+The exit code is ``1`` if a result is worse than the baseline given with
+``--compare``.
+"""
+from .timing import measure_time, STAGES, DEFAULT_ROWS, DEFAULT_WIDTH, \
+    DEFAULT_REPEAT
+from .memory import measure_memory, MEMORY_STAGES, MEMORY_TOLERANCES, \
+    MemoryResult
+from .generate import PATTERN_GENERATORS
+from .baseline import save_results, compare_results, TIME_TOLERANCES
+import argparse
+import sys
+
+
+def parse_arguments(arguments=None):
+    """Parse the command line arguments.
+
+    :param list arguments: the arguments or :obj:`None` to use
+      :data:`sys.argv`
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m knittingpattern.benchmark",
+        description="Time the stages of the knitting pattern pipeline for "
+                    "generated patterns of growing sizes.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS,
+                        help="the number of rows of the smallest patterns")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH,
+                        help="the number of instructions in a row")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="how often each stage runs")
+    parser.add_argument("--kind", action="append",
+                        choices=sorted(PATTERN_GENERATORS),
+                        help="the kinds of patterns to generate")
+    parser.add_argument("--stage", action="append",
+                        choices=list(STAGES),
+                        help="the stages to measure, with --memory only "
+                             + ", ".join(MEMORY_STAGES))
+    parser.add_argument("--memory", action="store_true",
+                        help="measure the memory instead of the time")
+    parser.add_argument("--save", metavar="PATH",
+                        help="save the results as JSON")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="compare the results to a saved baseline")
+    arguments = parser.parse_args(arguments)
+    if arguments.memory:
+        for stage in arguments.stage or ():
+            if stage not in MEMORY_STAGES:
+                parser.error("The memory of the stage {} can not be measured."
+                             "".format(stage))
+    return arguments
+
+
+def format_time_result(result):
+    """:return: a line of text describing a timing result"""
+    seconds = " ".join("{:9.4f}s".format(second)
+                       for second in result.seconds)
+    exponent = "-" if result.exponent is None else \
+        "{:.2f}".format(result.exponent)
+    return "{:12} {:8} {} exponent {}".format(result.kind, result.stage,
+                                              seconds, exponent)
+
+
+def format_memory_result(result):
+    """:return: a line of text describing a memory result"""
+    if isinstance(result, MemoryResult):
+        peak = " ".join("{:9}B".format(peak) for peak in result.peak_bytes)
+        retained = " ".join("{:9}B".format(retained)
+                            for retained in result.retained_bytes)
+        return "{:12} {:16} peak {} retained {}".format(
+            result.kind, result.stage, peak, retained)
+    size = " ".join("{:9}B".format(bytes_) for bytes_ in result.bytes)
+    per_instruction = result.bytes[-1] / result.instructions[-1]
+    return "{:12} {:16} size {} {:7.1f}B per instruction".format(
+        result.kind, result.stage, size, per_instruction)
+
+
+def main(arguments=None):
+    """Run the benchmarks.
+
+    :param list arguments: see :func:`parse_arguments`
+    :return: the exit code
+    :rtype: int
+    """
+    arguments = parse_arguments(arguments)
+    if arguments.memory:
+        results = measure_memory(arguments.rows, arguments.width,
+                                 arguments.kind, arguments.stage)
+        format_result = format_memory_result
+        tolerances = MEMORY_TOLERANCES
+    else:
+        results = measure_time(arguments.rows, arguments.width,
+                               arguments.kind, arguments.stage,
+                               arguments.repeat)
+        format_result = format_time_result
+        tolerances = TIME_TOLERANCES
+    print("rows:", " ".join(map(str, results[0].rows)) if results else "")
+    for result in results:
+        print(format_result(result))
+    if arguments.save:
+        save_results(results, arguments.save)
+    if arguments.compare:
+        regressions = compare_results(results, arguments.compare,
+                                      tolerances)
+        for regression in regressions:
+            print("regression: {} {} {} was {} and is {}".format(*regression))
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
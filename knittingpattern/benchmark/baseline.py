@@ -0,0 +1,161 @@
+"""Save benchmark results and compare them to earlier results.
+
+The results are saved as JSON. A saved result is a baseline for later
+runs: :func:`compare_results` lists the measures that got worse.
+
+.. code:: python
+
+    save_results(measure_time(), "baseline.json")
+    # ... change the code ...
+    for regression in compare_results(measure_time(), "baseline.json"):
+        print(regression)
+"""
+from collections import namedtuple
+import json
+import platform
+
+#: The version of the format of the saved results.
+BASELINE_VERSION = 2
+
+#: The amount each measure of the :mod:`timing
+#: <knittingpattern.benchmark.timing>` may grow before it is a regression.
+#: For the memory, see
+#: :data:`~knittingpattern.benchmark.memory.MEMORY_TOLERANCES`.
+#: Timings are noisy, so the tolerances are large. The exponent may grow
+#: by ``0.7``, see :data:`ABSOLUTE_MEASURES`. Thus, a stage that became
+#: quadratic is still found.
+TIME_TOLERANCES = {"seconds": 1.0, "exponent": 0.7}
+
+#: The measures whose tolerance is an absolute amount instead of a
+#: relative one. The exponents are logarithms of the ratios of times,
+#: so their noise does not depend on their value.
+ABSOLUTE_MEASURES = ("exponent",)
+
+#: The exponents of scaling curves with shorter times are not compared.
+#: Such times are mostly noise.
+MINIMUM_SECONDS = 0.001
+
+#: A measure that got worse compared to the baseline.
+Regression = namedtuple("Regression", ["kind", "stage", "measure",
+                                       "baseline", "value"])
+
+
+def results_to_object(results):
+    """Convert results to an object that can be saved as JSON.
+
+    :param list results: a list of namedtuples with the fields ``kind`` and
+      ``stage``, e.g. :class:`~knittingpattern.benchmark.timing.TimingResult`
+    :rtype: dict
+    """
+    return {"version": BASELINE_VERSION,
+            "python": platform.python_version(),
+            "results": [dict(result._asdict()) for result in results]}
+
+
+def save_results(results, path):
+    """Save results as JSON.
+
+    :param list results: see :func:`results_to_object`
+    :param str path: the path of the file to save the results to
+    """
+    with open(path, "w", encoding="UTF-8") as file:
+        json.dump(results_to_object(results), file, indent=2,
+                  sort_keys=True)
+
+
+def load_results(path):
+    """Load results saved with :func:`save_results`.
+
+    :param str path: the path of the file
+    :return: a list of dictionaries
+    :rtype: list
+    :raises ValueError: if the file has a different format
+    """
+    with open(path, encoding="UTF-8") as file:
+        saved = json.load(file)
+    if saved.get("version") != BASELINE_VERSION:
+        raise ValueError("{} has the version {} but should have the version "
+                         "{}.".format(path, saved.get("version"),
+                                      BASELINE_VERSION))
+    return saved["results"]
+
+
+def load_python_version(path):
+    """The version of Python the saved results were measured with.
+
+    :param str path: the path of a file saved with :func:`save_results`
+    :return: the version, e.g. ``"3.5.2"``
+    :rtype: str
+    """
+    with open(path, encoding="UTF-8") as file:
+        return json.load(file)["python"]
+
+
+def _last(value):
+    """:return: the last value of a list or the value"""
+    if isinstance(value, (list, tuple)):
+        return value[-1] if value else None
+    return value
+
+
+def _is_too_short(seconds):
+    """:return: whether the seconds of a result are below
+    :data:`MINIMUM_SECONDS`"""
+    if not isinstance(seconds, (list, tuple)):
+        seconds = [seconds]
+    return any(time is not None and time < MINIMUM_SECONDS
+               for time in seconds)
+
+
+def _is_worse(measure, value, expected_value, tolerance):
+    """:return: whether the value exceeds the tolerance of the baseline"""
+    if measure in ABSOLUTE_MEASURES:
+        return value > expected_value + tolerance
+    return expected_value > 0 and value > expected_value * (1 + tolerance)
+
+
+def compare_results(results, baseline, tolerances=TIME_TOLERANCES):
+    """Compare results to a baseline.
+
+    :param list results: see :func:`results_to_object`
+    :param baseline: the path to the saved baseline or a list of
+      dictionaries as returned by :func:`load_results`
+    :param dict tolerances: the relative amount by which each measure may
+      grow, e.g. ``{"seconds": 1.0}`` allows twice the time, or the
+      absolute amount for the :data:`ABSOLUTE_MEASURES`
+    :return: a list of :class:`Regression`
+    :rtype: list
+
+    For measures with several values, e.g. the seconds of a scaling curve,
+    the values of the largest pattern are compared.
+    Results that are not in the baseline and measures that a result does
+    not have are ignored. The exponents are ignored if the result or the
+    baseline has times below :data:`MINIMUM_SECONDS`.
+    """
+    if isinstance(baseline, str):
+        baseline = load_results(baseline)
+    expected = {(result["kind"], result["stage"]): result
+                for result in baseline}
+    regressions = []
+    for result in results:
+        expected_result = expected.get((result.kind, result.stage))
+        if expected_result is None:
+            continue
+        too_short = _is_too_short(getattr(result, "seconds", None)) or \
+            _is_too_short(expected_result.get("seconds"))
+        for measure, tolerance in tolerances.items():
+            value = _last(getattr(result, measure, None))
+            expected_value = _last(expected_result.get(measure))
+            if value is None or expected_value is None:
+                continue
+            if measure == "exponent" and too_short:
+                continue
+            if _is_worse(measure, value, expected_value, tolerance):
+                regressions.append(Regression(result.kind, result.stage,
+                                              measure, expected_value, value))
+    return regressions
+
+__all__ = ["save_results", "load_results", "load_python_version",
+           "compare_results", "results_to_object", "Regression",
+           "TIME_TOLERANCES", "ABSOLUTE_MEASURES", "MINIMUM_SECONDS",
+           "BASELINE_VERSION"]
@@ -0,0 +1,101 @@
+"""Generate knitting patterns of any size.
+
+The functions return knitting pattern sets as objects which can be loaded
+with :meth:`load_from().object() <knittingpattern.Loader.JSONLoader.object>`.
+Each pattern has :paramref:`~rectangular.rows` rows with
+:paramref:`~rectangular.width` instructions which are connected to the
+next row.
+
+.. code:: python
+
+    pattern_set = knittingpattern.load_from().object(shaped(20, 100))
+"""
+from .. import EMPTY_KNITTING_PATTERN_SET
+from copy import deepcopy
+
+#: The colors of the :func:`multicolor` patterns.
+DEFAULT_COLORS = ("mocha latte", "white", "#ff0000", "navy")
+
+
+def _pattern_set(id_, rows):
+    """:return: a knitting pattern set with one pattern of the rows"""
+    pattern_set = deepcopy(EMPTY_KNITTING_PATTERN_SET)
+    connections = [{"from": {"id": row_id}, "to": {"id": row_id + 1}}
+                   for row_id in range(1, len(rows))]
+    pattern = {"id": id_, "name": id_, "rows": rows,
+               "connections": connections}
+    pattern_set["patterns"].append(pattern)
+    return pattern_set
+
+
+def _rows(width, rows, instruction):
+    """:return: the rows with the results of ``instruction(row, column)``"""
+    return [{"id": row + 1,
+             "instructions": [instruction(row, column)
+                              for column in range(width)]}
+            for row in range(rows)]
+
+
+def rectangular(width, rows):
+    """A rectangle of knit instructions.
+
+    :param int width: the number of instructions in a row
+    :param int rows: the number of rows
+    :return: a knitting pattern set
+    :rtype: dict
+    """
+    rows_ = _rows(width, rows, lambda row, column: {})
+    return _pattern_set("rectangular", rows_)
+
+
+def shaped(width, rows):
+    """A lace pattern with decreases and increases.
+
+    :param int width: the number of meshes in a row, at least ``3``
+    :param int rows: the number of rows
+    :return: a knitting pattern set
+    :rtype: dict
+
+    Every second row contains ``k2tog`` and ``yo`` instructions. Each
+    ``k2tog`` consumes two meshes and is followed by a ``yo`` which adds
+    a mesh. Thus, all rows consume and produce :paramref:`width` meshes.
+    """
+    assert width >= 3, "The width must be at least 3."
+
+    def lace_row(row):
+        if row % 2 == 0:
+            return [{} for _ in range(width)]
+        instructions = []
+        remaining = width
+        while remaining >= 3:
+            instructions.extend(({"type": "k2tog"}, {"type": "yo"}, {}))
+            remaining -= 3
+        instructions.extend({} for _ in range(remaining))
+        return instructions
+    rows_ = [{"id": row + 1, "instructions": lace_row(row)}
+             for row in range(rows)]
+    return _pattern_set("shaped", rows_)
+
+
+def multicolor(width, rows, colors=DEFAULT_COLORS):
+    """A pattern with diagonal stripes of colors.
+
+    :param int width: the number of instructions in a row
+    :param int rows: the number of rows
+    :param colors: the colors of the instructions
+    :return: a knitting pattern set
+    :rtype: dict
+    """
+    colors = list(colors)
+
+    def colored(row, column):
+        return {"color": colors[(row + column) // 3 % len(colors)]}
+    return _pattern_set("multicolor", _rows(width, rows, colored))
+
+
+#: The functions to generate patterns with by their name.
+PATTERN_GENERATORS = {"rectangular": rectangular, "shaped": shaped,
+                      "multicolor": multicolor}
+
+__all__ = ["rectangular", "shaped", "multicolor", "PATTERN_GENERATORS",
+           "DEFAULT_COLORS"]
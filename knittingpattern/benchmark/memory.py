@@ -0,0 +1,242 @@
+"""Measure the memory used by the stages of the pipeline.
+
+For each :data:`stage <MEMORY_STAGES>`, :mod:`tracemalloc` records
+
+- the **peak**: the most memory that was allocated at the same time while
+  the stage ran and
+- the **retained** memory: the memory that is still allocated for the
+  result of the stage, e.g. the loaded pattern.
+
+Additionally, :func:`measure_objects` lists the memory of the objects of a
+loaded pattern by their class. This tells how many bytes an instruction
+costs.
+
+.. code:: python
+
+    for result in measure_memory(rows=50):
+        print(result)
+
+The sizes of the objects do not change between runs. The package contains
+them for the default sizes in :data:`MEMORY_BASELINE` so that changes to
+the classes can be compared to it:
+
+.. code:: bash
+
+    python -m knittingpattern.benchmark --memory \\
+        --compare knittingpattern/benchmark/memory-baseline.json
+
+The sizes depend on the Python version, see :func:`objects_baseline`.
+"""
+from .generate import PATTERN_GENERATORS
+from .timing import DEFAULT_ROWS, DEFAULT_WIDTH, SCALING_FACTORS, \
+    prepare_parse, prepare_svg, _load, _layout
+from .baseline import save_results, load_results, load_python_version
+from collections import namedtuple, OrderedDict
+import gc
+import os
+import platform
+import sys
+import tracemalloc
+
+#: The relative amount each measure of this module may grow before it is a
+#: :class:`regression <knittingpattern.benchmark.baseline.Regression>`.
+#: Memory is measured exactly, so the tolerances are smaller than the
+#: :data:`~knittingpattern.benchmark.baseline.TIME_TOLERANCES`.
+MEMORY_TOLERANCES = {"peak_bytes": 0.2, "retained_bytes": 0.2, "bytes": 0.1}
+
+#: The path of the baseline of the :class:`ObjectsResult` for the default
+#: sizes. The peaks and the retained memory of the stages vary between runs,
+#: so they are not in the baseline.
+MEMORY_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "memory-baseline.json")
+
+#: The memory of a stage for patterns of growing sizes.
+MemoryResult = namedtuple("MemoryResult", ["kind", "stage", "rows",
+                                           "instructions", "peak_bytes",
+                                           "retained_bytes"])
+
+#: The memory of the objects of one class in loaded patterns of growing
+#: sizes. The :attr:`stage` is the name of the class,
+#: see :data:`OBJECT_CLASSES`.
+ObjectsResult = namedtuple("ObjectsResult", ["kind", "stage", "rows",
+                                             "instructions", "objects",
+                                             "bytes"])
+
+
+def prepare_layout(pattern_set):
+    """:return: a function that places the instructions in a grid
+
+    In contrast to :func:`knittingpattern.benchmark.timing.prepare_layout`,
+    the function returns the layout so that its memory is retained.
+    """
+    pattern = _load(pattern_set)
+    return lambda: _layout(pattern)
+
+
+#: The stages of the pipeline which are measured. Each function takes a
+#: knitting pattern set object and returns a function to measure.
+MEMORY_STAGES = OrderedDict([("parse", prepare_parse),
+                             ("layout", prepare_layout),
+                             ("svg", prepare_svg)])
+
+
+def measure_function(function):
+    """Measure the memory of a function.
+
+    :param function: a function without arguments
+    :return: a tuple ``(peak, retained)`` of the bytes allocated by the
+      :paramref:`function`
+    :rtype: tuple
+
+    The function is called once before the measurement so that caches,
+    e.g. of the instruction svgs, do not count.
+    """
+    function()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, retained
+
+
+def _inherited(prototype):
+    """:return: the container of the values a prototype inherits"""
+    return prototype._Prototype__inherited
+
+
+def _meshes(instruction):
+    """:return: the meshes of an instruction"""
+    return instruction.produced_meshes + instruction.consumed_meshes
+
+
+def _mesh_lists(instruction):
+    """:return: the lists of meshes of an instruction"""
+    return [instruction.produced_meshes, instruction.consumed_meshes]
+
+
+#: The classes of objects in a knitting pattern which are measured by
+#: :func:`measure_objects`. The keys are the names. The values are functions
+#: that return the objects for a row.
+OBJECT_CLASSES = OrderedDict([
+    ("Row", lambda row: [row]),
+    ("InstructionInRow", lambda row: row.instructions),
+    ("ProducedMesh", lambda row: [
+        mesh for instruction in row.instructions
+        for mesh in instruction.produced_meshes]),
+    ("ConsumedMesh", lambda row: [
+        mesh for instruction in row.instructions
+        for mesh in instruction.consumed_meshes]),
+    ("Prototype lists", lambda row: [_inherited(row)] + [
+        _inherited(instruction) for instruction in row.instructions]),
+    ("mesh lists", lambda row: [
+        meshes for instruction in row.instructions
+        for meshes in _mesh_lists(instruction)]),
+])
+
+
+def measure_objects(pattern):
+    """Measure the objects of a knitting pattern by their class.
+
+    :param knittingpattern.KnittingPattern.KnittingPattern pattern: the
+      pattern to measure
+    :return: a dictionary that maps the names of the
+      :data:`OBJECT_CLASSES` to tuples ``(objects, bytes)``
+    :rtype: collections.OrderedDict
+
+    The bytes are the sizes of the objects, see :func:`sys.getsizeof`,
+    without the objects they reference.
+    Objects that are shared, like the tuples of
+    :class:`compact prototypes <knittingpattern.Prototype.CompactPrototype>`,
+    are counted once.
+    The meshes of the instructions are created if they do not exist, yet.
+    """
+    result = OrderedDict()
+    for name, get_objects in OBJECT_CLASSES.items():
+        objects = {}
+        for row in pattern.rows:
+            for object_ in get_objects(row):
+                objects[id(object_)] = object_
+        size = sum(map(sys.getsizeof, objects.values()))
+        result[name] = (len(objects), size)
+    return result
+
+
+def measure_memory(rows=DEFAULT_ROWS, width=DEFAULT_WIDTH, kinds=None,
+                   stages=None, factors=SCALING_FACTORS):
+    """Measure the memory of the stages for generated patterns.
+
+    :param int rows: the number of rows of the smallest patterns
+    :param int width: the number of instructions in each row
+    :param kinds: the names of the :data:`generators
+      <knittingpattern.benchmark.generate.PATTERN_GENERATORS>` to use or
+      :obj:`None` for all
+    :param stages: the names of the :data:`MEMORY_STAGES` to measure or
+      :obj:`None` for all
+    :param factors: the patterns have ``rows * factor`` rows
+    :return: a list of :class:`MemoryResult` for the stages followed by
+      :class:`ObjectsResult` for the :data:`OBJECT_CLASSES` for each kind
+    :rtype: list
+    """
+    if kinds is None:
+        kinds = list(PATTERN_GENERATORS)
+    if stages is None:
+        stages = list(MEMORY_STAGES)
+    results = []
+    for kind in kinds:
+        generate = PATTERN_GENERATORS[kind]
+        pattern_sets = [generate(width, rows * factor) for factor in factors]
+        sizes = [rows * factor for factor in factors]
+        instructions = [size * width for size in sizes]
+        for stage in stages:
+            prepare = MEMORY_STAGES[stage]
+            measured = [measure_function(prepare(pattern_set))
+                        for pattern_set in pattern_sets]
+            results.append(MemoryResult(
+                kind, stage, sizes, instructions,
+                [peak for peak, _ in measured],
+                [retained for _, retained in measured]))
+        objects = [measure_objects(_load(pattern_set))
+                   for pattern_set in pattern_sets]
+        for name in OBJECT_CLASSES:
+            results.append(ObjectsResult(
+                kind, name, sizes, instructions,
+                [classes[name][0] for classes in objects],
+                [classes[name][1] for classes in objects]))
+    return results
+
+
+def save_objects_baseline(path=MEMORY_BASELINE):
+    """Save the sizes of the objects for the default sizes as a baseline.
+
+    :param str path: the path of the baseline, default
+      :data:`MEMORY_BASELINE`
+    """
+    save_results(measure_memory(stages=[]), path)
+
+
+def objects_baseline(path=MEMORY_BASELINE):
+    """Load the baseline of the sizes of the objects.
+
+    :param str path: the path of the baseline, default
+      :data:`MEMORY_BASELINE`
+    :return: the saved results as returned by
+      :func:`~knittingpattern.benchmark.baseline.load_results` or
+      :obj:`None` if they were measured with another version of Python
+    :rtype: list
+
+    The sizes of the objects depend on the major and minor version of
+    Python.
+    """
+    saved_version = load_python_version(path).split(".")[:2]
+    if saved_version != list(platform.python_version_tuple()[:2]):
+        return None
+    return load_results(path)
+
+__all__ = ["measure_memory", "measure_function", "measure_objects",
+           "MemoryResult", "ObjectsResult", "MEMORY_STAGES",
+           "OBJECT_CLASSES", "MEMORY_TOLERANCES", "prepare_layout",
+           "MEMORY_BASELINE", "save_objects_baseline", "objects_baseline"]
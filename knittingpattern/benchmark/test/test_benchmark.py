@@ -0,0 +1,17 @@
+#
+# see https://pytest.org/latest/goodpractices.html
+# for why this module exists
+#
+from pytest import fixture, raises
+import os
+import sys
+
+HERE = os.path.dirname(__file__)
+
+sys.path.insert(0, os.path.join(HERE, "../../.."))
+
+#: Small sizes so that the benchmarks run fast in the tests.
+ROWS = 4
+WIDTH = 6
+
+__all__ = ["fixture", "raises", "os", "sys", "HERE", "ROWS", "WIDTH"]
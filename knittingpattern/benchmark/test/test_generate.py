@@ -0,0 +1,48 @@
+"""Test the generated knitting patterns."""
+from test_benchmark import fixture, ROWS, WIDTH
+from knittingpattern import load_from
+from knittingpattern.benchmark.generate import PATTERN_GENERATORS, \
+    rectangular, shaped, multicolor, DEFAULT_COLORS
+
+
+@fixture(params=sorted(PATTERN_GENERATORS))
+def generate(request):
+    return PATTERN_GENERATORS[request.param]
+
+
+def load(pattern_set):
+    return load_from().object(pattern_set).first
+
+
+def test_number_of_rows(generate):
+    assert len(load(generate(WIDTH, ROWS)).rows) == ROWS
+
+
+def test_rows_are_connected(generate):
+    pattern = load(generate(WIDTH, ROWS))
+    for row in pattern.rows.at(0), pattern.rows.at(ROWS - 2):
+        assert row.produced_meshes
+        assert all(mesh.is_connected() for mesh in row.produced_meshes)
+
+
+def test_rectangular_rows_have_the_same_width():
+    pattern = load(rectangular(WIDTH, ROWS))
+    assert [len(row.instructions) for row in pattern.rows] == [WIDTH] * ROWS
+
+
+def test_shaped_rows_keep_the_number_of_meshes():
+    pattern = load(shaped(WIDTH, ROWS))
+    row = pattern.rows.at(1)
+    types = [instruction.type for instruction in row.instructions]
+    assert "k2tog" in types
+    assert "yo" in types
+    for row in pattern.rows:
+        assert len(row.consumed_meshes) == WIDTH
+        assert len(row.produced_meshes) == WIDTH
+
+
+def test_multicolor_uses_all_colors():
+    pattern = load(multicolor(3 * len(DEFAULT_COLORS), 1))
+    colors = {instruction.color for row in pattern.rows
+              for instruction in row.instructions}
+    assert colors == set(DEFAULT_COLORS)
@@ -0,0 +1,96 @@
+"""Test the memory measurements."""
+from test_benchmark import fixture, raises, ROWS, WIDTH
+from pytest import skip
+from knittingpattern import load_from
+from knittingpattern.benchmark.generate import rectangular, \
+    PATTERN_GENERATORS
+from knittingpattern.benchmark.memory import measure_memory, \
+    measure_function, measure_objects, MemoryResult, ObjectsResult, \
+    MEMORY_STAGES, OBJECT_CLASSES, MEMORY_TOLERANCES, MEMORY_BASELINE, \
+    objects_baseline
+from knittingpattern.benchmark.baseline import compare_results, load_results
+from knittingpattern.benchmark.__main__ import main
+
+
+@fixture(scope="module")
+def results():
+    return measure_memory(ROWS, WIDTH, kinds=["rectangular"])
+
+
+@fixture(scope="module")
+def objects():
+    pattern_set = load_from().object(rectangular(WIDTH, ROWS))
+    return measure_objects(pattern_set.first)
+
+
+def test_stages_and_classes_are_measured(results):
+    assert [result.stage for result in results] == \
+        list(MEMORY_STAGES) + list(OBJECT_CLASSES)
+    assert all(isinstance(result, MemoryResult)
+               for result in results[:len(MEMORY_STAGES)])
+    assert all(isinstance(result, ObjectsResult)
+               for result in results[len(MEMORY_STAGES):])
+
+
+def test_memory_grows_with_the_pattern(results):
+    for result in results[:len(MEMORY_STAGES)]:
+        assert result.rows == [ROWS, 2 * ROWS, 4 * ROWS]
+        assert result.retained_bytes[0] < result.retained_bytes[-1]
+        for peak, retained in zip(result.peak_bytes, result.retained_bytes):
+            assert peak >= retained > 0
+
+
+def test_retained_and_freed_memory():
+    peak, retained = measure_function(lambda: bytearray(100000))
+    assert retained >= 100000
+    peak, retained = measure_function(lambda: len(bytearray(100000)))
+    assert peak >= 100000
+    assert retained < 1000
+
+
+def test_objects_are_counted(objects):
+    assert objects["Row"][0] == ROWS
+    assert objects["InstructionInRow"][0] == ROWS * WIDTH
+    assert objects["ProducedMesh"][0] == ROWS * WIDTH
+    assert objects["ConsumedMesh"][0] == ROWS * WIDTH
+    assert objects["mesh lists"][0] == 2 * ROWS * WIDTH
+
+
+def test_objects_have_a_size(objects):
+    for count, size in objects.values():
+        assert size >= count > 0
+
+
+def test_larger_objects_are_regressions(results):
+    baseline = [dict(result._asdict()) for result in results]
+    baseline[-1]["bytes"] = [1] * 3
+    regressions = compare_results(results, baseline, MEMORY_TOLERANCES)
+    assert [(regression.stage, regression.measure)
+            for regression in regressions] == [("mesh lists", "bytes")]
+
+
+def test_command_line(tmpdir, capsys):
+    path = tmpdir.join("memory.json").strpath
+    arguments = ["--memory", "--rows", "2", "--width", "3",
+                 "--kind", "rectangular", "--stage", "parse"]
+    assert main(arguments + ["--save", path]) == 0
+    assert "per instruction" in capsys.readouterr()[0]
+    with raises(SystemExit):
+        main(["--memory", "--stage", "walk"])
+
+
+def test_objects_are_not_larger_than_the_baseline():
+    baseline = objects_baseline()
+    if baseline is None:
+        skip("The baseline was measured with another version of Python.")
+    results = measure_memory(stages=[])
+    assert compare_results(results, MEMORY_BASELINE, MEMORY_TOLERANCES) == []
+    assert [result["objects"] for result in baseline] == \
+        [result.objects for result in results]
+
+
+def test_baseline_covers_all_objects():
+    assert [(result["kind"], result["stage"])
+            for result in load_results(MEMORY_BASELINE)] == \
+        [(kind, name) for kind in PATTERN_GENERATORS
+         for name in OBJECT_CLASSES]
@@ -0,0 +1,94 @@
+"""Test the timing of the stages and the comparison to baselines."""
+from test_benchmark import fixture, raises, ROWS, WIDTH
+from knittingpattern.benchmark.timing import measure_time, STAGES, \
+    scaling_exponent, TimingResult
+from knittingpattern.benchmark.baseline import save_results, load_results, \
+    compare_results, Regression
+from knittingpattern.benchmark.__main__ import main
+import json
+
+
+@fixture(scope="module")
+def results():
+    return measure_time(ROWS, WIDTH, repeat=1)
+
+
+@fixture
+def baseline_path(tmpdir):
+    return tmpdir.join("baseline.json").strpath
+
+
+def test_all_stages_are_timed(results):
+    stages = [result.stage for result in results if result.kind == "shaped"]
+    assert stages == list(STAGES)
+
+
+def test_results_are_scaling_curves(results):
+    for result in results:
+        assert result.rows == [ROWS, 2 * ROWS, 4 * ROWS]
+        assert result.instructions == [WIDTH * rows for rows in result.rows]
+        assert len(result.seconds) == 3
+        assert all(seconds > 0 for seconds in result.seconds)
+
+
+def test_scaling_exponent():
+    assert scaling_exponent([1, 2, 4], [1, 2, 4]) == 1
+    assert abs(scaling_exponent([1, 2, 4], [1, 4, 16]) - 2) < 1e-9
+    assert scaling_exponent([1], [1]) is None
+    assert scaling_exponent([1, 2], [0, 0]) is None
+    assert scaling_exponent([2, 2], [1, 2]) is None
+
+
+def test_scaling_exponent_is_fitted_to_all_points():
+    assert abs(scaling_exponent([1, 2, 4], [1, 1, 4]) - 1) < 1e-9
+
+
+def test_saved_results_compare_equal(results, baseline_path):
+    save_results(results, baseline_path)
+    assert len(load_results(baseline_path)) == len(results)
+    assert compare_results(results, baseline_path) == []
+
+
+def test_slower_results_are_regressions():
+    baseline = [{"kind": "k", "stage": "s", "seconds": [1, 2],
+                 "exponent": 1}]
+    result = TimingResult("k", "s", [1, 2], [1, 2], [2, 5], 1.2)
+    assert compare_results([result], baseline) == \
+        [Regression("k", "s", "seconds", 2, 5)]
+
+
+def test_noisy_exponents_are_no_regressions():
+    baseline = [{"kind": "k", "stage": "s", "seconds": [0.01, 0.02],
+                 "exponent": 0.86}]
+    result = TimingResult("k", "s", [1, 2], [1, 2], [0.01, 0.03], 1.5)
+    assert compare_results([result], baseline) == []
+
+
+def test_quadratic_exponents_are_regressions():
+    baseline = [{"kind": "k", "stage": "s", "seconds": [0.01, 0.02],
+                 "exponent": 1}]
+    result = TimingResult("k", "s", [1, 2], [1, 2], [0.01, 0.04], 2)
+    assert compare_results([result], baseline) == \
+        [Regression("k", "s", "exponent", 1, 2)]
+
+
+def test_exponents_of_short_times_are_not_compared():
+    baseline = [{"kind": "k", "stage": "s", "seconds": [0.0001, 0.0002],
+                 "exponent": 1}]
+    result = TimingResult("k", "s", [1, 2], [1, 2], [0.0001, 0.0004], 2)
+    assert compare_results([result], baseline) == []
+
+
+def test_other_versions_are_rejected(baseline_path):
+    with open(baseline_path, "w") as file:
+        json.dump({"version": -1, "results": []}, file)
+    with raises(ValueError):
+        load_results(baseline_path)
+
+
+def test_command_line(baseline_path, capsys):
+    arguments = ["--rows", "2", "--width", "3", "--repeat", "1",
+                 "--kind", "rectangular", "--stage", "parse"]
+    assert main(arguments + ["--save", baseline_path]) == 0
+    assert "rectangular" in capsys.readouterr()[0]
+    assert main(arguments + ["--compare", baseline_path]) in (0, 1)
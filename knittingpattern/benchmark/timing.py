@@ -0,0 +1,194 @@
+"""Measure the time of the stages of the pipeline.
+
+Each :data:`stage <STAGES>` is timed with patterns of ``n``, ``2n`` and
+``4n`` rows. If the time of a stage grows with the number of rows, the
+:attr:`~TimingResult.exponent` is about ``1``. An exponent of about ``2``
+means that the stage takes quadratic time. The exponent is fitted to all
+points of the curve, so that one noisy time changes it less.
+
+.. code:: python
+
+    results = measure_time(rows=50)
+    for result in results:
+        print(result.kind, result.stage, result.seconds, result.exponent)
+"""
+from .generate import PATTERN_GENERATORS
+from collections import namedtuple, OrderedDict
+from math import log
+from time import perf_counter
+
+#: The number of instructions in a row of the generated patterns.
+DEFAULT_WIDTH = 20
+
+#: The number of rows of the smallest generated patterns.
+DEFAULT_ROWS = 50
+
+#: The factors of :data:`DEFAULT_ROWS` for the patterns of a scaling curve.
+SCALING_FACTORS = (1, 2, 4)
+
+#: The number of times each stage is run. The median time is reported.
+DEFAULT_REPEAT = 5
+
+#: The zoom of the rendered svgs.
+SVG_ZOOM = 10
+
+#: The time of a stage for patterns of growing sizes.
+TimingResult = namedtuple("TimingResult", ["kind", "stage", "rows",
+                                           "instructions", "seconds",
+                                           "exponent"])
+
+
+def _load(pattern_set):
+    """:return: the first pattern of a knitting pattern set object"""
+    from .. import load_from
+    return load_from().object(pattern_set).first
+
+
+def _layout(pattern):
+    """:return: the layout of a pattern with all instructions placed"""
+    from ..convert.Layout import GridLayout
+    layout = GridLayout(pattern)
+    layout.bounding_box
+    return layout
+
+
+def prepare_parse(pattern_set):
+    """:return: a function that parses the knitting pattern set"""
+    from .. import load_from
+    return lambda: load_from().object(pattern_set)
+
+
+def prepare_walk(pattern_set):
+    """:return: a function that sorts the rows in knitting order"""
+    from ..walk import walk
+    pattern = _load(pattern_set)
+    return lambda: walk(pattern)
+
+
+def prepare_layout(pattern_set):
+    """:return: a function that places the instructions in a grid"""
+    pattern = _load(pattern_set)
+    return lambda: list(_layout(pattern).walk_instructions())
+
+
+def prepare_svg(pattern_set):
+    """:return: a function that builds the svg of a laid out pattern"""
+    from ..convert.InstructionSVGCache import default_instruction_svg_cache
+    from ..convert.KnittingPatternToSVG import KnittingPatternToSVG
+    from ..convert.SVGBuilder import SVGBuilder
+    pattern = _load(pattern_set)
+    layout = _layout(pattern)
+    instruction_to_svg = default_instruction_svg_cache()
+    instruction_to_svg.precompute(instruction for row in pattern.rows
+                                  for instruction in row.instructions)
+    return lambda: KnittingPatternToSVG(
+        pattern, layout, instruction_to_svg, SVGBuilder(),
+        SVG_ZOOM).build_SVG_dict()
+
+
+def prepare_ayabpng(pattern_set):
+    """:return: a function that draws a laid out pattern for AYAB"""
+    from ..convert.AYABPNGBuilder import AYABPNGBuilder
+    layout = _layout(_load(pattern_set))
+
+    def ayabpng():
+        builder = AYABPNGBuilder(*layout.bounding_box)
+        builder.set_colors_in_grid(layout.walk_instructions())
+        return builder
+    return ayabpng
+
+
+#: The stages of the pipeline. Each function takes a knitting pattern set
+#: object and returns a function to time.
+STAGES = OrderedDict([("parse", prepare_parse), ("walk", prepare_walk),
+                      ("layout", prepare_layout), ("svg", prepare_svg),
+                      ("ayabpng", prepare_ayabpng)])
+
+
+def time_function(function, repeat=DEFAULT_REPEAT):
+    """The time a function takes.
+
+    :param function: a function without arguments
+    :param int repeat: how often to call the :paramref:`function`
+    :return: the median time of the calls in seconds
+    :rtype: float
+
+    The median is less influenced by single slow or fast calls than the
+    shortest time, so it changes less between runs.
+    """
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    times.sort()
+    middle = len(times) // 2
+    if len(times) % 2:
+        return times[middle]
+    return (times[middle - 1] + times[middle]) / 2
+
+
+def scaling_exponent(sizes, seconds):
+    """Estimate how the time grows with the size.
+
+    :param list sizes: the sizes of the inputs
+    :param list seconds: the times for the :paramref:`sizes`
+    :return: ``k`` so that the time grows like ``size ** k`` or :obj:`None`
+      if this can not be computed
+    :rtype: float
+
+    ``k`` is the slope of the least squares line through the points
+    ``(log(size), log(seconds))``.
+    """
+    if len(set(sizes)) < 2 or min(seconds) <= 0:
+        return None
+    xs = [log(size) for size in sizes]
+    ys = [log(time) for time in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def measure_time(rows=DEFAULT_ROWS, width=DEFAULT_WIDTH, kinds=None,
+                 stages=None, repeat=DEFAULT_REPEAT,
+                 factors=SCALING_FACTORS):
+    """Time the stages of the pipeline for generated patterns.
+
+    :param int rows: the number of rows of the smallest patterns
+    :param int width: the number of instructions in each row
+    :param kinds: the names of the :data:`generators
+      <knittingpattern.benchmark.generate.PATTERN_GENERATORS>` to use or
+      :obj:`None` for all
+    :param stages: the names of the :data:`STAGES` to time or :obj:`None`
+      for all
+    :param int repeat: see :func:`time_function`
+    :param factors: the patterns have ``rows * factor`` rows
+    :return: a list of :class:`TimingResult`
+    :rtype: list
+    """
+    if kinds is None:
+        kinds = list(PATTERN_GENERATORS)
+    if stages is None:
+        stages = list(STAGES)
+    results = []
+    for kind in kinds:
+        generate = PATTERN_GENERATORS[kind]
+        pattern_sets = [generate(width, rows * factor) for factor in factors]
+        sizes = [rows * factor for factor in factors]
+        instructions = [size * width for size in sizes]
+        for stage in stages:
+            prepare = STAGES[stage]
+            seconds = [time_function(prepare(pattern_set), repeat)
+                       for pattern_set in pattern_sets]
+            exponent = scaling_exponent(sizes, seconds)
+            results.append(TimingResult(kind, stage, sizes, instructions,
+                                        seconds, exponent))
+    return results
+
+__all__ = ["measure_time", "time_function", "scaling_exponent",
+           "TimingResult", "STAGES", "prepare_parse", "prepare_walk",
+           "prepare_layout", "prepare_svg", "prepare_ayabpng",
+           "DEFAULT_WIDTH", "DEFAULT_ROWS", "SCALING_FACTORS",
+           "DEFAULT_REPEAT", "SVG_ZOOM"]
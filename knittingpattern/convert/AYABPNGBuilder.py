@@ -4,9 +4,8 @@ These png files are used to be fed into the ayab-desktop software.
 They only contain which meshes will be knit with a contrast color.
 They just contain colors.
 """
-import webcolors
 import PIL.Image
-from .color import convert_color_to_rrggbb
+from .color import convert_color_to_rrggbb, convert_rrggbb_to_rgb
 
 
 class AYABPNGBuilder(object):
@@ -65,7 +64,7 @@ class AYABPNGBuilder(object):
 
     def _convert_rrggbb_to_image_color(self, rrggbb):
         """:return: the color that is used by the image"""
-        return webcolors.hex_to_rgb(rrggbb)
+        return convert_rrggbb_to_rgb(rrggbb)
 
     def _convert_to_image_color(self, color):
         """:return: a color that can be used by the image"""
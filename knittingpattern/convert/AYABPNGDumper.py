@@ -10,13 +10,16 @@ from .AYABPNGBuilder import AYABPNGBuilder
 class AYABPNGDumper(ContentDumper):
     """This class converts knitting patterns into PNG files."""
 
-    def __init__(self, function_that_returns_a_knitting_pattern_set):
+    def __init__(self, function_that_returns_a_knitting_pattern_set,
+                 pattern_id=None):
         """Initialize the Dumper with a
         :paramref:`function_that_returns_a_knitting_pattern_set`.
 
         :param function_that_returns_a_knitting_pattern_set: a function that
           takes no arguments but returns a
           :class:`knittinpattern.KnittingPatternSet.KnittingPatternSet`
+        :param pattern_id: the id of the pattern in the set to dump or
+          :obj:`None` to dump the first pattern
 
         When a dump is requested, the
         :paramref:`function_that_returns_a_knitting_pattern_set`
@@ -26,19 +29,42 @@ class AYABPNGDumper(ContentDumper):
         super().__init__(self._dump_knitting_pattern,
                          text_is_expected=False, encoding=None)
         self.__on_dump = function_that_returns_a_knitting_pattern_set
+        self.__pattern_id = pattern_id
 
     def _dump_knitting_pattern(self, file):
         """dump a knitting pattern to a file."""
         knitting_pattern_set = self.__on_dump()
-        knitting_pattern = knitting_pattern_set.patterns.at(0)
-        layout = GridLayout(knitting_pattern)
-        builder = AYABPNGBuilder(*layout.bounding_box)
-        builder.set_colors_in_grid(layout.walk_instructions())
-        builder.write_to_file(file)
+        if self.__pattern_id is None:
+            knitting_pattern = knitting_pattern_set.patterns.at(0)
+        else:
+            knitting_pattern = knitting_pattern_set.patterns[self.__pattern_id]
+        render_ayabpng(knitting_pattern).write_to_file(file)
 
     def temporary_path(self, extension=".png"):
         return super().temporary_path(extension=extension)
     temporary_path.__doc__ = ContentDumper.temporary_path.__doc__
 
 
-__all__ = ["AYABPNGDumper"]
+def _new_ayabpng_builder(knitting_pattern):
+    """:return: a new builder with the colors of a knitting pattern"""
+    layout = knitting_pattern.cached(GridLayout)
+    builder = AYABPNGBuilder(*layout.bounding_box)
+    builder.set_colors_in_grid(layout.walk_instructions())
+    return builder
+
+
+def render_ayabpng(knitting_pattern):
+    """Render a knitting pattern for the AYAB software.
+
+    :param knittingpattern.KnittingPattern.KnittingPattern knitting_pattern:
+      the pattern to render
+    :return: a builder that contains the image of the pattern
+    :rtype: knittingpattern.convert.AYABPNGBuilder.AYABPNGBuilder
+
+    The image is rendered once per :attr:`generation
+    <knittingpattern.KnittingPattern.KnittingPattern.generation>` of the
+    pattern. The builder is shared and should not be modified.
+    """
+    return knitting_pattern.cached(_new_ayabpng_builder)
+
+__all__ = ["AYABPNGDumper", "render_ayabpng"]
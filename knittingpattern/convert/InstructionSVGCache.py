@@ -1,6 +1,8 @@
 """This module provides functionality to cache instruction SVGs."""
 from .InstructionToSVG import default_instructions_to_svg
 from ..Dumper import SVGDumper
+from ..counters import hit, miss, DEFAULT_INSTRUCTION_SVG_CACHE, \
+    INSTRUCTION_SVG_CACHE
 from copy import deepcopy
 from collections import namedtuple
 
@@ -42,10 +44,23 @@ class InstructionSVGCache(object):
         :rtype: tuple
         """
         if isinstance(instruction_or_id, tuple):
-            return _InstructionId(instruction_or_id)
+            return _InstructionId(*instruction_or_id)
         return _InstructionId(instruction_or_id.type,
                               instruction_or_id.hex_color)
 
+    def precompute(self, instructions):
+        """Create the SVGs of instructions in the cache.
+
+        :param instructions: an iterable over
+          :class:`instructions <knittingpattern.Instruction.Instruction>`
+
+        The SVG of each kind of instruction is only created once.
+        This can be used before the cache is shared by several threads.
+        """
+        instruction_ids = set(map(self.get_instruction_id, instructions))
+        for instruction_id in instruction_ids:
+            self.instruction_to_svg_dict(instruction_id, copy_result=False)
+
     def _new_svg_dumper(self, on_dump):
         """Create a new SVGDumper with the function ``on_dump``.
 
@@ -84,8 +99,10 @@ class InstructionSVGCache(object):
         """
         instruction_id = self.get_instruction_id(instruction_or_id)
         if instruction_id in self._cache:
+            hit(INSTRUCTION_SVG_CACHE)
             result = self._cache[instruction_id]
         else:
+            miss(INSTRUCTION_SVG_CACHE)
             result = self._instruction_to_svg_dict(instruction_id)
             self._cache[instruction_id] = result
         if copy_result:
@@ -100,7 +117,10 @@ def default_instruction_svg_cache():
     """
     global _default_instruction_svg_cache
     if _default_instruction_svg_cache is None:
+        miss(DEFAULT_INSTRUCTION_SVG_CACHE)
         _default_instruction_svg_cache = InstructionSVGCache()
+    else:
+        hit(DEFAULT_INSTRUCTION_SVG_CACHE)
     return _default_instruction_svg_cache
 _default_instruction_svg_cache = None
 default_svg_cache = default_instruction_svg_cache
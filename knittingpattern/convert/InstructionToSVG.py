@@ -3,9 +3,11 @@
 Use :func:`default_instructions_to_svg` to load the svg files provided by
 this package.
 """
+from copy import deepcopy
 import os
 import xmltodict
 from knittingpattern.Loader import PathLoader
+from knittingpattern.resources import read_resource, INSTRUCTION_SVGS
 
 #:  The string to replace with the pattern name in the SVG file.
 REPLACE_IN_DEFAULT_SVG = "{instruction.type}"
@@ -23,6 +25,7 @@ class InstructionToSVG(object):
     def __init__(self):
         """create a InstructionToSVG object without arguments."""
         self._instruction_type_to_file_content = {}
+        self._instruction_type_to_structure = {}
 
     @property
     def load(self):
@@ -50,7 +53,26 @@ class InstructionToSVG(object):
         name = os.path.splitext(file_name)[0]
         with open(path) as file:
             string = file.read()
-            self._instruction_type_to_file_content[name] = string
+            self.add_svg(name, string)
+
+    def add_svg(self, instruction_type, svg):
+        """Add an svg for instructions of a type.
+
+        :param str instruction_type: the type of the instructions
+        :param str svg: the content of an svg file, see
+          :meth:`instruction_to_svg`
+        """
+        self._instruction_type_to_file_content[instruction_type] = svg
+
+    def add_svg_structure(self, instruction_type, structure):
+        """Add an svg for instructions of a type that is already parsed.
+
+        :param str instruction_type: the type of the instructions
+        :param dict structure: the svg parsed by :func:`xmltodict.parse`
+
+        The :paramref:`structure` is copied before the colors are changed.
+        """
+        self._instruction_type_to_structure[instruction_type] = structure
 
     def instruction_to_svg_dict(self, instruction):
         """
@@ -58,6 +80,10 @@ class InstructionToSVG(object):
           :meth:`instruction_to_svg`.
         """
         instruction_type = instruction.type
+        if instruction_type in self._instruction_type_to_structure:
+            structure = self._instruction_type_to_structure[instruction_type]
+            return self._set_fills_in_structure(deepcopy(structure),
+                                                instruction.hex_color)
         if instruction_type in self._instruction_type_to_file_content:
             svg = self._instruction_type_to_file_content[instruction_type]
             return self._set_fills_in_color_layer(svg, instruction.hex_color)
@@ -94,6 +120,14 @@ class InstructionToSVG(object):
         :param color: a color fill the objects in the layer with
         """
         structure = xmltodict.parse(svg_string)
+        return self._set_fills_in_structure(structure, color)
+
+    @staticmethod
+    def _set_fills_in_structure(structure, color):
+        """Same as :meth:`_set_fills_in_color_layer` for a parsed svg.
+
+        The :paramref:`structure` is changed and returned.
+        """
         if color is None:
             return structure
         layers = structure["svg"]["g"]
@@ -134,7 +168,8 @@ class InstructionToSVG(object):
 
         """
         instruction_type = instruction.type
-        return instruction_type in self._instruction_type_to_file_content
+        return instruction_type in self._instruction_type_to_file_content or \
+            instruction_type in self._instruction_type_to_structure
 
     def default_instruction_to_svg(self, instruction):
         """As :meth:`instruction_to_svg` but it only takes the ``default.svg``
@@ -161,6 +196,10 @@ class InstructionToSVG(object):
         instruction_type = instruction.type
         default_type = "default"
         rep_str = "{instruction.type}"
+        if default_type in self._instruction_type_to_structure:
+            structure = self._instruction_type_to_structure[default_type]
+            return self._set_fills_in_structure(deepcopy(structure),
+                                                instruction.hex_color)
         if default_type not in self._instruction_type_to_file_content:
             return {"svg": ""}
         default_svg = self._instruction_type_to_file_content[default_type]
@@ -180,9 +219,20 @@ def default_instructions_to_svg():
     :return: the default svg files for the instructions in this package
     :rtype: knittingpattern.InstructionToSVG.InstructionToSVG
 
+    The svg files are read from the :mod:`resource bundle
+    <knittingpattern.resources>` if it was built and loaded from the
+    :data:`DEFAULT_SVG_FOLDER` otherwise.
     """
     instruction_to_svg = InstructionToSVG()
-    instruction_to_svg.load.relative_folder(__name__, DEFAULT_SVG_FOLDER)
+    svgs = read_resource(INSTRUCTION_SVGS)
+    if svgs is None:
+        instruction_to_svg.load.relative_folder(__name__, DEFAULT_SVG_FOLDER)
+    else:
+        for instruction_type, svg in svgs.items():
+            if isinstance(svg, str):
+                instruction_to_svg.add_svg(instruction_type, svg)
+            else:
+                instruction_to_svg.add_svg_structure(instruction_type, svg)
     return instruction_to_svg
 
 __all__ = ["InstructionToSVG", "default_instructions_to_svg",
@@ -1,11 +1,16 @@
 """This module provides functionality to convert knitting patterns to SVG."""
 
 from collections import OrderedDict
+from ..instrumentation import spanned, BUILD_SVG_DICT
 
 #: Inside the svg, the instructions are put into definitions.
 #: The svg tag is renamed to the tag given in :data:`DEFINITION_HOLDER`.
 DEFINITION_HOLDER = "g"
 
+#: The color of the rectangles of instructions without a color, see
+#: :paramref:`KnittingPatternToSVG.level_of_detail_zoom`.
+DEFAULT_RECTANGLE_COLOR = "#ffffff"
+
 
 class KnittingPatternToSVG(object):
     """Converts a KnittingPattern to SVG.
@@ -15,7 +20,7 @@ class KnittingPatternToSVG(object):
     """
 
     def __init__(self, knittingpattern, layout, instruction_to_svg, builder,
-                 zoom):
+                 zoom, level_of_detail_zoom=None, merge_runs=False):
         """
         :param knittingpattern.KnittingPattern.KnittingPattern knittingpattern:
           a knitting pattern
@@ -27,15 +32,31 @@ class KnittingPatternToSVG(object):
           both with instructions already loaded.
         :param knittingpattern.convert.SVGBuilder.SVGBuilder builder:
         :param float zoom: the height and width of a knit instruction
+        :param float level_of_detail_zoom: if the :paramref:`zoom` is
+          smaller than this, the instructions are not drawn in detail.
+          Instead, each run of instructions with the same color in a row is
+          drawn as one rectangle. This is much smaller for overviews.
+          If this is :obj:`None`, the instructions are always drawn in detail.
+        :param bool merge_runs: whether to merge runs of instructions.
+          If this is :obj:`True`, adjacent instructions in a row with the
+          same type, color, size and :attr:`render_z
+          <knittingpattern.Instruction.Instruction.render_z>` are drawn as
+          one rectangle filled with an SVG ``<pattern>`` that repeats the
+          symbol of the instruction.
+          This reduces the number of elements for large patterns.
         """
         self._knittingpattern = knittingpattern
         self._layout = layout
         self._instruction_to_svg = instruction_to_svg
         self._builder = builder
         self._zoom = zoom
+        self._level_of_detail_zoom = level_of_detail_zoom
+        self._merge_runs = merge_runs
+        self._patterns = OrderedDict()
         self._instruction_type_color_to_symbol = OrderedDict()
         self._symbol_id_to_scale = {}
 
+    @spanned(BUILD_SVG_DICT)
     def build_SVG_dict(self):
         """Go through the layout and build the SVG.
 
@@ -50,27 +71,152 @@ class KnittingPatternToSVG(object):
         builder.bounding_box = bbox
         flip_x = bbox[2] + bbox[0] * 2
         flip_y = bbox[3] + bbox[1] * 2
-        instructions = list(layout.walk_instructions(
-            lambda i: (flip_x - (i.x + i.width) * zoom,
-                       flip_y - (i.y + i.height) * zoom,
-                       i.instruction)))
-        instructions.sort(key=lambda x_y_i: x_y_i[2].render_z)
-        for x, y, instruction in instructions:
-            render_z = instruction.render_z
-            z_id = ("" if not render_z else "-{}".format(render_z))
-            layer_id = "row-{}{}".format(instruction.row.id, z_id)
-            def_id = self._register_instruction_in_defs(instruction)
-            scale = self._symbol_id_to_scale[def_id]
-            group = {
-                "@class": "instruction",
-                "@id": "instruction-{}".format(instruction.id),
-                "@transform": "translate({},{}),scale({})".format(
-                    x, y, scale)
-            }
-            builder.place_svg_use(def_id, layer_id, group)
+        if self._level_of_detail_zoom is not None and \
+                zoom < self._level_of_detail_zoom:
+            self._place_rectangles(flip_x, flip_y)
+            return builder.get_svg_dict()
+        if self._merge_runs:
+            runs = [run for row in layout.walk_rows()
+                    for run in self._instruction_runs(row)]
+        else:
+            runs = [[instruction]
+                    for instruction in layout.walk_instructions()]
+        runs.sort(key=lambda run: run[0].instruction.render_z)
+        for run in runs:
+            first = run[0]
+            last = run[-1]
+            x = flip_x - (last.x + last.width) * zoom
+            y = flip_y - (first.y + first.height) * zoom
+            if len(run) == 1:
+                self._place_instruction(x, y, first)
+            else:
+                self._place_run(x, y, run)
         builder.insert_defs(self._instruction_type_color_to_symbol.values())
+        builder.insert_defs(self._patterns.values())
         return builder.get_svg_dict()
 
+    @staticmethod
+    def _layer_id(instruction):
+        """:return: the id of the layer of an instruction"""
+        render_z = instruction.render_z
+        z_id = ("" if not render_z else "-{}".format(render_z))
+        return "row-{}{}".format(instruction.row.id, z_id)
+
+    def _place_instruction(self, x, y, instruction_in_grid):
+        """Place the symbol of an instruction at a position."""
+        instruction = instruction_in_grid.instruction
+        def_id = self._register_instruction_in_defs(instruction)
+        scale = self._symbol_id_to_scale[def_id]
+        group = {
+            "@class": "instruction",
+            "@id": "instruction-{}".format(instruction.id),
+            "@transform": "translate({},{}),scale({})".format(
+                x, y, scale)
+        }
+        self._builder.place_svg_use(def_id, self._layer_id(instruction),
+                                    group)
+
+    def _place_run(self, x, y, run):
+        """Place a rectangle filled with the symbol of the instructions.
+
+        .. seealso:: :paramref:`merge_runs`
+        """
+        zoom = self._zoom
+        first = run[0]
+        instruction = first.instruction
+        def_id = self._register_instruction_in_defs(instruction)
+        pattern_id = self._register_pattern_in_defs(def_id, first.width,
+                                                    first.height)
+        group = {
+            "@class": "instructions",
+            "@transform": "translate({},{})".format(x, y)
+        }
+        self._builder.place_rect(
+            0, 0, first.width * len(run) * zoom, first.height * zoom,
+            "url(#{})".format(pattern_id), self._layer_id(instruction), group)
+
+    def _register_pattern_in_defs(self, def_id, width, height):
+        """Create a pattern that repeats the symbol with the id
+        :paramref:`def_id`.
+
+        :return: the id of the pattern
+        :rtype: str
+        """
+        key = (def_id, width, height)
+        if key not in self._patterns:
+            pattern_id = "run-pattern-{}".format(len(self._patterns))
+            self._patterns[key] = {"pattern": {
+                "@id": pattern_id,
+                "@patternUnits": "userSpaceOnUse",
+                "@width": width * self._zoom,
+                "@height": height * self._zoom,
+                "use": {
+                    "@xlink:href": "#{}".format(def_id),
+                    "@transform": "scale({})".format(
+                        self._symbol_id_to_scale[def_id])
+                }
+            }}
+        return self._patterns[key]["pattern"]["@id"]
+
+    @staticmethod
+    def _instruction_runs(row_in_grid):
+        """:return: a list of lists of adjacent :class:`instructions in grid
+          <knittingpattern.convert.Layout.InstructionInGrid>` in a row that
+          look the same"""
+        runs = []
+        last_key = None
+        for instruction_in_grid in row_in_grid.instructions:
+            instruction = instruction_in_grid.instruction
+            key = (instruction.type, instruction.hex_color,
+                   instruction.render_z, instruction_in_grid.width,
+                   instruction_in_grid.height, instruction_in_grid.y)
+            if runs and key == last_key and instruction_in_grid.width and \
+                    runs[-1][-1].x + instruction_in_grid.width == \
+                    instruction_in_grid.x:
+                runs[-1].append(instruction_in_grid)
+            else:
+                runs.append([instruction_in_grid])
+            last_key = key
+        return runs
+
+    def _place_rectangles(self, flip_x, flip_y):
+        """Place a rectangle for each run of instructions of a color.
+
+        .. seealso:: :paramref:`level_of_detail_zoom`
+        """
+        zoom = self._zoom
+        builder = self._builder
+        for row in self._layout.walk_rows():
+            layer_id = "row-{}".format(row.id)
+            for start, stop, y, height, color in self._color_runs(row):
+                builder.place_rect(
+                    flip_x - stop * zoom, flip_y - (y + height) * zoom,
+                    (stop - start) * zoom, height * zoom, color, layer_id)
+
+    @staticmethod
+    def _color_runs(row_in_grid):
+        """:return: a list of ``(start_x, stop_x, y, height, color)`` for the
+          adjacent instructions with the same color in a row"""
+        runs = []
+        for instruction in row_in_grid.instructions:
+            if not instruction.width:
+                continue
+            color = instruction.instruction.hex_color or \
+                DEFAULT_RECTANGLE_COLOR
+            start = instruction.x
+            stop = start + instruction.width
+            y = instruction.y
+            height = instruction.height
+            if runs:
+                last_start, last_stop, last_y, last_height, last_color = \
+                    runs[-1]
+                if last_stop == start and last_y == y and \
+                        last_height == height and last_color == color:
+                    runs[-1] = (last_start, stop, y, height, color)
+                    continue
+            runs.append((start, stop, y, height, color))
+        return runs
+
     def _register_instruction_in_defs(self, instruction):
         """Create a definition for the instruction.
 
@@ -130,4 +276,5 @@ class KnittingPatternToSVG(object):
         scale = self._zoom / (bbox[3] - bbox[1])
         self._symbol_id_to_scale[instruction_id] = scale
 
-__all__ = ["KnittingPatternToSVG", "DEFINITION_HOLDER"]
+__all__ = ["KnittingPatternToSVG", "DEFINITION_HOLDER",
+           "DEFAULT_RECTANGLE_COLOR"]
@@ -3,6 +3,7 @@
 """
 from itertools import chain
 from collections import namedtuple
+from ..instrumentation import span, LAYOUT_WALK
 
 
 INSTRUCTION_HEIGHT = 1  #: the default height of an instruction in the grid
@@ -216,29 +217,25 @@ class _RecursiveWalk(object):
         passed = [row] + passed
         # print("{}{} at\t{} {}".format("  " * len(passed), row, position,
         #                               passed))
-        for i, produced_mesh in enumerate(row.produced_meshes):
-            self._expand_produced_mesh(produced_mesh, i, position, passed)
-        for i, consumed_mesh in enumerate(row.consumed_meshes):
-            self._expand_consumed_mesh(consumed_mesh, i, position, passed)
+        for connection in row.produced_mesh_connections():
+            self._expand_produced_mesh(connection, position, passed)
+        for connection in row.consumed_mesh_connections():
+            self._expand_consumed_mesh(connection, position, passed)
 
-    def _expand_consumed_mesh(self, mesh, mesh_index, row_position, passed):
+    def _expand_consumed_mesh(self, connection, row_position, passed):
         """expand the consumed meshes"""
-        if not mesh.is_produced():
-            return
-        row = mesh.producing_row
+        mesh_index, row, index_in_producing_row = connection
         position = Point(
-            row_position.x + mesh.index_in_producing_row - mesh_index,
+            row_position.x + index_in_producing_row - mesh_index,
             row_position.y - INSTRUCTION_HEIGHT
         )
         self._expand(row, position, passed)
 
-    def _expand_produced_mesh(self, mesh, mesh_index, row_position, passed):
+    def _expand_produced_mesh(self, connection, row_position, passed):
         """expand the produced meshes"""
-        if not mesh.is_consumed():
-            return
-        row = mesh.consuming_row
+        mesh_index, row, index_in_consuming_row = connection
         position = Point(
-            row_position.x - mesh.index_in_consuming_row + mesh_index,
+            row_position.x - index_in_consuming_row + mesh_index,
             row_position.y + INSTRUCTION_HEIGHT
         )
         self._expand(row, position, passed)
@@ -316,7 +313,8 @@ class GridLayout(object):
         """
         self._pattern = pattern
         self._rows = list(pattern.rows)
-        self._walk = _RecursiveWalk(self._rows[0].instructions[0])
+        with span(LAYOUT_WALK):
+            self._walk = _RecursiveWalk(self._rows[0].instructions[0])
         self._rows.sort(key=lambda row: self._walk.row_in_grid(row).yx)
 
     def walk_instructions(self, mapping=identity):
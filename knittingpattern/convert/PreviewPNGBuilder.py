@@ -0,0 +1,173 @@
+"""Render previews of knitting patterns as PNG images.
+
+The :class:`PreviewPNGBuilder` draws the instructions of a
+:class:`~knittingpattern.convert.Layout.GridLayout` directly with
+`Pillow <https://python-pillow.org/>`__ instead of rendering an SVG.
+Each instruction is drawn as a stamp: a box in the color of the
+instruction with the first letter of its type.
+The stamps are created once for each type, color, size and zoom and kept in a
+:class:`PreviewStampCache`.
+
+The instructions are placed like in the SVG created by
+:class:`~knittingpattern.convert.KnittingPatternToSVG.KnittingPatternToSVG`:
+the first row is at the bottom.
+"""
+import PIL.Image
+import PIL.ImageDraw
+from .color import convert_color_to_rrggbb, convert_rrggbb_to_rgb
+
+#: The color of instructions without a color.
+DEFAULT_INSTRUCTION_COLOR = "white"
+
+#: The color of the border of the instructions.
+BORDER_COLOR = (128, 128, 128)
+
+#: The minimum zoom at which the type of an instruction is drawn.
+MINIMUM_ZOOM_FOR_TYPES = 8
+
+#: The type of instructions that are drawn without their type.
+KNIT_TYPE = "knit"
+
+
+class PreviewStampCache(object):
+    """A cache for the images of instructions."""
+
+    def __init__(self):
+        """Create a new empty cache."""
+        self._stamps = {}
+
+    def stamp(self, type_, color, width, height, zoom):
+        """The image of an instruction.
+
+        :param str type_: the type of the instruction
+        :param color: the color of the instruction or :obj:`None`
+        :param int width: the width of the instruction in the grid
+        :param int height: the height of the instruction in the grid
+        :param int zoom: the size of a mesh in pixels
+        :return: an image of the size ``(width * zoom, height * zoom)``
+        :rtype: PIL.Image.Image
+
+        The image is created once and shared.
+        """
+        key = (type_, color, width, height, zoom)
+        stamp = self._stamps.get(key)
+        if stamp is None:
+            stamp = self._new_stamp(type_, color, width, height, zoom)
+            self._stamps[key] = stamp
+        return stamp
+
+    @staticmethod
+    def _new_stamp(type_, color, width, height, zoom):
+        """:return: a new image for an instruction, see :meth:`stamp`"""
+        if color is None:
+            color = DEFAULT_INSTRUCTION_COLOR
+        rgb = convert_rrggbb_to_rgb(convert_color_to_rrggbb(color))
+        size = (max(width * zoom, 1), max(height * zoom, 1))
+        stamp = PIL.Image.new("RGB", size, rgb)
+        draw = PIL.ImageDraw.Draw(stamp)
+        if zoom >= 3:
+            draw.rectangle((0, 0, size[0] - 1, size[1] - 1),
+                           outline=BORDER_COLOR)
+        if type_ != KNIT_TYPE and type_ and zoom >= MINIMUM_ZOOM_FOR_TYPES:
+            red, green, blue = rgb
+            is_dark = red * 299 + green * 587 + blue * 114 < 128000
+            text_color = (255, 255, 255) if is_dark else (0, 0, 0)
+            draw.text((size[0] // 2 - 3, size[1] // 2 - 6), type_[0],
+                      fill=text_color)
+        return stamp
+
+    def __len__(self):
+        """:return: the number of stamps in the cache"""
+        return len(self._stamps)
+
+
+class PreviewPNGBuilder(object):
+    """Draw the instructions of a layout into an image."""
+
+    def __init__(self, min_x, min_y, max_x, max_y, zoom, stamps=None,
+                 background_color="white"):
+        """Create an empty image for the bounding box of a layout.
+
+        :param int min_x: the lower bound of the x coordinates
+        :param int min_y: the lower bound of the y coordinates
+        :param int max_x: the upper bound of the x coordinates
+        :param int max_y: the upper bound of the y coordinates
+        :param int zoom: the size of a mesh in pixels
+        :param PreviewStampCache stamps: the stamps to draw or :obj:`None`
+          to use the :func:`default_preview_stamp_cache`
+        :param background_color: the color of the image where there are no
+          instructions
+        """
+        if stamps is None:
+            stamps = default_preview_stamp_cache()
+        self._min_x = min_x
+        self._min_y = min_y
+        self._max_x = max_x
+        self._max_y = max_y
+        self._zoom = zoom
+        self._stamps = stamps
+        size = (max((max_x - min_x) * zoom, 1), max((max_y - min_y) * zoom, 1))
+        background = convert_rrggbb_to_rgb(
+            convert_color_to_rrggbb(background_color))
+        self._image = PIL.Image.new("RGB", size, background)
+
+    def add_instructions(self, instructions_in_grid):
+        """Draw instructions into the image.
+
+        :param instructions_in_grid: an iterable over
+          :class:`instructions in grid
+          <knittingpattern.convert.Layout.InstructionInGrid>`
+
+        The positions of the instructions are grouped by their stamp so that
+        each stamp is pasted into the image in one go.
+        Instructions with a higher :attr:`render_z
+        <knittingpattern.Instruction.Instruction.render_z>` are drawn later.
+        """
+        zoom = self._zoom
+        positions = {}
+        for instruction_in_grid in instructions_in_grid:
+            instruction = instruction_in_grid.instruction
+            width = instruction_in_grid.width
+            height = instruction_in_grid.height
+            x = (self._max_x - instruction_in_grid.x - width) * zoom
+            y = (self._max_y - instruction_in_grid.y - height) * zoom
+            key = (instruction.render_z, instruction.type, instruction.color,
+                   width, height)
+            positions.setdefault(key, []).append((x, y))
+        for key in sorted(positions, key=lambda key: key[0]):
+            _, type_, color, width, height = key
+            stamp = self._stamps.stamp(type_, color, width, height, zoom)
+            paste = self._image.paste
+            for position in positions[key]:
+                paste(stamp, position)
+
+    @property
+    def image(self):
+        """The image that is drawn.
+
+        :rtype: PIL.Image.Image
+        """
+        return self._image
+
+    def write_to_file(self, file):
+        """Write the image as PNG to a file.
+
+        :param file: a file-like object
+        """
+        self._image.save(file, format="PNG")
+
+
+def default_preview_stamp_cache():
+    """Return the default PreviewStampCache.
+
+    :rtype: knittingpattern.convert.PreviewPNGBuilder.PreviewStampCache
+    """
+    global _default_preview_stamp_cache
+    if _default_preview_stamp_cache is None:
+        _default_preview_stamp_cache = PreviewStampCache()
+    return _default_preview_stamp_cache
+_default_preview_stamp_cache = None
+
+__all__ = ["PreviewPNGBuilder", "PreviewStampCache",
+           "default_preview_stamp_cache", "DEFAULT_INSTRUCTION_COLOR",
+           "BORDER_COLOR", "MINIMUM_ZOOM_FOR_TYPES", "KNIT_TYPE"]
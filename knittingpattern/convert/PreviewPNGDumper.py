@@ -0,0 +1,64 @@
+"""Dump previews of knitting patterns to PNG files.
+
+"""
+
+from ..Dumper import ContentDumper
+from .Layout import GridLayout
+from .PreviewPNGBuilder import PreviewPNGBuilder
+
+
+class PreviewPNGDumper(ContentDumper):
+    """This class saves previews of knitting patterns as PNG files."""
+
+    def __init__(self, function_that_returns_a_knitting_pattern_set, zoom,
+                 pattern_id=None):
+        """Initialize the Dumper with a
+        :paramref:`function_that_returns_a_knitting_pattern_set`.
+
+        :param function_that_returns_a_knitting_pattern_set: a function that
+          takes no arguments but returns a
+          :class:`knittinpattern.KnittingPatternSet.KnittingPatternSet`
+        :param int zoom: the size of a mesh in pixels
+        :param pattern_id: the id of the pattern in the set to dump or
+          :obj:`None` to dump the first pattern
+
+        When a dump is requested, the
+        :paramref:`function_that_returns_a_knitting_pattern_set`
+        is called and the knitting pattern is drawn and saved to the
+        specified location.
+        """
+        super().__init__(self._dump_knitting_pattern,
+                         text_is_expected=False, encoding=None)
+        self.__on_dump = function_that_returns_a_knitting_pattern_set
+        self.__zoom = zoom
+        self.__pattern_id = pattern_id
+
+    def _dump_knitting_pattern(self, file):
+        """dump a knitting pattern to a file."""
+        knitting_pattern_set = self.__on_dump()
+        if self.__pattern_id is None:
+            knitting_pattern = knitting_pattern_set.patterns.at(0)
+        else:
+            knitting_pattern = knitting_pattern_set.patterns[self.__pattern_id]
+        render_preview(knitting_pattern, self.__zoom).write_to_file(file)
+
+    def temporary_path(self, extension=".png"):
+        return super().temporary_path(extension=extension)
+    temporary_path.__doc__ = ContentDumper.temporary_path.__doc__
+
+
+def render_preview(knitting_pattern, zoom):
+    """Draw a preview of a knitting pattern.
+
+    :param knittingpattern.KnittingPattern.KnittingPattern knitting_pattern:
+      the pattern to draw
+    :param int zoom: the size of a mesh in pixels
+    :return: a builder that contains the image of the pattern
+    :rtype: knittingpattern.convert.PreviewPNGBuilder.PreviewPNGBuilder
+    """
+    layout = knitting_pattern.cached(GridLayout)
+    builder = PreviewPNGBuilder(*layout.bounding_box, zoom=int(zoom))
+    builder.add_instructions(layout.walk_instructions())
+    return builder
+
+__all__ = ["PreviewPNGDumper", "render_preview"]
@@ -3,6 +3,7 @@
 
 """
 import xmltodict
+from ..instrumentation import span, XML_UNPARSE
 
 #: an empty svg file as a basis
 SVG_FILE = """
@@ -126,6 +127,26 @@ class SVGBuilder(object):
         """
         self.place_svg_use_coords(0, 0, symbol_id, layer_id, group)
 
+    def place_rect(self, x, y, width, height, fill, layer_id, group=None):
+        """Place a filled rectangle in a layer.
+
+        :param float x: the x position of the rectangle
+        :param float y: the y position of the rectangle
+        :param float width: the width of the rectangle
+        :param float height: the height of the rectangle
+        :param str fill: the color of the rectangle
+        :param str layer_id: the id of the layer that the rectangle
+          should be placed inside
+        :param dict group: a dictionary of values to add to the rectangle or
+          :obj:`None` if nothing should be added
+        """
+        rect = {"@x": x, "@y": y, "@width": width, "@height": height,
+                "@fill": fill}
+        if group is not None:
+            rect.update(group)
+        layer = self._get_layer(layer_id)
+        layer.setdefault("rect", []).append(rect)
+
     def _get_layer(self, layer_id):
         """
         :return: the layer with the :paramref:`layer_id`. If the layer
@@ -172,7 +193,8 @@ class SVGBuilder(object):
 
         :param file: a file-like object
         """
-        xmltodict.unparse(self._structure, file, pretty=True)
+        with span(XML_UNPARSE):
+            xmltodict.unparse(self._structure, file, pretty=True)
 
 
 __all__ = ["SVGBuilder", "SVG_FILE"]
@@ -1,17 +1,95 @@
-"""Functions for color conversion."""
-import webcolors
+"""Functions for color conversion.
 
+The same colors are converted again and again, for example once for every
+pixel of a PNG. Thus, the results of the conversions are cached.
+You can see how well the caches work with :func:`color_cache_info`.
+:mod:`webcolors` is imported when the first color is converted.
 
+.. code:: python
+
+    convert_color_to_rrggbb("mocha latte")
+    print(color_cache_info()["convert_color_to_rrggbb"].hit_rate)
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+#: The maximum number of colors that are remembered by each conversion.
+MAXIMUM_CACHED_COLORS = 1024
+
+#: The statistics of a color conversion cache, see :func:`color_cache_info`.
+ColorCacheInfo = namedtuple("ColorCacheInfo", ["hits", "misses", "maxsize",
+                                               "currsize", "hit_rate"])
+
+
+@lru_cache(maxsize=1)
+def _named_colors():
+    """:return: a dictionary of the CSS3 color names and "#rrggbb" colors"""
+    import webcolors
+    names_to_hex = getattr(webcolors, "CSS3_NAMES_TO_HEX", None)
+    if names_to_hex is None:
+        names_to_hex = {name: webcolors.name_to_hex(name)
+                        for name in webcolors.names("css3")}
+    return names_to_hex
+
+
+@lru_cache(maxsize=MAXIMUM_CACHED_COLORS)
 def convert_color_to_rrggbb(color):
     """The color in "#RRGGBB" format.
 
     :return: the :attr:`color` in "#RRGGBB" format
     """
+    import webcolors
     if not color.startswith("#"):
+        hex_color = _named_colors().get(color.strip().lower())
+        if hex_color is not None:
+            return hex_color
         rgb = webcolors.html5_parse_legacy_color(color)
         hex_color = webcolors.html5_serialize_simple_color(rgb)
     else:
         hex_color = color
     return webcolors.normalize_hex(hex_color)
 
-__all__ = ["convert_color_to_rrggbb"]
+
+@lru_cache(maxsize=MAXIMUM_CACHED_COLORS)
+def convert_rrggbb_to_rgb(rrggbb):
+    """The color as a tuple of red, green and blue.
+
+    :param str rrggbb: a color in "#RRGGBB" format
+    :return: the red, green and blue values between ``0`` and ``255``
+    :rtype: tuple
+    """
+    import webcolors
+    return tuple(webcolors.hex_to_rgb(rrggbb))
+
+
+_CACHED_FUNCTIONS = [convert_color_to_rrggbb, convert_rrggbb_to_rgb]
+
+
+def color_cache_info():
+    """The statistics of the color conversion caches.
+
+    :return: a dictionary that maps the names of the conversion functions
+      to their :class:`ColorCacheInfo`
+    :rtype: dict
+
+    The ``hit_rate`` is the fraction of the calls that were answered from
+    the cache. It is ``0`` if there were no calls.
+    """
+    result = {}
+    for function in _CACHED_FUNCTIONS:
+        info = function.cache_info()
+        calls = info.hits + info.misses
+        hit_rate = info.hits / calls if calls else 0
+        result[function.__name__] = ColorCacheInfo(
+            info.hits, info.misses, info.maxsize, info.currsize, hit_rate)
+    return result
+
+
+def clear_color_cache():
+    """Remove all colors and statistics from the color conversion caches."""
+    for function in _CACHED_FUNCTIONS:
+        function.cache_clear()
+
+__all__ = ["convert_color_to_rrggbb", "convert_rrggbb_to_rgb",
+           "color_cache_info", "clear_color_cache", "ColorCacheInfo",
+           "MAXIMUM_CACHED_COLORS"]
@@ -0,0 +1,41 @@
+"""Test the color conversion and its caches."""
+from test_convert import fixture, pytest
+from knittingpattern.convert.color import convert_color_to_rrggbb, \
+    convert_rrggbb_to_rgb, color_cache_info, clear_color_cache
+import webcolors
+
+
+@fixture(autouse=True)
+def empty_cache():
+    clear_color_cache()
+    yield
+    clear_color_cache()
+
+
+@pytest.mark.parametrize("color", [
+    "blue", "Blue", " white ", "mocha latte", "dark brown", "#123", "#ABCDEF",
+    "ajsdkahsj"])
+def test_same_result_as_webcolors(color):
+    if color.startswith("#"):
+        expected = webcolors.normalize_hex(color)
+    else:
+        expected = webcolors.html5_serialize_simple_color(
+            webcolors.html5_parse_legacy_color(color))
+    assert convert_color_to_rrggbb(color) == expected
+
+
+def test_convert_rrggbb_to_rgb():
+    assert convert_rrggbb_to_rgb("#0000ff") == (0, 0, 255)
+
+
+def test_statistics():
+    for color in ["blue", "blue", "red", "blue"]:
+        convert_color_to_rrggbb(color)
+    info = color_cache_info()["convert_color_to_rrggbb"]
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+    assert info.hit_rate == 0.5
+
+
+def test_statistics_without_calls():
+    info = color_cache_info()["convert_rrggbb_to_rgb"]
+    assert (info.hits, info.misses, info.hit_rate) == (0, 0, 0)
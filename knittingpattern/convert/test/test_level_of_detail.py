@@ -0,0 +1,94 @@
+"""Test the SVGs with less detail for small zooms."""
+from test_convert import fixture, pytest
+from knittingpattern import load_from_relative_file
+from knittingpattern.convert.KnittingPatternToSVG import KnittingPatternToSVG
+from collections import namedtuple
+import knittingpattern
+import xmltodict
+
+Instruction = namedtuple("Instruction", ["hex_color"])
+InstructionInGrid = namedtuple("InstructionInGrid", ["instruction", "x", "y",
+                                                     "width", "height"])
+RowInGrid = namedtuple("RowInGrid", ["instructions"])
+
+
+@fixture(scope="module")
+def block4x4():
+    return load_from_relative_file(__name__, "test_patterns/block4x4.json")
+
+
+def parse(svg_dumper):
+    return xmltodict.parse(svg_dumper.string(), force_list=("g", "rect"))
+
+
+def rects(svg):
+    return [rect for layer in svg["svg"].get("g", [])
+            for rect in layer.get("rect", [])]
+
+
+def uses(svg):
+    return [group for layer in svg["svg"].get("g", [])
+            for group in layer.get("g", []) if "use" in group]
+
+
+def test_detail_above_the_threshold(block4x4):
+    svg = parse(block4x4.to_svg(25, level_of_detail_zoom=5))
+    assert len(uses(svg)) == 16
+    assert rects(svg) == []
+
+
+def test_rectangles_below_the_threshold(block4x4):
+    svg = parse(block4x4.to_svg(4, level_of_detail_zoom=5))
+    assert uses(svg) == []
+    rectangles = rects(svg)
+    assert rectangles
+    area = sum(float(rect["@width"]) * float(rect["@height"])
+               for rect in rectangles)
+    assert area == 16 * 4 * 4
+    assert {rect["@fill"] for rect in rectangles} == {"#008000", "#ffffff"}
+
+
+def test_same_size_as_detail(block4x4):
+    detail = parse(block4x4.to_svg(4))
+    overview = parse(block4x4.to_svg(4, level_of_detail_zoom=5))
+    for attribute in ["@width", "@height", "@viewBox"]:
+        assert detail["svg"][attribute] == overview["svg"][attribute]
+
+
+def test_rectangles_are_at_the_instructions():
+    pattern_set = knittingpattern.load_from().example("Cafe.json")
+    detail = parse(pattern_set.to_svg(2))
+    overview = parse(pattern_set.to_svg(2, level_of_detail_zoom=5))
+    rectangles = [tuple(float(rect[attribute]) for attribute in
+                        ["@x", "@y", "@width", "@height"])
+                  for rect in rects(overview)]
+    for group in uses(detail):
+        if group["use"]["@xlink:href"].startswith("#yo:"):
+            continue  # yarn overs consume no meshes and have no width
+        translate = group["@transform"].split(")")[0][len("translate("):]
+        x, y = map(float, translate.split(","))
+        assert any(r_x <= x < r_x + width and r_y <= y < r_y + height
+                   for r_x, r_y, width, height in rectangles)
+
+
+def test_less_elements_for_overviews():
+    pattern_set = knittingpattern.load_from().example("Cafe.json")
+    detail = pattern_set.to_svg(2).string()
+    overview = pattern_set.to_svg(2, level_of_detail_zoom=5).string()
+    assert len(overview) * 10 < len(detail)
+
+
+@pytest.mark.parametrize("instructions,runs", [
+    ([], []),
+    ([(0, 1, "#fff")], [(0, 1, 0, 1, "#fff")]),
+    ([(0, 1, "#fff"), (1, 2, "#fff")], [(0, 3, 0, 1, "#fff")]),
+    ([(0, 1, "#fff"), (1, 1, "#000"), (2, 1, "#fff")],
+     [(0, 1, 0, 1, "#fff"), (1, 2, 0, 1, "#000"), (2, 3, 0, 1, "#fff")]),
+    ([(0, 1, "#fff"), (2, 1, "#fff")],
+     [(0, 1, 0, 1, "#fff"), (2, 3, 0, 1, "#fff")]),
+    ([(0, 1, None), (1, 0, "#000"), (1, 1, None)],
+     [(0, 2, 0, 1, "#ffffff")])])
+def test_color_runs(instructions, runs):
+    row = RowInGrid([InstructionInGrid(Instruction(color), x, 0, width, 1)
+                     for x, width, color in instructions])
+    assert KnittingPatternToSVG._color_runs(row) == runs
@@ -0,0 +1,98 @@
+"""Test merging runs of the same instruction in SVGs."""
+from test_convert import fixture, pytest
+from knittingpattern.convert.KnittingPatternToSVG import KnittingPatternToSVG
+from collections import namedtuple
+import knittingpattern
+import xmltodict
+
+Instruction = namedtuple("Instruction", ["type", "hex_color", "render_z"])
+InstructionInGrid = namedtuple("InstructionInGrid", ["instruction", "x", "y",
+                                                     "width", "height"])
+RowInGrid = namedtuple("RowInGrid", ["instructions"])
+
+
+@fixture(scope="module")
+def cafe():
+    return knittingpattern.load_from().example("Cafe.json")
+
+
+def parse(svg_dumper):
+    return xmltodict.parse(svg_dumper.string(),
+                           force_list=("g", "rect", "pattern"))
+
+
+def layers(svg):
+    return svg["svg"].get("g", [])
+
+
+def uses(svg):
+    return [group for layer in layers(svg) for group in layer.get("g", [])
+            if "use" in group]
+
+
+def rects(svg):
+    return [rect for layer in layers(svg) for rect in layer.get("rect", [])]
+
+
+def patterns(svg):
+    return [pattern for pattern in svg["svg"]["defs"].get("pattern", [])
+            if pattern["@id"].startswith("run-pattern-")]
+
+
+def test_runs_are_merged(cafe):
+    detail = parse(cafe.to_svg(25))
+    merged = parse(cafe.to_svg(25, merge_runs=True))
+    assert rects(merged)
+    assert len(uses(merged)) + len(rects(merged)) < len(uses(detail))
+    assert len(cafe.to_svg(25, merge_runs=True).string()) < \
+        len(cafe.to_svg(25).string())
+
+
+def test_all_instructions_are_drawn(cafe):
+    detail = parse(cafe.to_svg(25))
+    merged = parse(cafe.to_svg(25, merge_runs=True))
+    widths = {pattern["@id"]: float(pattern["@width"])
+              for pattern in patterns(merged)}
+    merged_instructions = sum(
+        round(float(rect["@width"]) / widths[rect["@fill"][5:-1]])
+        for rect in rects(merged))
+    assert merged_instructions + len(uses(merged)) == len(uses(detail))
+
+
+def test_patterns_use_the_symbols(cafe):
+    merged = parse(cafe.to_svg(25, merge_runs=True))
+    symbol_ids = {"#" + group["@id"] for group in merged["svg"]["defs"]["g"]}
+    for pattern in patterns(merged):
+        assert pattern["@patternUnits"] == "userSpaceOnUse"
+        assert pattern["use"]["@xlink:href"] in symbol_ids
+
+
+def test_rect_fills_reference_patterns(cafe):
+    merged = parse(cafe.to_svg(25, merge_runs=True))
+    pattern_ids = {pattern["@id"] for pattern in patterns(merged)}
+    for rect in rects(merged):
+        assert rect["@fill"].startswith("url(#")
+        assert rect["@fill"][5:-1] in pattern_ids
+
+
+@pytest.mark.parametrize("instructions,runs", [
+    ([], []),
+    ([("knit", 0, 1)], [[0]]),
+    ([("knit", 0, 1), ("knit", 1, 1), ("knit", 2, 1)], [[0, 1, 2]]),
+    ([("knit", 0, 1), ("purl", 1, 1), ("knit", 2, 1)], [[0], [1], [2]]),
+    ([("knit", 0, 1), ("knit", 2, 1)], [[0], [1]]),
+    ([("k2tog", 0, 2), ("k2tog", 2, 2), ("knit", 4, 1)], [[0, 1], [2]]),
+    ([("yo", 0, 0), ("yo", 0, 0)], [[0], [1]])])
+def test_instruction_runs(instructions, runs):
+    row = RowInGrid([InstructionInGrid(Instruction(type_, None, 0), x, 0,
+                                       width, 1)
+                     for type_, x, width in instructions])
+    index = {id(instruction): i for i, instruction
+             in enumerate(row.instructions)}
+    result = KnittingPatternToSVG._instruction_runs(row)
+    assert [[index[id(i)] for i in run] for run in result] == runs
+
+
+def test_detail_is_not_changed_without_merging(cafe):
+    assert cafe.to_svg(25, merge_runs=False).string() == \
+        cafe.to_svg(25).string()
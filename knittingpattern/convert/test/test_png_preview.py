@@ -0,0 +1,97 @@
+"""Test drawing previews of knitting patterns."""
+from test_convert import fixture, pytest
+from knittingpattern import load_from_relative_file
+from knittingpattern.convert.PreviewPNGBuilder import PreviewStampCache, \
+    PreviewPNGBuilder, BORDER_COLOR
+from collections import namedtuple
+import knittingpattern
+import PIL.Image
+
+ZOOM = 5
+Instruction = namedtuple("Instruction", ["type", "color", "render_z"])
+InstructionInGrid = namedtuple("InstructionInGrid", ["instruction", "x", "y",
+                                                     "width", "height"])
+
+
+@fixture(scope="module")
+def block4x4():
+    return load_from_relative_file(__name__, "test_patterns/block4x4.json")
+
+
+@fixture(scope="module")
+def image(block4x4):
+    return PIL.Image.open(block4x4.to_png_preview(ZOOM).temporary_path())
+
+
+def test_size(image):
+    assert image.size == (4 * ZOOM, 4 * ZOOM)
+
+
+@pytest.mark.parametrize("i", range(4))
+def test_there_is_a_green_line(image, i):
+    x = (3 - i) * ZOOM + ZOOM // 2
+    y = (3 - i) * ZOOM + ZOOM // 2
+    assert image.getpixel((x, y)) == (0, 128, 0)
+
+
+def test_borders_are_drawn(image):
+    assert image.getpixel((0, 0)) == BORDER_COLOR
+
+
+def test_path_ends_with_png(block4x4):
+    assert block4x4.to_png_preview(ZOOM).temporary_path().endswith(".png")
+
+
+def test_charlotte():
+    charlotte = knittingpattern.load_from().example("Charlotte.json")
+    image = PIL.Image.open(charlotte.to_png_preview(2).temporary_path())
+    assert image.size[0] > 0
+
+
+class TestStampCache(object):
+
+    @fixture
+    def stamps(self):
+        return PreviewStampCache()
+
+    def test_stamps_are_shared(self, stamps):
+        stamp = stamps.stamp("knit", "red", 1, 1, 10)
+        assert stamps.stamp("knit", "red", 1, 1, 10) is stamp
+        assert len(stamps) == 1
+
+    @pytest.mark.parametrize("key", [("purl", "red", 1, 1, 10),
+                                     ("knit", "blue", 1, 1, 10),
+                                     ("knit", "red", 2, 1, 10),
+                                     ("knit", "red", 1, 1, 11)])
+    def test_different_stamps(self, stamps, key):
+        stamp = stamps.stamp("knit", "red", 1, 1, 10)
+        assert stamps.stamp(*key) is not stamp
+        assert len(stamps) == 2
+
+    def test_size(self, stamps):
+        assert stamps.stamp("k2tog", None, 2, 1, 7).size == (14, 7)
+
+    def test_color(self, stamps):
+        stamp = stamps.stamp("knit", "#123456", 1, 1, 10)
+        assert stamp.getpixel((5, 5)) == (0x12, 0x34, 0x56)
+
+
+class TestBuilder(object):
+
+    @fixture
+    def stamps(self):
+        return PreviewStampCache()
+
+    def test_higher_render_z_is_drawn_on_top(self, stamps):
+        builder = PreviewPNGBuilder(0, 0, 1, 1, 4, stamps)
+        builder.add_instructions([
+            InstructionInGrid(Instruction("knit", "red", 1), 0, 0, 1, 1),
+            InstructionInGrid(Instruction("knit", "blue", 0), 0, 0, 1, 1)])
+        assert builder.image.getpixel((2, 2)) == (255, 0, 0)
+
+    def test_each_stamp_is_created_once(self, stamps):
+        builder = PreviewPNGBuilder(0, 0, 3, 1, 4, stamps)
+        builder.add_instructions([
+            InstructionInGrid(Instruction("knit", "red", 0), x, 0, 1, 1)
+            for x in range(3)])
+        assert len(stamps) == 1
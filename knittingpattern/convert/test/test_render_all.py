@@ -0,0 +1,69 @@
+"""Test rendering all patterns of a set."""
+from test_convert import fixture, pytest
+from knittingpattern import load_from_relative_file
+from knittingpattern.convert.InstructionSVGCache import \
+    default_instruction_svg_cache
+from knittingpattern.KnittingPatternSet import KnittingPatternSet
+import knittingpattern
+import PIL.Image
+
+
+@fixture(scope="module")
+def charlotte():
+    return knittingpattern.load_from().example("Charlotte.json")
+
+
+@fixture(scope="module")
+def block4x4():
+    return load_from_relative_file(__name__, "test_patterns/block4x4.json")
+
+
+@fixture
+def pattern_ids(charlotte):
+    ids = [pattern.id for pattern in charlotte.patterns]
+    assert len(ids) > 1
+    return ids
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 3])
+def test_all_svgs_are_rendered(charlotte, pattern_ids, max_workers):
+    svgs = charlotte.to_svg_all(25, max_workers)
+    assert list(svgs) == pattern_ids
+    for id_ in pattern_ids:
+        pattern = charlotte.patterns[id_]
+        expected = KnittingPatternSet._svg_dict(
+            pattern, default_instruction_svg_cache(), 25)
+        assert svgs[id_].string() == \
+            knittingpattern.Dumper.XMLDumper(lambda: expected).string()
+
+
+def test_first_svg_is_the_same_as_to_svg(charlotte):
+    svgs = charlotte.to_svg_all(25)
+    assert svgs[charlotte.first.id].string() == charlotte.to_svg(25).string()
+
+
+def test_svg_cache_is_filled(charlotte):
+    cache = default_instruction_svg_cache()
+    charlotte.to_svg_all(25)
+    for row in charlotte.first.rows:
+        for instruction in row.instructions:
+            assert cache.get_instruction_id(instruction) in cache._cache
+
+
+def test_all_pngs_are_rendered(charlotte, pattern_ids):
+    pngs = charlotte.to_ayabpng_all(max_workers=2)
+    assert list(pngs) == pattern_ids
+    for id_ in pattern_ids:
+        image = PIL.Image.open(pngs[id_].temporary_path())
+        assert image.size[0] > 0
+
+
+def test_png_is_the_same_as_to_ayabpng(block4x4):
+    png = block4x4.to_ayabpng_all()[block4x4.first.id]
+    assert png.bytes() == block4x4.to_ayabpng().bytes()
+
+
+def test_instruction_ids_are_ids_in_the_cache():
+    cache = default_instruction_svg_cache()
+    instruction_id = ("knit", None)
+    assert cache.get_instruction_id(instruction_id) == instruction_id
@@ -0,0 +1,370 @@
+"""Count how well the caches of this library work.
+
+The library caches the default instructions, the svgs of the instructions,
+the resources and the indices of the instructions in their rows.
+The caches count how often they are used. :func:`stats` reports these
+counts together with the sizes of the caches.
+
+.. code:: python
+
+    knittingpattern.reset_stats()
+    knittingpattern.load_from().example("Cafe.json").to_svg(25).string()
+    print(knittingpattern.stats())
+    write_prometheus("/var/lib/node_exporter/knittingpattern.prom")
+
+The counts are process-wide. They are shared by all threads, e.g. the
+threads that render the patterns of a set, and by all requests that a
+server handles at the same time. :func:`reset_stats` sets the counts of
+all of them to ``0``, so the counts can not be reset for a single request
+while other requests run. Instead, read the counts periodically, e.g. with
+:func:`write_prometheus`, and compare them to the counts read before.
+The counts are exact as long as one thread uses the library. If several
+threads use it, some counts may be lost.
+
+The depth of the lookups in :class:`prototypes
+<knittingpattern.Prototype.Prototype>` is only counted after
+:func:`count_lookup_depths` was called because lookups are very frequent.
+"""
+from collections import namedtuple, Counter, OrderedDict
+import os
+import sys
+
+#: The name of the cache of :func:`default_instructions
+#: <knittingpattern.InstructionLibrary.default_instructions>`.
+DEFAULT_INSTRUCTIONS = "default_instructions"
+
+#: The name of the cache of :func:`default_instruction_svg_cache
+#: <knittingpattern.convert.InstructionSVGCache.\
+#: default_instruction_svg_cache>`.
+DEFAULT_INSTRUCTION_SVG_CACHE = "default_instruction_svg_cache"
+
+#: The name of the caches of all :class:`InstructionSVGCache
+#: <knittingpattern.convert.InstructionSVGCache.InstructionSVGCache>`
+#: objects. Their size is not known.
+INSTRUCTION_SVG_CACHE = "instruction_svg_cache"
+
+#: The name of the cache of :func:`~knittingpattern.resources.read_resource`.
+RESOURCES = "resources"
+
+#: The name of the index of an instruction in its row, see
+#: :meth:`InstructionInRow.get_index_in_row
+#: <knittingpattern.Instruction.InstructionInRow.get_index_in_row>`.
+INDEX_IN_ROW = "index_in_row"
+
+#: The prefix of the names of the metrics in the Prometheus format.
+PROMETHEUS_PREFIX = "knittingpattern_"
+
+#: The statistics of a cache. The :attr:`size` is the number of cached
+#: entries or :obj:`None` if the cache was not created, yet, or if its
+#: size is not known.
+#: The :attr:`hit_rate` is the fraction of the lookups that were answered
+#: from the cache. It is ``0`` if there were no lookups.
+CacheStatistics = namedtuple("CacheStatistics", ["hits", "misses", "size",
+                                                 "hit_rate"])
+
+#: The statistics of the cached indices of the instructions in their rows.
+#: A hit is a cached index that is still valid. A miss needs the row to
+#: look up the index. If the instructions of a row changed, the row
+#: renumbers all its instructions. These are the :attr:`rescans`.
+IndexStatistics = namedtuple("IndexStatistics", ["hits", "misses", "rescans",
+                                                 "hit_rate"])
+
+#: All statistics returned by :func:`stats`. The :attr:`caches` map the
+#: names of the caches to their :class:`CacheStatistics`. The
+#: :attr:`lookup_depths` map the depths of the lookups in prototypes to
+#: their number, see :func:`count_lookup_depths`.
+Statistics = namedtuple("Statistics", ["caches", "index_in_row",
+                                       "lookup_depths"])
+
+_hits = Counter()
+_misses = Counter()
+_rescans = Counter()
+_lookup_depths = Counter()
+_color_offsets = {}
+
+
+def hit(name):
+    """Count a lookup that was answered from a cache.
+
+    :param str name: the name of the cache
+    """
+    _hits[name] += 1
+
+
+def miss(name):
+    """Count a lookup that was not answered from a cache.
+
+    :param str name: the name of the cache
+    """
+    _misses[name] += 1
+
+
+def rescan(name):
+    """Count that an index was built again.
+
+    :param str name: the name of the index
+    """
+    _rescans[name] += 1
+
+
+def lookup_depth(depth):
+    """Count a lookup in a prototype.
+
+    :param depth: the number of prototypes that were searched before the
+      value was found or :obj:`None` if the value was not found
+    """
+    _lookup_depths[depth] += 1
+
+
+def count_lookup_depths(enabled=True):
+    """Start or stop counting the depths of the lookups in prototypes.
+
+    :param bool enabled: whether to count the depths
+
+    Counting makes each lookup slower, so it is disabled at first.
+    This changes the lookups of all prototypes in the process.
+    """
+    from .Prototype import Prototype
+    Prototype.get = Prototype._counting_get if enabled else \
+        Prototype._get
+
+
+def is_counting_lookup_depths():
+    """:return: whether the depths of the lookups in prototypes are counted
+    :rtype: bool
+    """
+    from .Prototype import Prototype
+    return Prototype.get is Prototype._counting_get
+
+
+def _hit_rate(hits, misses):
+    """:return: the fraction of the lookups that were hits"""
+    lookups = hits + misses
+    return hits / lookups if lookups else 0
+
+
+def _cache_statistics(name, size):
+    """:return: the :class:`CacheStatistics` of a cache"""
+    return CacheStatistics(_hits[name], _misses[name], size,
+                           _hit_rate(_hits[name], _misses[name]))
+
+
+def _cache_sizes():
+    """:return: the sizes of the caches by their names
+
+    Modules that were not imported are not imported to get the sizes.
+    """
+    sizes = OrderedDict()
+    library_module = sys.modules.get("knittingpattern.InstructionLibrary")
+    library = getattr(library_module, "_default_instructions", None)
+    sizes[DEFAULT_INSTRUCTIONS] = \
+        None if library is None else len(library.loaded_types)
+    svg_cache_module = sys.modules.get(
+        "knittingpattern.convert.InstructionSVGCache")
+    svg_cache = getattr(svg_cache_module, "_default_instruction_svg_cache",
+                        None)
+    sizes[DEFAULT_INSTRUCTION_SVG_CACHE] = \
+        None if svg_cache is None else len(svg_cache._cache)
+    sizes[INSTRUCTION_SVG_CACHE] = None
+    resources = sys.modules.get("knittingpattern.resources")
+    sizes[RESOURCES] = None if resources is None else \
+        len(resources._resources)
+    return sizes
+
+
+def _color_statistics():
+    """:return: the :class:`CacheStatistics` of the color conversions if
+    :mod:`knittingpattern.convert.color` was imported"""
+    color = sys.modules.get("knittingpattern.convert.color")
+    if color is None:
+        return {}
+    result = OrderedDict()
+    for name, info in sorted(color.color_cache_info().items()):
+        offset_hits, offset_misses = _color_offsets.get(name, (0, 0))
+        hits = info.hits - offset_hits
+        misses = info.misses - offset_misses
+        if hits < 0 or misses < 0:
+            # the cache was cleared after the reset
+            hits, misses = info.hits, info.misses
+        result[name] = CacheStatistics(hits, misses, info.currsize,
+                                       _hit_rate(hits, misses))
+    return result
+
+
+def stats():
+    """The statistics of the caches of this library.
+
+    :return: the counts since the last :func:`reset_stats`
+    :rtype: Statistics
+
+    The caches are reported with the names :data:`DEFAULT_INSTRUCTIONS`,
+    :data:`DEFAULT_INSTRUCTION_SVG_CACHE`, :data:`INSTRUCTION_SVG_CACHE`
+    and :data:`RESOURCES`. If colors were converted, the caches of
+    :func:`~knittingpattern.convert.color.color_cache_info` are reported,
+    too.
+    """
+    caches = OrderedDict()
+    for name, size in _cache_sizes().items():
+        caches[name] = _cache_statistics(name, size)
+    caches.update(_color_statistics())
+    index_in_row = IndexStatistics(
+        _hits[INDEX_IN_ROW], _misses[INDEX_IN_ROW], _rescans[INDEX_IN_ROW],
+        _hit_rate(_hits[INDEX_IN_ROW], _misses[INDEX_IN_ROW]))
+    return Statistics(caches, index_in_row, dict(_lookup_depths))
+
+
+def reset_stats():
+    """Set all counts to ``0``, e.g. before a benchmark runs.
+
+    The cached values stay in the caches.
+    The counts are process-wide, so this also resets the counts of other
+    threads and of requests which are handled at the same time.
+    """
+    for counter in _hits, _misses, _rescans, _lookup_depths:
+        counter.clear()
+    _color_offsets.clear()
+    color = sys.modules.get("knittingpattern.convert.color")
+    if color is not None:
+        for name, info in color.color_cache_info().items():
+            _color_offsets[name] = (info.hits, info.misses)
+
+
+def _escape(text):
+    """:return: the text with backslashes and newlines escaped like in the
+    help of the Prometheus text format"""
+    return str(text).replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value):
+    """:return: the value of a label escaped for the Prometheus text
+    format"""
+    return _escape(value).replace('"', '\\"')
+
+
+def _header(lines, name, type_, help_):
+    """Add the help and type of a metric in the Prometheus text format to
+    the lines."""
+    lines.append("# HELP {} {}".format(name, _escape(help_)))
+    lines.append("# TYPE {} {}".format(name, type_))
+
+
+def _sample(lines, name, labels, value):
+    """Add a sample in the Prometheus text format to the lines."""
+    label_text = ",".join(
+        '{}="{}"'.format(label, _escape_label_value(label_value))
+        for label, label_value in labels)
+    if label_text:
+        label_text = "{" + label_text + "}"
+    lines.append("{}{} {}".format(name, label_text, value))
+
+
+def _metric(lines, name, type_, help_, samples):
+    """Add a metric in the Prometheus text format to the lines."""
+    name = PROMETHEUS_PREFIX + name
+    _header(lines, name, type_, help_)
+    for labels, value in samples:
+        _sample(lines, name, labels, value)
+
+
+def _histogram(lines, name, help_, histograms):
+    """Add a histogram in the Prometheus text format to the lines.
+
+    :param histograms: a list of tuples ``(labels, buckets, sum)``. The
+      buckets are the result of :meth:`CollectingSink.histogram
+      <knittingpattern.instrumentation.CollectingSink.histogram>`.
+    """
+    name = PROMETHEUS_PREFIX + name
+    _header(lines, name, "histogram", help_)
+    for labels, buckets, sum_ in histograms:
+        for bound, count in buckets:
+            _sample(lines, name + "_bucket", labels + (("le", _bound(bound)),),
+                    count)
+        _sample(lines, name + "_sum", labels, sum_)
+        _sample(lines, name + "_count", labels, buckets[-1][1])
+
+
+def _depth_order(depth):
+    """:return: a key to sort the lookup depths with :obj:`None` last"""
+    return (depth is None, depth or 0)
+
+
+def _bound(bound):
+    """:return: the upper bound of a histogram bucket for Prometheus"""
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def to_prometheus(statistics=None, collector=None):
+    """The statistics in the Prometheus text format.
+
+    :param Statistics statistics: the statistics to format or :obj:`None`
+      for the current :func:`stats`
+    :param collector: a :class:`CollectingSink
+      <knittingpattern.instrumentation.CollectingSink>` to add the
+      histograms of the durations of its spans or :obj:`None`
+    :return: the metrics, see the `Prometheus exposition format
+      <https://prometheus.io/docs/instrumenting/exposition_formats/>`__
+    :rtype: str
+    """
+    if statistics is None:
+        statistics = stats()
+    caches = statistics.caches
+    lines = []
+    _metric(lines, "cache_hits_total", "counter",
+            "Lookups answered from the cache.",
+            [((("cache", name),), cache.hits)
+             for name, cache in caches.items()])
+    _metric(lines, "cache_misses_total", "counter",
+            "Lookups not answered from the cache.",
+            [((("cache", name),), cache.misses)
+             for name, cache in caches.items()])
+    _metric(lines, "cache_size", "gauge",
+            "The number of entries in the cache.",
+            [((("cache", name),), cache.size)
+             for name, cache in caches.items() if cache.size is not None])
+    index = statistics.index_in_row
+    _metric(lines, "index_in_row_hits_total", "counter",
+            "Indices of instructions in rows that were still valid.",
+            [((), index.hits)])
+    _metric(lines, "index_in_row_misses_total", "counter",
+            "Indices of instructions in rows that were looked up.",
+            [((), index.misses)])
+    _metric(lines, "index_in_row_rescans_total", "counter",
+            "Rows that renumbered their instructions.",
+            [((), index.rescans)])
+    depths = statistics.lookup_depths
+    _metric(lines, "prototype_lookups_total", "counter",
+            "Lookups in prototypes by the depth the value was found at.",
+            [((("depth", "none" if depth is None else depth),),
+              depths[depth])
+             for depth in sorted(depths, key=_depth_order)])
+    if collector is not None:
+        durations = collector.durations()
+        _histogram(lines, "span_duration_seconds",
+                   "The durations of the spans in seconds.",
+                   [((("span", name),), collector.histogram(name),
+                     sum(durations[name]))
+                    for name in sorted(durations)])
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, statistics=None, collector=None):
+    """Write the statistics to a file in the Prometheus text format.
+
+    :param str path: the path of the file
+    :param statistics: see :func:`to_prometheus`
+    :param collector: see :func:`to_prometheus`
+
+    The file is replaced at once so that a reader, e.g. the textfile
+    collector of the node exporter, never reads half a file.
+    """
+    temporary_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temporary_path, "w", encoding="UTF-8") as file:
+        file.write(to_prometheus(statistics, collector))
+    os.replace(temporary_path, path)
+
+__all__ = ["stats", "reset_stats", "to_prometheus", "write_prometheus",
+           "count_lookup_depths", "is_counting_lookup_depths", "hit", "miss",
+           "rescan", "lookup_depth", "Statistics", "CacheStatistics",
+           "IndexStatistics", "DEFAULT_INSTRUCTIONS",
+           "DEFAULT_INSTRUCTION_SVG_CACHE", "INSTRUCTION_SVG_CACHE",
+           "RESOURCES", "INDEX_IN_ROW", "PROMETHEUS_PREFIX"]
@@ -0,0 +1,255 @@
+"""Measure how long the phases of loading and converting patterns take.
+
+The phases of the library are wrapped in named spans. When a span ends, it
+is passed to the sinks. A sink is a function that takes a :class:`Span`.
+
+.. code:: python
+
+    collector = add_sink(CollectingSink())
+    knittingpattern.load_from().example("Cafe.json").to_svg(25).string()
+    print(collector.durations())
+    remove_sink(collector)
+
+If no sink is added, the spans are not measured.
+Then, a span costs one check whether sinks exist.
+
+These are the names of the spans:
+
+- :data:`JSON_DECODE`
+- :data:`FINISH_INHERITANCE`
+- :data:`CONNECT_ROWS`
+- :data:`LAYOUT_WALK`
+- :data:`BUILD_SVG_DICT`
+- :data:`XML_UNPARSE`
+"""
+from collections import namedtuple
+from functools import wraps
+from time import perf_counter
+
+#: The span of decoding JSON in
+#: :meth:`~knittingpattern.Loader.JSONLoader.string`.
+JSON_DECODE = "json_decode"
+
+#: The span of resolving the inheritance of rows and instructions in
+#: :meth:`Parser._finish_inheritance
+#: <knittingpattern.Parser.Parser._finish_inheritance>`.
+FINISH_INHERITANCE = "finish_inheritance"
+
+#: The span of connecting the rows in :meth:`Parser._connect_rows
+#: <knittingpattern.Parser.Parser._connect_rows>`.
+CONNECT_ROWS = "connect_rows"
+
+#: The span of placing the rows in a grid in a
+#: :class:`~knittingpattern.convert.Layout.GridLayout`.
+LAYOUT_WALK = "layout_walk"
+
+#: The span of :meth:`~knittingpattern.convert.KnittingPatternToSVG.\
+#: KnittingPatternToSVG.build_SVG_dict`.
+BUILD_SVG_DICT = "build_SVG_dict"
+
+#: The span of writing xml with :func:`xmltodict.unparse`.
+XML_UNPARSE = "xml_unparse"
+
+#: The names of the spans in the order of the pipeline.
+SPANS = (JSON_DECODE, FINISH_INHERITANCE, CONNECT_ROWS, LAYOUT_WALK,
+         BUILD_SVG_DICT, XML_UNPARSE)
+
+#: The upper bounds in seconds of the buckets of
+#: :meth:`CollectingSink.histogram`.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1, 2.5, 5, 10)
+
+#: A finished span. The :attr:`start` is the value of
+#: :func:`time.perf_counter` when the span started. The :attr:`duration`
+#: is in seconds.
+Span = namedtuple("Span", ["name", "start", "duration"])
+
+_sinks = ()
+
+
+def add_sink(sink):
+    """Pass the spans to a sink from now on.
+
+    :param sink: a function that is called with each finished :class:`Span`
+    :return: the :paramref:`sink`
+    """
+    global _sinks
+    _sinks = _sinks + (sink,)
+    return sink
+
+
+def remove_sink(sink):
+    """Stop passing the spans to a sink.
+
+    :param sink: a sink added with :func:`add_sink`
+    :raises ValueError: if the :paramref:`sink` was not added
+    """
+    global _sinks
+    sinks = list(_sinks)
+    sinks.remove(sink)
+    _sinks = tuple(sinks)
+
+
+def is_enabled():
+    """:return: whether sinks were added and the spans are measured
+    :rtype: bool
+    """
+    return bool(_sinks)
+
+
+class _NoSpan(object):
+    """The span used if there are no sinks. It does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+
+class _RunningSpan(object):
+    """A span that passes its duration to the sinks when it ends."""
+
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name):
+        self._name = name
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        duration = perf_counter() - self._start
+        finished = Span(self._name, self._start, duration)
+        for sink in _sinks:
+            sink(finished)
+
+
+def span(name):
+    """Measure a phase in a :keyword:`with` statement.
+
+    :param str name: the name of the span
+    :return: a context manager
+
+    .. code:: python
+
+        with span(JSON_DECODE):
+            object_ = json.loads(string)
+    """
+    if not _sinks:
+        return _NO_SPAN
+    return _RunningSpan(name)
+
+
+def spanned(name):
+    """Measure each call of the decorated function.
+
+    :param str name: the name of the span
+    :return: a decorator
+
+    .. code:: python
+
+        @spanned(CONNECT_ROWS)
+        def _connect_rows(self, connections):
+            ...
+    """
+    def decorate(function):
+        @wraps(function)
+        def spanned_function(*args, **kw):
+            if not _sinks:
+                return function(*args, **kw)
+            with _RunningSpan(name):
+                return function(*args, **kw)
+        return spanned_function
+    return decorate
+
+
+class LoggingSink(object):
+    """Log the spans with :mod:`logging`."""
+
+    def __init__(self, logger=None, level=None):
+        """Create a new LoggingSink.
+
+        :param logging.Logger logger: the logger to log to or :obj:`None`
+          to log to the logger of this module
+        :param int level: the level of the messages or :obj:`None` for
+          :data:`logging.DEBUG`
+        """
+        import logging
+        self._logger = logging.getLogger(__name__) if logger is None \
+            else logger
+        self._level = logging.DEBUG if level is None else level
+
+    def __call__(self, span_):
+        """Log a span.
+
+        :param Span span_: the finished span
+        """
+        self._logger.log(self._level, "%s took %.6fs", span_.name,
+                         span_.duration)
+
+
+class CollectingSink(object):
+    """Collect the spans in memory."""
+
+    def __init__(self):
+        """Create a new CollectingSink without spans."""
+        self._spans = []
+
+    def __call__(self, span_):
+        """Collect a span.
+
+        :param Span span_: the finished span
+        """
+        self._spans.append(span_)
+
+    @property
+    def spans(self):
+        """The collected spans in the order they ended.
+
+        :rtype: list
+        """
+        return list(self._spans)
+
+    def clear(self):
+        """Remove the collected spans."""
+        self._spans = []
+
+    def durations(self):
+        """The durations of the spans by their name.
+
+        :return: a dictionary that maps the names of the spans to lists of
+          their durations in seconds
+        :rtype: dict
+        """
+        result = {}
+        for span_ in self._spans:
+            result.setdefault(span_.name, []).append(span_.duration)
+        return result
+
+    def histogram(self, name, buckets=DEFAULT_BUCKETS):
+        """The histogram of the durations of the spans with a name.
+
+        :param str name: the name of the spans
+        :param buckets: the sorted upper bounds of the buckets in seconds
+        :return: a list of tuples ``(upper_bound, count)``. The count is the
+          number of spans which took at most ``upper_bound`` seconds. The
+          last upper bound is ``float("inf")`` and counts all spans.
+        :rtype: list
+
+        The counts are cumulative like in the histograms of Prometheus.
+        """
+        durations = self.durations().get(name, [])
+        bounds = list(buckets) + [float("inf")]
+        return [(bound, sum(duration <= bound for duration in durations))
+                for bound in bounds]
+
+__all__ = ["span", "spanned", "add_sink", "remove_sink", "is_enabled", "Span",
+           "LoggingSink", "CollectingSink", "JSON_DECODE",
+           "FINISH_INHERITANCE", "CONNECT_ROWS", "LAYOUT_WALK",
+           "BUILD_SVG_DICT", "XML_UNPARSE", "SPANS", "DEFAULT_BUCKETS"]
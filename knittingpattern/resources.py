@@ -0,0 +1,245 @@
+"""The resources of this package bundled into one file.
+
+The default instructions and the svg files for the instructions are
+located in many small files. Loading them needs many file operations.
+:func:`build_resource_bundle` saves the content of all these files in one
+file, the resource bundle. :func:`read_resource` reads a resource from it
+with one read. The svg files are saved already parsed.
+
+.. code:: bash
+
+    python setup.py build_resources
+
+An installed package always reads the resources from the bundle if it
+exists. In a source checkout, the bundle remembers the hashes of the
+files it was built from. If the files of a resource are changed during
+development, the resource is not read from the bundle and the files are
+loaded instead. If the bundle was not built, the files are loaded, too.
+"""
+from .counters import hit, miss, RESOURCES
+import hashlib
+import json
+import os
+
+#: The folder of this package.
+PACKAGE_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+#: The file name of the resource bundle in the :data:`PACKAGE_FOLDER`.
+RESOURCE_BUNDLE_NAME = "resources.bundle"
+
+#: The version of the format of the resource bundle.
+RESOURCE_BUNDLE_VERSION = 2
+
+#: The name of the resource with the default instruction specifications,
+#: see :class:`~knittingpattern.InstructionLibrary.DefaultInstructions`.
+INSTRUCTIONS = "instructions"
+
+#: The name of the resource with the svg files of the instructions,
+#: see :func:`~knittingpattern.convert.InstructionToSVG.\
+#: default_instructions_to_svg`.
+INSTRUCTION_SVGS = "instruction-svgs"
+
+#: The folders of the resources relative to the :data:`PACKAGE_FOLDER`.
+RESOURCE_FOLDERS = {
+    INSTRUCTIONS: "instructions",
+    INSTRUCTION_SVGS: os.path.join("convert", "instruction-svgs")
+}
+
+
+def _load_instructions(path):
+    """:return: the list of instructions in a JSON file"""
+    with open(path, encoding="UTF-8") as file:
+        return json.load(file)
+
+
+def _load_instruction_svg(path):
+    """:return: the svg file as an :mod:`xmltodict` structure or as a string
+    if the svg is a template for several instruction types"""
+    import xmltodict
+    from .convert.InstructionToSVG import REPLACE_IN_DEFAULT_SVG
+    with open(path, encoding="UTF-8") as file:
+        svg = file.read()
+    if REPLACE_IN_DEFAULT_SVG in svg:
+        return svg
+    return xmltodict.parse(svg)
+
+
+def _relative_paths(folder):
+    """:return: a sorted list of the paths of the files in a folder"""
+    paths = []
+    for root, _, files in os.walk(folder):
+        for file in files:
+            path = os.path.join(root, file)
+            paths.append(os.path.relpath(path, folder))
+    paths.sort()
+    return paths
+
+
+def _fingerprint(folder, paths):
+    """:return: the paths and the hashes of the content of the files"""
+    fingerprint = []
+    for path in paths:
+        with open(os.path.join(folder, path), "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        fingerprint.append([path.replace(os.sep, "/"), digest])
+    return fingerprint
+
+
+def _build_resource(name, package_folder):
+    """:return: the fingerprint and the content of a resource"""
+    folder = os.path.join(package_folder, RESOURCE_FOLDERS[name])
+    paths = _relative_paths(folder)
+    if name == INSTRUCTIONS:
+        content = []
+        for path in paths:
+            content.extend(_load_instructions(os.path.join(folder, path)))
+    else:
+        content = {}
+        for path in paths:
+            instruction_type = os.path.splitext(os.path.basename(path))[0]
+            content[instruction_type] = _load_instruction_svg(
+                os.path.join(folder, path))
+    return _fingerprint(folder, paths), content
+
+
+def build_resource_bundle(path=None, package_folder=PACKAGE_FOLDER):
+    """Build the resource bundle.
+
+    :param str path: the path to save the resource bundle to or
+      :obj:`None` to save it as :data:`RESOURCE_BUNDLE_NAME` in the
+      :paramref:`package_folder`
+    :param str package_folder: the folder with the resource folders, see
+      :data:`RESOURCE_FOLDERS`
+    :return: the path of the resource bundle
+    :rtype: str
+
+    The first line of the bundle is a JSON index of the resources.
+    The resources follow as JSON, each at the offset noted in the index.
+    Thus, a resource can be read without parsing the other resources.
+    """
+    if path is None:
+        path = os.path.join(package_folder, RESOURCE_BUNDLE_NAME)
+    index = {"version": RESOURCE_BUNDLE_VERSION, "resources": {}}
+    sections = []
+    offset = 0
+    for name in sorted(RESOURCE_FOLDERS):
+        files, content = _build_resource(name, package_folder)
+        section = json.dumps(content).encode("UTF-8")
+        index["resources"][name] = {"files": files, "offset": offset,
+                                    "length": len(section)}
+        sections.append(section)
+        offset += len(section)
+    with open(path, "wb") as file:
+        file.write(json.dumps(index, sort_keys=True).encode("UTF-8"))
+        file.write(b"\n")
+        for section in sections:
+            file.write(section)
+    clear_resource_cache()
+    return path
+
+
+def _read_index(path):
+    """:return: the index of the resource bundle at the path and the
+    position of the first resource or an empty dictionary and ``0``"""
+    if path not in _indices:
+        try:
+            with open(path, "rb") as file:
+                index = json.loads(file.readline().decode("UTF-8"))
+                start = file.tell()
+        except (OSError, ValueError):
+            index, start = {}, 0
+        if index.get("version") != RESOURCE_BUNDLE_VERSION:
+            index, start = {}, 0
+        _indices[path] = index, start
+    return _indices[path]
+_indices = {}
+
+
+def _is_source_checkout(package_folder):
+    """:return: whether the package folder is in a source checkout
+
+    Then, the resource folders may change during development.
+    An installed package has no :file:`setup.py` next to it."""
+    parent = os.path.dirname(os.path.abspath(package_folder))
+    return os.path.isfile(os.path.join(parent, "setup.py"))
+
+
+def _is_up_to_date(files, folder):
+    """:return: whether the files of the resource did not change"""
+    if not os.path.isdir(folder):
+        return True
+    paths = _relative_paths(folder)
+    try:
+        return _fingerprint(folder, paths) == files
+    except OSError:
+        return False
+
+
+def _read_section(path, start, entry):
+    """:return: the content of a resource in the bundle or :obj:`None`"""
+    try:
+        with open(path, "rb") as file:
+            file.seek(start + entry["offset"])
+            section = file.read(entry["length"])
+        return json.loads(section.decode("UTF-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def read_resource(name, path=None, package_folder=PACKAGE_FOLDER):
+    """Read a resource from the resource bundle.
+
+    :param str name: the name of the resource, :data:`INSTRUCTIONS` or
+      :data:`INSTRUCTION_SVGS`
+    :param str path: the path of the resource bundle or :obj:`None` for
+      the bundle in the :paramref:`package_folder`
+    :param str package_folder: the folder with the resource folders, see
+      :data:`RESOURCE_FOLDERS`
+    :return: the content of the resource or :obj:`None` if the resource
+      should be loaded from its folder
+
+    The content of :data:`INSTRUCTIONS` is a list of instruction
+    specifications. The content of :data:`INSTRUCTION_SVGS` is a dictionary
+    that maps the instruction types to their svg files, parsed by
+    :func:`xmltodict.parse`. Svg files that contain
+    :data:`~knittingpattern.convert.InstructionToSVG.REPLACE_IN_DEFAULT_SVG`
+    are not parsed but kept as strings.
+
+    :obj:`None` is returned if the bundle does not exist. In a source
+    checkout, :obj:`None` is also returned if the files in the folder of the
+    resource changed after the bundle was built. An installed package does
+    not check its files, so that reading a resource reads only the bundle.
+    The content is shared, so it should not be modified.
+    """
+    if path is None:
+        path = os.path.join(package_folder, RESOURCE_BUNDLE_NAME)
+    key = (name, path, package_folder)
+    if key in _resources:
+        hit(RESOURCES)
+    else:
+        miss(RESOURCES)
+        index, start = _read_index(path)
+        entry = index.get("resources", {}).get(name)
+        folder = os.path.join(package_folder, RESOURCE_FOLDERS[name])
+        if entry is not None and (
+                not _is_source_checkout(package_folder) or
+                _is_up_to_date(entry["files"], folder)):
+            _resources[key] = _read_section(path, start, entry)
+        else:
+            _resources[key] = None
+    return _resources[key]
+_resources = {}
+
+
+def clear_resource_cache():
+    """Read the resource bundles again when they are used the next time.
+
+    The resources are remembered after the first call to
+    :func:`read_resource`.
+    """
+    _indices.clear()
+    _resources.clear()
+
+__all__ = ["build_resource_bundle", "read_resource", "clear_resource_cache",
+           "PACKAGE_FOLDER", "RESOURCE_BUNDLE_NAME", "RESOURCE_BUNDLE_VERSION",
+           "INSTRUCTIONS", "INSTRUCTION_SVGS", "RESOURCE_FOLDERS"]
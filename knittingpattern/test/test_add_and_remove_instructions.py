@@ -85,3 +85,124 @@ def test_transfer_removed_instruction(row, row2):
     row2.instructions.append(row.instructions.pop())
     instruction = row2.instructions[-1]
     assert instruction.row == row2
+
+
+@fixture
+def changes(row):
+    """The changes of the instructions of the row."""
+    changes = []
+    row.instructions.register_observer(changes.append)
+    return changes
+
+
+def test_appending_a_specification_notifies_once(row, changes):
+    row.instructions.append({})
+    assert len(changes) == 1
+    assert changes[0].adds()
+    assert changes[0].elements == [row.instructions[1]]
+
+
+def test_extend_specs(row, changes, instruction2):
+    row.extend_specs([{"color": "red"}, instruction2, {}])
+    assert len(changes) == 1
+    assert (changes[0].start, changes[0].length) == (1, 3)
+    assert len(row.instructions) == 4
+    assert row.instructions[1].color == "red"
+    assert row.instructions[2] is instruction2
+    assert instruction2.row == row
+    assert all(instruction.index_in_row == index
+               for index, instruction in enumerate(row.instructions))
+
+
+def test_batch_of_appends_notifies_once(row, changes):
+    with row.batch() as instructions:
+        for _ in range(5):
+            instructions.append({})
+        assert len(row.instructions) == 1
+    assert len(changes) == 1
+    assert changes[0].adds()
+    assert (changes[0].start, changes[0].length) == (1, 5)
+    assert len(row.instructions) == 6
+    assert all(instruction.row == row and instruction.type == "knit"
+               for instruction in row.instructions)
+
+
+def test_batch_replaces_only_the_changed_part(row, changes, instruction):
+    row.extend_specs([{}, {}, {}])
+    first, second, third = row.instructions[1:]
+    changes.clear()
+    with row.batch() as instructions:
+        instructions[2] = {"color": "blue"}
+        instructions.insert(2, {})
+    assert [change.adds() for change in changes] == [False, True]
+    assert (changes[0].start, changes[0].length) == (2, 1)
+    assert (changes[1].start, changes[1].length) == (2, 2)
+    assert row.instructions[:2] == [instruction, first]
+    assert row.instructions[3].color == "blue"
+    assert row.instructions[4] is third
+    assert not second.is_in_row()
+
+
+def test_empty_batch_does_not_notify(row, changes):
+    with row.batch():
+        pass
+    assert changes == []
+
+
+def test_batch_is_not_applied_on_error(row, changes, instruction):
+    with raises(ValueError):
+        with row.batch() as instructions:
+            instructions.append({})
+            raise ValueError()
+    assert row.instructions == [instruction]
+    assert changes == []
+
+
+def assert_positions(row):
+    for index, instruction in enumerate(row.instructions):
+        assert instruction.index_in_row == index
+        assert instruction.get_index_in_row() == index
+
+
+@fixture
+def long_row(row):
+    row.extend_specs([{} for _ in range(9)])
+    return row
+
+
+def test_positions_after_inserting_at_the_front(long_row):
+    long_row.instructions.insert(0, {})
+    assert_positions(long_row)
+    instruction = long_row.instructions[0]
+    instructions = []
+    while instruction is not None:
+        instructions.append(instruction)
+        instruction = instruction.next_instruction_in_row
+    assert instructions == long_row.instructions
+
+
+def test_positions_after_removing(long_row):
+    removed = long_row.instructions.pop(3)
+    assert_positions(long_row)
+    assert removed.get_index_in_row() is None
+    last = long_row.instructions.pop()
+    assert last.get_index_in_row() is None
+    long_row.instructions.append({})
+    assert_positions(long_row)
+
+
+def test_positions_after_transfer(long_row, row2, instruction2):
+    instruction = long_row.instructions[2]
+    row2.instructions.append(instruction)
+    assert instruction.index_in_row == 1
+    assert_positions(long_row)
+    assert_positions(row2)
+    assert instruction2.next_instruction_in_row is instruction
+
+
+def test_mesh_indices_after_inserting(long_row):
+    long_row.instructions.insert(1, {"number of consumed meshes": 2})
+    index = 0
+    for instruction in long_row.instructions:
+        assert instruction.index_of_first_consumed_mesh_in_row == index
+        index += instruction.number_of_consumed_meshes
@@ -0,0 +1,95 @@
+"""Load and dump knitting patterns with asyncio."""
+from pytest import fixture
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from knittingpattern import load_from
+from knittingpattern.Loader import PathLoader
+from knittingpattern.Dumper import ContentDumper
+from knittingpattern.utils import run_in_executor
+import asyncio
+import knittingpattern
+import os
+
+
+@fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@fixture
+def executor():
+    with ThreadPoolExecutor(2) as executor:
+        yield executor
+
+
+@fixture
+def cafe_path():
+    folder = os.path.dirname(knittingpattern.__file__)
+    return os.path.join(folder, "examples", "Cafe.json")
+
+
+def first_id(knitting_pattern_set):
+    return knitting_pattern_set.patterns.at(0).id
+
+
+def test_run_in_executor(loop, executor):
+    async def run():
+        return await run_in_executor(pow, 2, 3, executor=executor)
+    assert loop.run_until_complete(run()) == 8
+
+
+def test_load_path(loop, cafe_path):
+    async def load():
+        return await load_from().apath(cafe_path)
+    loaded = loop.run_until_complete(load())
+    assert first_id(loaded) == first_id(load_from().path(cafe_path))
+
+
+def test_load_url(loop, cafe_path, executor):
+    async def load():
+        return await load_from().aurl("file://" + cafe_path,
+                                      executor=executor)
+    loaded = loop.run_until_complete(load())
+    assert first_id(loaded) == first_id(load_from().path(cafe_path))
+
+
+def test_dump_path(loop, tmpdir, executor):
+    path = tmpdir.join("content.txt").strpath
+    dumper = ContentDumper(lambda file: file.write("content"))
+
+    async def dump():
+        await dumper.apath(path, executor=executor)
+    loop.run_until_complete(dump())
+    with open(path) as file:
+        assert file.read() == "content"
+
+
+def test_dump_string_and_bytes(loop):
+    dumper = ContentDumper(lambda file: file.write("ሴ"))
+
+    async def dump():
+        return await dumper.astring(), await dumper.abytes()
+    assert loop.run_until_complete(dump()) == ("ሴ", "ሴ".encode())
+
+
+def test_the_loop_is_not_blocked(loop, executor):
+    """While the content is loaded, other tasks run in the loop."""
+    started = Event()
+    may_finish = Event()
+
+    def process(path):
+        started.set()
+        assert may_finish.wait(10)
+        return path
+
+    async def other_task():
+        await run_in_executor(started.wait, 10)
+        may_finish.set()
+
+    async def run():
+        loaded = PathLoader(process).apath("path", executor=executor)
+        _, result = await asyncio.gather(other_task(), loaded)
+        return result
+    assert loop.run_until_complete(run()) == "path"
@@ -0,0 +1,125 @@
+"""Test the compact representation of knitting patterns."""
+from pytest import fixture, mark
+from test_examples import CAFE_STRING, CHARLOTTE_STRING
+from knittingpattern.ParsingSpecification import \
+    new_knitting_pattern_set_loader, CompactSpecification, \
+    DefaultSpecification
+from knittingpattern.Prototype import Prototype, CompactPrototype
+from knittingpattern.Instruction import InstructionInRow
+from knittingpattern.Row import Row
+from knittingpattern.convert.Layout import GridLayout
+import tracemalloc
+
+
+def load(specification, string=CAFE_STRING):
+    loader = new_knitting_pattern_set_loader(specification)
+    return loader.string(string).patterns.at(0)
+
+
+@fixture
+def compact():
+    return load(CompactSpecification())
+
+
+@fixture
+def default():
+    return load(DefaultSpecification())
+
+
+def instructions(pattern):
+    return [instruction for row in pattern.rows
+            for instruction in row.instructions]
+
+
+def test_compact_classes_are_subclasses(compact):
+    assert all(isinstance(row, Row) for row in compact.rows)
+    assert all(isinstance(instruction, InstructionInRow)
+               for instruction in instructions(compact))
+
+
+@mark.parametrize("specification", [CompactSpecification,
+                                    DefaultSpecification])
+def test_objects_have_no_dict(specification):
+    pattern = load(specification())
+    row = pattern.rows.at(0)
+    instruction = row.instructions[0]
+    assert not hasattr(row, "__dict__")
+    assert not hasattr(instruction, "__dict__")
+    assert not hasattr(instruction.produced_meshes[0], "__dict__")
+    assert not hasattr(instruction.consumed_meshes[0], "__dict__")
+
+
+@mark.parametrize("string", [CAFE_STRING, CHARLOTTE_STRING])
+def test_compact_pattern_is_the_same(string):
+    compact = load(CompactSpecification(), string)
+    default = load(DefaultSpecification(), string)
+    assert [row.id for row in compact.rows_in_knit_order()] == \
+        [row.id for row in default.rows_in_knit_order()]
+    assert compact.instruction_colors == default.instruction_colors
+    assert [(i.type, i.color, i.number_of_consumed_meshes)
+            for i in instructions(compact)] == \
+        [(i.type, i.color, i.number_of_consumed_meshes)
+         for i in instructions(default)]
+    layout = GridLayout(compact)
+    assert list(layout.walk_instructions(lambda i: i.xy)) == \
+        list(GridLayout(default).walk_instructions(lambda i: i.xy))
+
+
+def test_instructions_of_the_same_type_share_inherited_values(compact):
+    knits = [instruction._Prototype__specification for instruction
+             in instructions(compact) if instruction.type == "knit"]
+    assert len(knits) > 1
+    inherited = {id(knit._Prototype__inherited) for knit in knits}
+    assert len(inherited) == 1
+
+
+def bytes_per_instruction(specification, string):
+    load(specification, string)  # warm up the caches of the modules
+    tracemalloc.start()
+    try:
+        pattern = load(specification, string)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return size / len(instructions(pattern))
+
+
+def test_compact_patterns_use_less_memory():
+    string = CHARLOTTE_STRING
+    compact = bytes_per_instruction(CompactSpecification(), string)
+    default = bytes_per_instruction(DefaultSpecification(), string)
+    assert compact < default
+
+
+class TestCompactPrototype(object):
+
+    class Compact(CompactPrototype):
+        __slots__ = ()
+
+    @fixture
+    def base(self):
+        return Prototype({"a": 1, "b": 1})
+
+    def test_lookup(self, base):
+        prototype = self.Compact({"a": 2}, [base])
+        assert prototype["a"] == 2
+        assert prototype["b"] == 1
+        assert "c" not in prototype
+
+    def test_inherit_from_does_not_change_shared_values(self, base):
+        shared = (base,)
+        prototype1 = self.Compact({})
+        prototype2 = self.Compact({})
+        prototype1.inherit_from_all(shared)
+        prototype2.inherit_from_all(shared)
+        prototype1.inherit_from({"b": 3})
+        assert prototype1["b"] == 3
+        assert prototype2["b"] == 1
+        assert shared == (base,)
+
+    def test_inherit_from_all_order(self, base):
+        prototype = self.Compact({})
+        prototype.inherit_from_all((base,))
+        prototype.inherit_from_all(({"a": 4}, {"b": 4}))
+        assert prototype["a"] == 4
+        assert prototype["b"] == 4
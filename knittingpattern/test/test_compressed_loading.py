@@ -0,0 +1,106 @@
+"""Load compressed knitting patterns."""
+from pytest import fixture, mark
+from knittingpattern import load_from
+from knittingpattern.InstructionLibrary import InstructionLibrary
+from knittingpattern.Loader import PathLoader, has_extension, \
+    compression_of_bytes, decompress
+import bz2
+import gzip
+import lzma
+import os
+from test_async import cafe_path
+
+COMPRESSIONS = [(".gz", gzip), (".bz2", bz2), (".xz", lzma)]
+
+
+@fixture
+def cafe():
+    return load_from().example("Cafe.json")
+
+
+@fixture
+def content(cafe_path):
+    with open(cafe_path, "rb") as file:
+        return file.read()
+
+
+def first_id(knitting_pattern_set):
+    return knitting_pattern_set.patterns.at(0).id
+
+
+@mark.parametrize("extension,module", COMPRESSIONS)
+def test_load_compressed_path(tmpdir, content, cafe, extension, module):
+    path = tmpdir.join("cafe.json" + extension).strpath
+    with open(path, "wb") as file:
+        file.write(module.compress(content))
+    assert first_id(load_from().path(path)) == first_id(cafe)
+
+
+@mark.parametrize("extension,module", COMPRESSIONS)
+def test_compression_is_recognized_by_content(tmpdir, content, cafe,
+                                              extension, module):
+    path = tmpdir.join("cafe.pattern").strpath
+    with open(path, "wb") as file:
+        file.write(module.compress(content))
+    assert first_id(load_from().path(path)) == first_id(cafe)
+
+
+@mark.parametrize("extension,module", COMPRESSIONS)
+def test_decompress(content, extension, module):
+    compressed = module.compress(content)
+    assert compression_of_bytes(compressed) == module.__name__
+    assert decompress(compressed) == content
+
+
+def test_uncompressed_content_is_unchanged(content):
+    assert compression_of_bytes(content) is None
+    assert decompress(content) is content
+
+
+def test_load_compressed_url(tmpdir, content, cafe):
+    path = tmpdir.join("cafe.json.gz").strpath
+    with open(path, "wb") as file:
+        file.write(gzip.compress(content))
+    assert first_id(load_from().url("file://" + path)) == first_id(cafe)
+
+
+def test_has_extension():
+    chooses_path = has_extension(".json")
+    assert chooses_path("a/b.json")
+    assert chooses_path("a/b.JSON.gz")
+    assert chooses_path("b.json.bz2")
+    assert chooses_path("b.json.xz")
+    assert not chooses_path("b.gz")
+    assert not chooses_path("b.png")
+    assert not chooses_path("b.png.gz")
+
+
+def test_folder_chooses_compressed_files(tmpdir):
+    for name in ["a.json", "b.json.gz", "c.txt", "d.txt.gz"]:
+        tmpdir.join(name).write("")
+    loader = PathLoader(os.path.basename, has_extension(".json"))
+    assert sorted(loader.folder(tmpdir.strpath)) == ["a.json", "b.json.gz"]
+
+
+def test_pattern_folder_loads_compressed_json(tmpdir, content, cafe):
+    tmpdir.join("cafe.json.gz").write_binary(gzip.compress(content))
+    tmpdir.join("README.md").write("# not a pattern")
+    loaded = load_from().folder(tmpdir.strpath)
+    assert [first_id(pattern_set) for pattern_set in loaded] == \
+        [first_id(cafe)]
+
+
+def test_examples_skip_files_that_are_no_patterns(cafe_path):
+    examples = os.path.dirname(cafe_path)
+    patterns = [name for name in os.listdir(examples)
+                if name.endswith(".json")]
+    assert len(load_from().examples()) == len(patterns)
+
+
+def test_instruction_folder_loads_compressed_json(tmpdir):
+    instructions = b'[{"type": "compressed", "value": 1}]'
+    tmpdir.join("compressed.json.gz").write_binary(gzip.compress(instructions))
+    tmpdir.join("notes.txt").write("not an instruction")
+    library = InstructionLibrary()
+    library.load.folder(tmpdir.strpath)
+    assert library.as_instruction({"type": "compressed"})["value"] == 1
@@ -0,0 +1,88 @@
+"""Test the compiled mesh connections of knitting patterns."""
+from pytest import fixture, importorskip
+import knittingpattern
+from knittingpattern.ConnectionGraph import ConnectionGraph, NOT_CONNECTED
+from test_walk import construct_graph
+
+numpy = importorskip("numpy")
+
+
+@fixture
+def block():
+    return knittingpattern.load_from().example("block4x4.json").first
+
+
+@fixture
+def graph(block):
+    return block.connection_graph()
+
+
+@fixture
+def cafe_graph():
+    pattern = knittingpattern.load_from().example("Cafe.json").first
+    return pattern.connection_graph()
+
+
+def test_connection_graph_is_created(graph, block):
+    assert isinstance(graph, ConnectionGraph)
+    assert graph.rows == block.rows_in_knit_order()
+    assert len(graph) == 16
+
+
+def test_mesh_offsets(graph):
+    assert list(graph.produced_mesh_offsets) == list(range(17))
+    assert list(graph.consumed_mesh_offsets) == list(range(17))
+
+
+def test_produced_meshes_are_connected_upwards(graph):
+    expected = list(range(4, 16)) + [NOT_CONNECTED] * 4
+    assert list(graph.consumed_mesh_of_produced_mesh) == expected
+
+
+def test_consumed_meshes_are_connected_downwards(graph):
+    expected = [NOT_CONNECTED] * 4 + list(range(12))
+    assert list(graph.produced_mesh_of_consumed_mesh) == expected
+
+
+def test_instructions_above_and_below(graph):
+    assert list(graph.instructions_above(1)) == [5]
+    assert list(graph.instructions_below(5)) == [1]
+    assert list(graph.instructions_above(13)) == []
+    assert list(graph.instructions_below(2)) == []
+
+
+def test_row_of_instruction(graph):
+    assert list(graph.row_of_instruction) == [0] * 4 + [1] * 4 + [2] * 4 + \
+        [3] * 4
+
+
+def test_column(graph):
+    assert graph.column(2) == [2, 6, 10, 14]
+    assert graph.column(15) == [15]
+
+
+def test_graph_matches_the_meshes(cafe_graph):
+    instructions = cafe_graph.instructions
+    for index, instruction in enumerate(instructions):
+        above = [instructions[i] for i in cafe_graph.instructions_above(index)]
+        expected = [i for i in instruction.consuming_instructions
+                    if i is not None]
+        assert above == expected
+        below = [instructions[i] for i in cafe_graph.instructions_below(index)]
+        expected = [i for i in instruction.producing_instructions
+                    if i is not None]
+        assert below == expected
+
+
+def test_connected_components_of_a_block(graph):
+    assert list(graph.connected_components()) == [0, 1, 2, 3] * 4
+
+
+def test_connected_components_of_separate_rows():
+    pattern = construct_graph(((1, 2), (3, 4)))
+    graph = pattern.connection_graph()
+    rows = [row.id for row in graph.rows]
+    labels = graph.connected_components()
+    assert labels[rows.index(1)] == labels[rows.index(2)]
+    assert labels[rows.index(3)] == labels[rows.index(4)]
+    assert labels[rows.index(1)] != labels[rows.index(3)]
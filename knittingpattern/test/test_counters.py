@@ -0,0 +1,201 @@
+"""Report the statistics of the caches."""
+import re
+from pytest import fixture
+import knittingpattern
+from knittingpattern import load_from, new_knitting_pattern
+from knittingpattern.counters import stats, reset_stats, to_prometheus, \
+    write_prometheus, count_lookup_depths, is_counting_lookup_depths, \
+    Statistics, CacheStatistics, DEFAULT_INSTRUCTIONS, \
+    DEFAULT_INSTRUCTION_SVG_CACHE, INSTRUCTION_SVG_CACHE, RESOURCES
+from knittingpattern.instrumentation import CollectingSink, Span
+from knittingpattern.InstructionLibrary import default_instructions
+from knittingpattern.Prototype import Prototype
+from knittingpattern.convert.InstructionSVGCache import InstructionSVGCache
+
+
+@fixture(autouse=True)
+def reset():
+    reset_stats()
+
+
+@fixture
+def lookup_depths():
+    count_lookup_depths()
+    yield
+    count_lookup_depths(False)
+
+
+@fixture
+def row():
+    pattern = new_knitting_pattern("pattern")
+    row = pattern.add_row(1)
+    row.instructions.extend([{}, {}, {}])
+    return row
+
+
+def test_stats_of_the_package():
+    assert knittingpattern.stats() == stats()
+    assert isinstance(stats(), Statistics)
+
+
+def test_caches_are_reported():
+    caches = stats().caches
+    for name in [DEFAULT_INSTRUCTIONS, DEFAULT_INSTRUCTION_SVG_CACHE,
+                 INSTRUCTION_SVG_CACHE, RESOURCES, "convert_color_to_rrggbb"]:
+        assert isinstance(caches[name], CacheStatistics)
+
+
+def test_default_instructions_hits():
+    default_instructions()
+    default_instructions()
+    cache = stats().caches[DEFAULT_INSTRUCTIONS]
+    assert cache.hits >= 1
+    assert cache.size == len(default_instructions().loaded_types)
+
+
+def test_instruction_svg_cache(row):
+    cache = InstructionSVGCache()
+    cache.instruction_to_svg_dict(row.instructions[0])
+    cache.instruction_to_svg_dict(row.instructions[1])
+    statistics = stats().caches[INSTRUCTION_SVG_CACHE]
+    assert (statistics.hits, statistics.misses) == (1, 1)
+    assert statistics.hit_rate == 0.5
+
+
+def test_reset():
+    default_instructions()
+    load_from().example("Cafe.json").to_svg(25).string()
+    knittingpattern.reset_stats()
+    for cache in stats().caches.values():
+        assert (cache.hits, cache.misses, cache.hit_rate) == (0, 0, 0)
+
+
+def test_index_in_row(row):
+    instruction = row.instructions[1]
+    assert instruction.index_in_row == 1
+    assert stats().index_in_row.hits == 1
+    row.instructions.pop(0)
+    assert instruction.index_in_row == 0
+    index_in_row = stats().index_in_row
+    assert index_in_row.misses == 1
+    assert index_in_row.rescans == 1
+
+
+def test_lookup_depths_are_not_counted_by_default(row):
+    assert not is_counting_lookup_depths()
+    row.instructions[0].type
+    assert stats().lookup_depths == {}
+
+
+def test_lookup_depths(lookup_depths):
+    prototype = Prototype({"a": 1}, [{"b": 2}, {"c": 3}])
+    assert is_counting_lookup_depths()
+    assert prototype["a"] == 1
+    assert prototype["c"] == 3
+    assert prototype.get("d") is None
+    assert "c" in prototype
+    assert stats().lookup_depths == {0: 1, 2: 2, None: 1}
+
+
+def test_prometheus(lookup_depths, row):
+    row.instructions[1].index_in_row
+    Prototype({}).get("a")
+    text = to_prometheus()
+    assert "# TYPE knittingpattern_cache_hits_total counter\n" in text
+    assert 'knittingpattern_cache_size{cache="default_instructions"}' in text
+    assert "knittingpattern_index_in_row_hits_total 1\n" in text
+    assert 'knittingpattern_prototype_lookups_total{depth="none"} ' in text
+    assert text.endswith("\n")
+
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)'
+                    r'(?:\{((?:[a-zA-Z_]\w*="(?:[^"\\\n]|\\.)*",?)*)\})? '
+                    r'(\S+)$')
+LABEL = re.compile(r'([a-zA-Z_]\w*)="((?:[^"\\\n]|\\.)*)"')
+SUFFIXES = {"histogram": ("_bucket", "_sum", "_count"), "counter": ("",),
+            "gauge": ("",)}
+
+
+def unescape(value):
+    return re.sub(r"\\(.)", lambda match: {"n": "\n"}.get(
+        match.group(1), match.group(1)), value)
+
+
+def parse_prometheus(text):
+    """:return: the types of the families and their samples
+
+    Each sample must belong to the family declared before it."""
+    types = {}
+    samples = []
+    family = None
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            family, type_ = line.split()[2:]
+            assert family not in types
+            types[family] = type_
+            continue
+        if line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match is not None, line
+        name, labels, value = match.groups()
+        assert name in [family + suffix for suffix in SUFFIXES[types[family]]]
+        labels = {label: unescape(label_value)
+                  for label, label_value in LABEL.findall(labels or "")}
+        samples.append((name, labels, float(value)))
+    return types, samples
+
+
+def test_prometheus_span_histograms():
+    collector = CollectingSink()
+    collector(Span("json_decode", 0, 0.002))
+    collector(Span("json_decode", 0, 0.02))
+    collector(Span("xml_unparse", 0, 1))
+    types, samples = parse_prometheus(to_prometheus(collector=collector))
+    name = "knittingpattern_span_duration_seconds"
+    assert types[name] == "histogram"
+    histogram = [(sample_name, labels, value)
+                 for sample_name, labels, value in samples
+                 if sample_name.startswith(name)]
+    for span_ in ("json_decode", "xml_unparse"):
+        buckets = [(labels["le"], value) for sample_name, labels, value
+                   in histogram if sample_name == name + "_bucket" and
+                   labels["span"] == span_]
+        counts = [count for _, count in buckets]
+        assert counts == sorted(counts)
+        assert buckets[-1][0] == "+Inf"
+        values = {sample_name: value for sample_name, labels, value
+                  in histogram if labels == {"span": span_}}
+        assert values[name + "_count"] == buckets[-1][1]
+    assert ("knittingpattern_span_duration_seconds_bucket",
+            {"span": "json_decode", "le": "0.001"}, 0) in histogram
+    assert ("knittingpattern_span_duration_seconds_count",
+            {"span": "json_decode"}, 2) in histogram
+    assert ("knittingpattern_span_duration_seconds_sum",
+            {"span": "json_decode"}, 0.022) in histogram
+
+
+def test_prometheus_is_parsed(lookup_depths, row):
+    row.instructions[1].index_in_row
+    types, samples = parse_prometheus(to_prometheus())
+    assert types["knittingpattern_cache_hits_total"] == "counter"
+    assert ("knittingpattern_index_in_row_hits_total", {}, 1) in samples
+
+
+def test_prometheus_label_values_are_escaped():
+    collector = CollectingSink()
+    span_ = 'a "quoted"\\span\nname'
+    collector(Span(span_, 0, 0.5))
+    text = to_prometheus(collector=collector)
+    assert '{span="a \\"quoted\\"\\\\span\\nname"}' in text
+    _, samples = parse_prometheus(text)
+    assert ("knittingpattern_span_duration_seconds_count",
+            {"span": span_}, 1) in samples
+
+
+def test_write_prometheus(tmpdir):
+    path = tmpdir.join("knittingpattern.prom").strpath
+    write_prometheus(path)
+    with open(path) as file:
+        assert file.read() == to_prometheus()
+    assert tmpdir.listdir() == [tmpdir.join("knittingpattern.prom")]
@@ -1,7 +1,9 @@
 from pytest import fixture
-from knittingpattern.Dumper import ContentDumper
+from knittingpattern.Dumper import ContentDumper, SVGDumper
 from io import StringIO, BytesIO
 import os
+import gzip
+import xmltodict
 
 
 STRING = "asdf1234567890\u1234"
@@ -194,3 +196,122 @@ def test_string_representation(save_to):
     assert string.startswith("<ContentDumper")
     assert string.endswith(">")
     assert save_to.encoding in string
+
+
+def test_gzip_bytes(save_to):
+    assert gzip.decompress(save_to.gzip_bytes()) == BYTES
+
+
+def test_gzip_path(save_to, tmpdir):
+    path = tmpdir.join("temp.txt.gz").strpath
+    save_to.gzip_path(path)
+    with gzip.open(path, "rt", encoding="UTF-8") as file:
+        assert file.read() == STRING
+
+
+def test_gzip_is_the_same_every_time(save_to):
+    assert save_to.gzip_bytes() == save_to.gzip_bytes()
+
+
+class TestXML(object):
+
+    OBJECT = {"svg": {"g": [{"@id": "1"}, {"@id": "2"}]}}
+
+    @fixture
+    def pretty(self):
+        return SVGDumper(lambda: self.OBJECT)
+
+    @fixture
+    def compact(self):
+        return SVGDumper(lambda: self.OBJECT, compact=True)
+
+    def test_compact_has_no_indentation(self, compact):
+        assert compact.compact
+        assert "\n" not in compact.string().split("?>", 1)[1].strip()
+
+    def test_pretty_is_indented(self, pretty):
+        assert not pretty.compact
+        assert "\t" in pretty.string()
+
+    def test_same_content(self, pretty, compact):
+        parse = xmltodict.parse
+        assert parse(pretty.string()) == parse(compact.string())
+
+    def test_svgz(self, compact):
+        assert gzip.decompress(compact.svgz()) == compact.bytes()
+
+    def test_svgz_path(self, pretty, tmpdir):
+        path = tmpdir.join("test.svgz").strpath
+        assert pretty.svgz(path) is None
+        with open(path, "rb") as file:
+            assert gzip.decompress(file.read()) == pretty.bytes()
+
+
+class TestCached(object):
+
+    @fixture
+    def calls(self):
+        return []
+
+    @fixture(params=[True, False])
+    def dumper(self, request, calls):
+        text_is_expected = request.param
+        content = STRING if text_is_expected else BYTES
+
+        def dump(file):
+            calls.append(file)
+            file.write(content)
+        return ContentDumper(dump, text_is_expected=text_is_expected)
+
+    @fixture
+    def cached(self, dumper):
+        return dumper.cached()
+
+    def test_cached_is_a_copy(self, dumper, cached):
+        assert cached is not dumper
+        assert cached.is_cached
+        assert not dumper.is_cached
+        assert cached.cached() is cached
+
+    def test_content_is_created_once(self, cached, calls, tmpdir):
+        assert cached.string() == STRING
+        assert cached.bytes() == BYTES
+        cached.path(tmpdir.join("1.txt").strpath)
+        assert cached.file().getvalue() == STRING
+        assert cached.binary_file().getvalue() == BYTES
+        assert gzip.decompress(cached.gzip_bytes()) == BYTES
+        assert_string_is_path_content(cached.temporary_path())
+        assert len(calls) == 1
+
+    def test_nothing_is_created_before_the_first_dump(self, cached, calls):
+        assert calls == []
+
+    def test_bytes_are_the_same_object(self, cached):
+        assert cached.bytes() is cached.bytes()
+
+    def test_paths(self, dumper, calls, tmpdir):
+        paths = [tmpdir.join(name).strpath for name in ("a.txt", "b.txt")]
+        dumper.paths(*paths)
+        for path in paths:
+            assert_string_is_path_content(path)
+        assert len(calls) == 1
+
+    def test_text_without_encoding(self, tmpdir):
+        dumper = ContentDumper(lambda file: file.write(STRING), encoding=None)
+        paths = [tmpdir.join(name).strpath for name in ("a.txt", "b.txt")]
+        dumper.cached().path(paths[0])
+        dumper.paths(*paths)
+        for path in paths:
+            with open(path) as file:
+                assert file.read() == STRING
+
+    def test_cached_svg(self):
+        objects = []
+
+        def dump():
+            objects.append(TestXML.OBJECT)
+            return TestXML.OBJECT
+        svg = SVGDumper(dump).cached()
+        assert isinstance(svg, SVGDumper)
+        assert gzip.decompress(svg.svgz()) == svg.bytes()
+        assert len(objects) == 1
@@ -0,0 +1,110 @@
+"""Test the modification generation of knitting patterns."""
+from pytest import fixture
+from test_examples import charlotte as _charlotte
+from knittingpattern.convert.Layout import GridLayout
+from unittest.mock import Mock
+
+
+@fixture
+def a1():
+    return _charlotte().patterns["A.1"]
+
+
+@fixture
+def row(a1):
+    return a1.rows.at(1)
+
+
+def changes(pattern, change):
+    """:return: whether :paramref:`change` changes the generation"""
+    generation = pattern.generation
+    change()
+    assert pattern.generation >= generation
+    return pattern.generation != generation
+
+
+def test_reading_does_not_change_the_generation(a1, row):
+    def read():
+        a1.rows_in_knit_order()
+        row.produced_meshes[0].consuming_row
+        row.instructions[2].index_in_row
+    assert not changes(a1, read)
+
+
+def test_adding_instructions(a1, row):
+    assert changes(a1, lambda: row.instructions.append({}))
+    assert changes(a1, lambda: row.instructions.insert(0, {}))
+
+
+def test_removing_instructions(a1, row):
+    assert changes(a1, lambda: row.instructions.pop())
+
+
+def test_batch_changes(a1, row):
+    def batch():
+        with row.batch() as instructions:
+            instructions.append({})
+    assert changes(a1, batch)
+
+
+def test_adding_a_row(a1):
+    assert changes(a1, lambda: a1.add_row("new row"))
+    assert changes(a1, lambda: a1.rows["new row"].instructions.append({}))
+
+
+def test_disconnecting_a_mesh(a1, row):
+    mesh = row.produced_meshes[0]
+    assert changes(a1, mesh.disconnect)
+    assert not changes(a1, mesh.disconnect)
+
+
+def test_connecting_a_mesh(a1, row):
+    produced_mesh = row.produced_meshes[0]
+    consumed_mesh = produced_mesh.as_consumed_mesh()
+    produced_mesh.disconnect()
+    assert changes(a1, lambda: produced_mesh.connect_to(consumed_mesh))
+
+
+def test_connecting_meshes_of_rows(a1, row):
+    row2 = a1.rows.at(2)
+    assert changes(a1, lambda: row.connect_produced_meshes(0, row2, 1, 2))
+
+
+def test_rows_of_other_patterns_do_not_change_the_generation(a1):
+    other = _charlotte().patterns["A.1"]
+    assert not changes(a1, lambda: other.rows.at(0).instructions.append({}))
+
+
+class TestCached(object):
+
+    @fixture
+    def compute(self):
+        return Mock()
+
+    def test_result_is_reused(self, a1, compute):
+        assert a1.cached(compute) is compute.return_value
+        assert a1.cached(compute) is compute.return_value
+        compute.assert_called_once_with(a1)
+
+    def test_result_is_computed_again_after_a_change(self, a1, row, compute):
+        a1.cached(compute)
+        row.instructions.append({})
+        a1.cached(compute)
+        assert compute.call_count == 2
+
+    def test_keys(self, a1, compute):
+        a1.cached(compute, "a")
+        a1.cached(compute, "b")
+        a1.cached(compute, "a")
+        assert compute.call_count == 2
+
+    def test_layout_is_cached(self, a1):
+        assert a1.cached(GridLayout) is a1.cached(GridLayout)
+
+
+def test_knit_order_is_computed_again(a1):
+    new_row = a1.add_row("new row")
+    new_row.instructions.append({})
+    new_row.connect_produced_meshes(0, a1.rows.at(0), 0, 1)
+    rows = a1.rows_in_knit_order()
+    assert rows.index(new_row) < rows.index(a1.rows.at(0))
@@ -0,0 +1,67 @@
+"""Test finding instructions by type and color."""
+from pytest import fixture
+import pytest
+import knittingpattern
+from knittingpattern.InstructionIndex import ANY
+
+
+@fixture(params=[True, False])
+def cafe(request):
+    pattern = knittingpattern.load_from().example("Cafe.json").first
+    if request.param:
+        pattern.index_instructions()
+    return pattern
+
+
+def find(pattern, type_=ANY, color=ANY):
+    """:return: the instructions found by looking at all of them"""
+    return [instruction for row in pattern.rows
+            for instruction in row.instructions
+            if (type_ is ANY or instruction.type == type_) and
+            (color is ANY or instruction.color == color)]
+
+
+@pytest.mark.parametrize("type_,color", [
+    ("knit", ANY), ("k2tog", ANY), (ANY, "mocha latte"), (ANY, "brown"),
+    ("knit", "white"), ("yo", "dark brown"), ("unknown", ANY),
+    (ANY, "unknown"), (ANY, ANY)])
+def test_find(cafe, type_, color):
+    assert cafe.find(type=type_, color=color) == find(cafe, type_, color)
+
+
+def test_index_is_optional():
+    pattern = knittingpattern.load_from().example("Cafe.json").first
+    assert pattern.instruction_index is None
+    index = pattern.index_instructions()
+    assert pattern.instruction_index is index
+    assert pattern.index_instructions() is index
+    assert index.knitting_pattern is pattern
+
+
+def test_added_instructions_are_found(cafe):
+    row = cafe.rows.at(3)
+    row.instructions.insert(1, {"type": "purl", "color": "pink"})
+    assert cafe.find(color="pink") == [row.instructions[1]]
+    assert cafe.find(type="purl") == find(cafe, "purl")
+
+
+def test_removed_instructions_are_not_found(cafe):
+    row = cafe.rows.at(0)
+    instruction = row.instructions.pop()
+    assert instruction not in cafe.find(type=instruction.type)
+    assert cafe.find(color=instruction.color) == \
+        find(cafe, color=instruction.color)
+
+
+def test_added_rows_are_found(cafe):
+    row = cafe.add_row("new row")
+    row.instructions.append({"type": "purl"})
+    assert cafe.find(type="purl") == find(cafe, "purl")
+
+
+def test_types_and_colors():
+    pattern = knittingpattern.load_from().example("Cafe.json").first
+    index = pattern.index_instructions()
+    assert set(index.colors) == set(pattern.instruction_colors)
+    assert set(index.types) == {instruction.type for row in pattern.rows
+                                for instruction in row.instructions}
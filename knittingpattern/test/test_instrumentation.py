@@ -0,0 +1,99 @@
+"""Measure the phases of loading and converting patterns with spans."""
+from pytest import fixture, raises
+from knittingpattern import load_from
+from knittingpattern.instrumentation import span, spanned, add_sink, \
+    remove_sink, is_enabled, Span, LoggingSink, CollectingSink, \
+    JSON_DECODE, FINISH_INHERITANCE, CONNECT_ROWS, LAYOUT_WALK, \
+    BUILD_SVG_DICT, XML_UNPARSE
+import logging
+
+
+@fixture
+def collector():
+    collector = add_sink(CollectingSink())
+    yield collector
+    remove_sink(collector)
+
+
+@fixture
+def pattern_set():
+    return load_from().example("Cafe.json")
+
+
+def test_no_sinks_are_added():
+    assert not is_enabled()
+
+
+def test_spans_are_not_measured_without_sinks():
+    assert span("test") is span("other")
+
+
+def test_span_is_passed_to_the_sinks(collector):
+    spans = []
+    add_sink(spans.append)
+    try:
+        with span("test"):
+            pass
+    finally:
+        remove_sink(spans.append)
+    assert spans == collector.spans
+    assert [span_.name for span_ in spans] == ["test"]
+    assert isinstance(spans[0], Span)
+    assert spans[0].duration >= 0
+
+
+def test_removed_sinks_get_no_spans(collector):
+    remove_sink(collector)
+    with span("test"):
+        pass
+    add_sink(collector)
+    assert collector.spans == []
+
+
+def test_removing_an_unknown_sink():
+    with raises(ValueError):
+        remove_sink(print)
+
+
+def test_spanned_function(collector):
+    @spanned("add")
+    def add(a, b=1):
+        return a + b
+    assert add(1, b=2) == 3
+    assert add.__name__ == "add"
+    assert list(collector.durations()) == ["add"]
+
+
+def test_span_ends_with_an_error(collector):
+    with raises(KeyError):
+        with span("error"):
+            raise KeyError()
+    assert len(collector.spans) == 1
+
+
+def test_phases_of_loading_and_rendering(collector, pattern_set):
+    collector.clear()
+    pattern_set.to_svg(25).string()
+    names = set(collector.durations())
+    assert names == {LAYOUT_WALK, BUILD_SVG_DICT, XML_UNPARSE}
+    collector.clear()
+    load_from().example("Cafe.json")
+    assert {JSON_DECODE, FINISH_INHERITANCE, CONNECT_ROWS} <= \
+        set(collector.durations())
+
+
+def test_histogram(collector):
+    for duration in [0.001, 0.002, 0.2, 20]:
+        collector(Span("test", 0, duration))
+    assert collector.histogram("test", [0.001, 0.01, 1]) == \
+        [(0.001, 1), (0.01, 2), (1, 3), (float("inf"), 4)]
+    assert collector.histogram("missing", [1]) == \
+        [(1, 0), (float("inf"), 0)]
+
+
+def test_logging_sink(caplog):
+    logger = logging.getLogger("test_instrumentation")
+    sink = LoggingSink(logger, logging.INFO)
+    with caplog.at_level(logging.INFO):
+        sink(Span("test", 0, 0.5))
+    assert "test took 0.500000s" in caplog.text
@@ -15,6 +15,7 @@ class TestInstructionColors(object):
     def unique(self, monkeypatch):
         mock = Mock()
         monkeypatch.setattr(KnittingPatternModule, "unique", mock)
+        mock.return_value = [Mock(), Mock()]
         return mock
 
     @fixture
@@ -30,7 +31,7 @@ class TestInstructionColors(object):
 
     @fixture
     def knittingpattern(self, rows):
-        return KnittingPattern(Mock(), Mock(), Mock(), Mock())
+        return KnittingPattern(Mock(), Mock(), rows, Mock())
 
     def test_result(self, knittingpattern, unique, rows_in_knit_order):
         assert knittingpattern.instruction_colors == unique.return_value
@@ -48,3 +49,35 @@ class TestInstructionColors(object):
         pattern = knittingpattern.load_from().example("Cafe.json").first
         colors = ["mocha latte", "dark brown", "brown", "white", ]
         assert pattern.instruction_colors == colors
+
+
+class TestInstructionColorCounts(object):
+
+    """Test KnittingPattern.instruction_color_counts."""
+
+    @fixture
+    def cafe(self):
+        return knittingpattern.load_from().example("Cafe.json").first
+
+    def count_colors(self, pattern):
+        counts = {}
+        for row in pattern.rows:
+            for instruction in row.instructions:
+                color = instruction.color
+                counts[color] = counts.get(color, 0) + 1
+        return counts
+
+    def test_counts(self, cafe):
+        assert cafe.instruction_color_counts == self.count_colors(cafe)
+
+    def test_counts_are_updated(self, cafe):
+        cafe.instruction_color_counts
+        cafe.rows.at(0).instructions.append({"color": "pink"})
+        assert cafe.instruction_color_counts == self.count_colors(cafe)
+        assert cafe.instruction_color_counts["pink"] == 1
+
+    def test_colors_are_updated(self, cafe):
+        colors = cafe.instruction_colors
+        row = cafe.rows_in_knit_order()[-1]
+        row.instructions.append({"color": "pink"})
+        assert cafe.instruction_colors == colors + ["pink"]
@@ -0,0 +1,80 @@
+"""Loading patterns does not import the converters and their dependencies.
+
+The imports are checked in a new interpreter because the other tests
+import everything.
+"""
+from pytest import mark
+import knittingpattern
+import os
+import subprocess
+import sys
+
+#: The package folder to import knittingpattern from.
+PACKAGE_FOLDER = os.path.dirname(os.path.dirname(knittingpattern.__file__))
+
+#: The modules that are only needed to convert patterns.
+HEAVY_MODULES = ["PIL", "webcolors", "xmltodict", "concurrent.futures",
+                 "asyncio", "knittingpattern.convert.Layout",
+                 "knittingpattern.convert.AYABPNGDumper",
+                 "knittingpattern.convert.KnittingPatternToSVG",
+                 "knittingpattern.Dumper"]
+
+#: The time in seconds that importing the parser may take.
+IMPORT_TIME_BUDGET = 0.1
+
+LOAD_PATTERN = """
+import knittingpattern
+pattern_set = knittingpattern.load_from().example("Cafe.json")
+pattern = pattern_set.first
+pattern.rows_in_knit_order()
+pattern.instruction_colors
+"""
+
+
+def python(*arguments):
+    """:return: the completed process of a new python interpreter"""
+    environment = os.environ.copy()
+    environment["PYTHONPATH"] = PACKAGE_FOLDER
+    return subprocess.run([sys.executable] + list(arguments),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, env=environment,
+                          check=True)
+
+
+def imported_modules(code):
+    """:return: the modules in :data:`sys.modules` after running the code"""
+    code += "\nimport sys\nprint('\\n'.join(sys.modules))"
+    return python("-c", code).stdout.split()
+
+
+@mark.parametrize("code", [
+    "import knittingpattern.KnittingPatternSet",
+    "import knittingpattern.Instruction", LOAD_PATTERN])
+@mark.parametrize("module", HEAVY_MODULES)
+def test_heavy_modules_are_not_imported(code, module):
+    assert module not in imported_modules(code)
+
+
+def test_converters_are_imported_when_used():
+    code = LOAD_PATTERN + "pattern_set.to_svg(25).string()"
+    modules = imported_modules(code)
+    assert "xmltodict" in modules
+    assert "knittingpattern.convert.KnittingPatternToSVG" in modules
+
+
+def import_time(module):
+    """:return: the time in seconds it takes to import the module"""
+    code = "import " + module
+    lines = python("-X", "importtime", "-c", code).stderr.splitlines()
+    for line in lines:
+        _, cumulative, name = line.rsplit("|", 2)
+        if name.strip() == module:
+            return int(cumulative) / 1000000
+    raise ValueError("{} was not imported.".format(module))
+
+
+@mark.skipif(sys.version_info < (3, 7), reason="-X importtime is missing")
+def test_import_time_budget():
+    time = min(import_time("knittingpattern.ParsingSpecification")
+               for _ in range(3))
+    assert time < IMPORT_TIME_BUDGET
@@ -0,0 +1,181 @@
+"""The meshes of instructions are created when they are accessed."""
+from pytest import fixture, raises
+from test_examples import charlotte as _charlotte
+from test_walk import construct_graph
+
+
+def connections(row):
+    """:return: the produced connections of a row with row ids"""
+    return [(index, consuming_row.id, index_in_consuming_row)
+            for index, consuming_row, index_in_consuming_row
+            in row.produced_mesh_connections()]
+
+
+def connections_of_meshes(row):
+    """:return: the same as :func:`connections` computed with meshes"""
+    return [(index, mesh.consuming_row.id, mesh.index_in_consuming_row)
+            for index, mesh in enumerate(row.produced_meshes)
+            if mesh.is_consumed()]
+
+
+def instructions(pattern):
+    return [instruction for row in pattern.rows
+            for instruction in row.instructions]
+
+
+@fixture
+def a1():
+    return _charlotte().patterns["A.1"]
+
+
+@fixture
+def a1_with_meshes():
+    pattern = _charlotte().patterns["A.1"]
+    for instruction in instructions(pattern):
+        instruction.produced_meshes
+    return pattern
+
+
+@fixture
+def row1(a1):
+    return a1.rows.at(1)
+
+
+def test_loading_creates_no_meshes(a1):
+    assert not any(instruction._meshes_are_created()
+                   for instruction in instructions(a1))
+
+
+def test_connections_create_no_meshes(a1):
+    for row in a1.rows:
+        row.produced_mesh_connections()
+        row.consumed_mesh_connections()
+        row.rows_before
+        row.rows_after
+    a1.rows_in_knit_order()
+    assert not any(instruction._meshes_are_created()
+                   for instruction in instructions(a1))
+
+
+def test_connections_are_the_same_with_meshes(a1, a1_with_meshes):
+    for row, row_with_meshes in zip(a1.rows, a1_with_meshes.rows):
+        assert connections(row) == connections_of_meshes(row_with_meshes)
+        assert connections(row_with_meshes) == connections(row)
+
+
+def test_connections_are_not_lost(a1):
+    expected = [connections(row) for row in a1.rows]
+    assert [connections_of_meshes(row) for row in a1.rows] == expected
+
+
+def test_accessing_a_mesh_connects_both_sides(row1):
+    mesh = row1.consumed_meshes[2]
+    assert mesh.is_produced()
+    produced_mesh = mesh.as_produced_mesh()
+    assert produced_mesh.is_consumed()
+    assert produced_mesh.as_consumed_mesh() is mesh
+    assert produced_mesh.producing_row.produced_meshes[
+        produced_mesh.index_in_producing_row] is produced_mesh
+
+
+def test_inserting_an_instruction_keeps_the_connections(a1, row1):
+    row0 = a1.rows.at(0)
+    before = [(index, row.id, index_in_row)
+              for index, row, index_in_row in row1.consumed_mesh_connections()]
+    row0.instructions.insert(0, {})
+    shifted = [(index, row_id, index_in_row + 1)
+               for index, row_id, index_in_row in before]
+    assert [(index, row.id, index_in_row)
+            for index, row, index_in_row
+            in row1.consumed_mesh_connections()] == shifted
+    assert not row0.consumed_meshes[0].is_produced()
+    assert not row0.produced_meshes[0].is_consumed()
+
+
+def test_removing_an_instruction_keeps_the_mesh_connections(a1):
+    row0 = a1.rows.at(0)
+    instruction = row0.instructions[1]
+    consumed_mesh = instruction.produced_meshes[0].as_consumed_mesh()
+    row0.instructions.pop(0)
+    assert instruction.produced_meshes[0].as_consumed_mesh() is consumed_mesh
+    assert row0.produced_meshes[0] is instruction.produced_meshes[0]
+
+
+def test_appending_an_instruction_does_not_create_meshes(row1):
+    row1.instructions.append({})
+    assert not any(instruction._meshes_are_created()
+                   for instruction in row1.instructions)
+
+
+def consumed_connections(row):
+    return [(index, producing_row.id, index_in_producing_row)
+            for index, producing_row, index_in_producing_row
+            in row.consumed_mesh_connections()]
+
+
+@fixture(params=[True, False])
+def pattern_to_reconnect(request):
+    pattern = _charlotte().patterns["A.1"]
+    if request.param:
+        for instruction in instructions(pattern):
+            instruction.produced_meshes
+    return pattern
+
+
+def test_connect_produced_meshes_reconnects(pattern_to_reconnect):
+    row1 = pattern_to_reconnect.rows.at(1)
+    row2 = pattern_to_reconnect.rows.at(2)
+    row1.connect_produced_meshes(0, row2, 1, 2)
+    assert consumed_connections(row2) == [
+        (1, row1.id, 0), (2, row1.id, 1), (3, row1.id, 3)]
+    assert connections(row1) == [(0, row2.id, 1), (1, row2.id, 2),
+                                 (3, row2.id, 3)]
+    assert row2.consumed_meshes[1].producing_row == row1
+    assert row2.consumed_meshes[1].index_in_producing_row == 0
+    assert not row2.consumed_meshes[0].is_produced()
+
+
+def test_connect_produced_meshes_with_meshes():
+    pattern = construct_graph([[1, 2]])
+    row_1 = pattern.rows[1]
+    row_2 = pattern.rows[2]
+    row_1.instructions.append({})
+    row_2.instructions.append({})
+    row_1.connect_produced_meshes(1, row_2, 1, 1)
+    assert row_1.produced_meshes[1].consuming_row == row_2
+    assert connections(row_1) == [(0, 2, 0), (1, 2, 1)]
+
+
+def test_connecting_too_many_meshes():
+    pattern = construct_graph([[1, 2]])
+    with raises(IndexError):
+        pattern.rows[1].connect_produced_meshes(0, pattern.rows[2], 0, 2)
+
+
+def test_batch_keeps_the_connections(a1, row1):
+    row0 = a1.rows.at(0)
+    before = consumed_connections(row1)
+    with row0.batch() as instructions:
+        instructions.insert(0, {})
+        instructions.append({})
+    assert consumed_connections(row1) == [
+        (index, row_id, index_in_row + 1)
+        for index, row_id, index_in_row in before]
+
+
+def test_mesh_offsets_change_when_an_instruction_is_replaced():
+    row = construct_graph([[1]]).rows[1]
+    row.instructions.extend([{}, {}, {}])
+    assert row.instructions[2].index_of_first_consumed_mesh_in_row == 2
+    row.instructions[0] = {"type": "k2tog"}
+    assert row.instructions[2].index_of_first_consumed_mesh_in_row == 3
+    assert row.number_of_consumed_meshes == 4
+
+
+def test_mesh_offsets_computed_during_a_removal_are_not_kept():
+    row = construct_graph([[1]]).rows[1]
+    row.instructions.extend([{"type": "k2tog"}, {}, {}])
+    row.register_change_observer(lambda row: row.number_of_consumed_meshes)
+    row.instructions.pop(0)
+    assert row.number_of_consumed_meshes == 2
+    assert row.instructions[1].index_of_first_consumed_mesh_in_row == 1
@@ -0,0 +1,81 @@
+"""Test the column-oriented view of knitting patterns."""
+from pytest import fixture, importorskip
+import knittingpattern
+from knittingpattern.PatternArray import PatternArray
+
+numpy = importorskip("numpy")
+
+
+@fixture
+def block():
+    return knittingpattern.load_from().example("block4x4.json").first
+
+
+@fixture
+def arrays(block):
+    return block.to_arrays()
+
+
+@fixture
+def cafe_arrays():
+    return knittingpattern.load_from().example("Cafe.json").first.to_arrays()
+
+
+def test_to_arrays_returns_a_pattern_array(arrays, block):
+    assert isinstance(arrays, PatternArray)
+    assert arrays.knitting_pattern is block
+
+
+def test_rows_are_in_knit_order(arrays, block):
+    assert arrays.rows == block.rows_in_knit_order()
+
+
+def test_row_offsets(arrays):
+    assert list(arrays.row_offsets) == [0, 4, 8, 12, 16]
+    assert list(arrays.row_index) == [0] * 4 + [1] * 4 + [2] * 4 + [3] * 4
+
+
+def test_instructions_of_rows(arrays):
+    for index, row in enumerate(arrays.rows):
+        start, stop = arrays.row_offsets[index:index + 2]
+        assert arrays.instructions[start:stop] == row.instructions
+
+
+def test_colors(arrays):
+    assert arrays.colors == ["green", None]
+    colors = [arrays.colors[i] for i in arrays.color_id]
+    assert colors == [i.color for i in arrays.instructions]
+    assert list(arrays.color_counts()) == [4, 12]
+
+
+def test_types(arrays):
+    assert arrays.types == ["knit"]
+    assert list(arrays.type_id) == [0] * 16
+
+
+def test_meshes(cafe_arrays):
+    consumed = [i.number_of_consumed_meshes for i in cafe_arrays.instructions]
+    produced = [i.number_of_produced_meshes for i in cafe_arrays.instructions]
+    assert list(cafe_arrays.number_of_consumed_meshes) == consumed
+    assert list(cafe_arrays.number_of_produced_meshes) == produced
+
+
+def test_type_counts(cafe_arrays):
+    counts = dict(zip(cafe_arrays.types, cafe_arrays.type_counts()))
+    expected = {}
+    for instruction in cafe_arrays.instructions:
+        expected[instruction.type] = expected.get(instruction.type, 0) + 1
+    assert counts == expected
+    assert len(cafe_arrays) == sum(expected.values())
+
+
+def test_grid_positions(arrays):
+    assert list(arrays.x) == [0, 1, 2, 3] * 4
+    assert list(arrays.y) == [0] * 4 + [1] * 4 + [2] * 4 + [3] * 4
+
+
+def test_empty_pattern():
+    arrays = knittingpattern.new_knitting_pattern("empty").to_arrays()
+    assert len(arrays) == 0
+    assert list(arrays.row_offsets) == [0]
+    assert len(arrays.x) == 0
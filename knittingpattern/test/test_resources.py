@@ -0,0 +1,142 @@
+"""Read the default instructions and svgs from the resource bundle."""
+from pytest import fixture, mark
+from functools import partial
+from knittingpattern.resources import build_resource_bundle, read_resource, \
+    clear_resource_cache, INSTRUCTIONS, INSTRUCTION_SVGS, RESOURCE_FOLDERS, \
+    PACKAGE_FOLDER
+from knittingpattern.InstructionLibrary import DefaultInstructions
+from knittingpattern.Instruction import Instruction
+from knittingpattern.convert.InstructionToSVG import \
+    default_instructions_to_svg
+import knittingpattern.InstructionLibrary as InstructionLibrary
+import knittingpattern.convert.InstructionToSVG as InstructionToSVG
+import os
+import shutil
+import xmltodict
+
+
+def svgs_of(instruction_to_svg):
+    return instruction_to_svg._instruction_type_to_file_content
+
+
+@fixture(autouse=True)
+def clear_cache():
+    clear_resource_cache()
+    yield
+    clear_resource_cache()
+
+
+@fixture
+def bundle(tmpdir):
+    return build_resource_bundle(tmpdir.join("resources.bundle").strpath)
+
+
+@fixture
+def package_folder(tmpdir):
+    """A copy of the resource folders to change them."""
+    folder = tmpdir.join("package").strpath
+    for resource_folder in RESOURCE_FOLDERS.values():
+        shutil.copytree(os.path.join(PACKAGE_FOLDER, resource_folder),
+                        os.path.join(folder, resource_folder))
+    return folder
+
+
+@fixture
+def checkout(tmpdir, package_folder):
+    """The package folder in a source checkout."""
+    tmpdir.join("setup.py").write("")
+    return package_folder
+
+
+@fixture
+def knit_json(package_folder):
+    return os.path.join(package_folder, RESOURCE_FOLDERS[INSTRUCTIONS],
+                        "knit.json")
+
+
+@fixture
+def bundled(monkeypatch, bundle):
+    """Read the resources only from the bundle."""
+    for module in (InstructionLibrary, InstructionToSVG):
+        monkeypatch.setattr(module, "read_resource",
+                            partial(read_resource, path=bundle))
+    monkeypatch.setattr(DefaultInstructions, "INSTRUCTIONS_FOLDER",
+                        "missing-folder")
+    monkeypatch.setattr(InstructionToSVG, "DEFAULT_SVG_FOLDER",
+                        "missing-folder")
+
+
+def test_missing_bundle_is_not_read(tmpdir):
+    path = tmpdir.join("missing.bundle").strpath
+    assert read_resource(INSTRUCTIONS, path) is None
+
+
+def test_instructions_are_bundled(bundle):
+    instructions = read_resource(INSTRUCTIONS, bundle)
+    types = {instruction["type"] for instruction in instructions}
+    assert types == set(DefaultInstructions().loaded_types)
+
+
+def test_svgs_are_bundled(bundle):
+    svgs = read_resource(INSTRUCTION_SVGS, bundle)
+    knit_svg = svgs_of(default_instructions_to_svg())["knit"]
+    assert svgs["knit"] == xmltodict.parse(knit_svg)
+    assert "{instruction.type}" in svgs["default"]
+
+
+def test_bundle_is_not_read_after_changes_in_a_checkout(checkout,
+                                                        knit_json):
+    bundle = build_resource_bundle(package_folder=checkout)
+    assert read_resource(INSTRUCTIONS, package_folder=checkout) is not None
+    with open(knit_json, "a") as file:
+        file.write("\n")
+    clear_resource_cache()
+    assert read_resource(INSTRUCTIONS, bundle, checkout) is None
+    assert read_resource(INSTRUCTION_SVGS, bundle, checkout) is not None
+
+
+def test_modification_times_do_not_matter_in_a_checkout(checkout, knit_json):
+    bundle = build_resource_bundle(package_folder=checkout)
+    os.utime(knit_json, ns=(0, 0))
+    assert read_resource(INSTRUCTIONS, bundle, checkout) is not None
+
+
+def test_installed_bundle_is_trusted(package_folder, knit_json):
+    bundle = build_resource_bundle(package_folder=package_folder)
+    os.utime(knit_json, ns=(0, 0))
+    with open(knit_json, "a") as file:
+        file.write("\n")
+    assert read_resource(INSTRUCTIONS, bundle, package_folder) is not None
+
+
+def test_bundle_is_read_without_folders(package_folder):
+    bundle = build_resource_bundle(package_folder=package_folder)
+    shutil.rmtree(os.path.join(package_folder, RESOURCE_FOLDERS[INSTRUCTIONS]))
+    assert read_resource(INSTRUCTIONS, bundle, package_folder) is not None
+
+
+def test_default_instructions_from_bundle(bundled):
+    instructions = DefaultInstructions()
+    assert instructions["knit"]["title"]["en-en"] == "Knit"
+    assert instructions["yo"]["number of consumed meshes"] == 0
+
+
+def test_folders_are_loaded_without_bundle(bundled, monkeypatch):
+    monkeypatch.setattr(InstructionLibrary, "read_resource",
+                        lambda name: None)
+    assert DefaultInstructions().loaded_types == []
+
+
+@mark.parametrize("type_", ["knit", "not a bundled type"])
+def test_svgs_from_bundle_are_the_same(bundle, monkeypatch, type_):
+    instruction = Instruction({"type": type_, "color": "red"})
+    expected = default_instructions_to_svg().instruction_to_svg(instruction)
+    monkeypatch.setattr(InstructionToSVG, "read_resource",
+                        partial(read_resource, path=bundle))
+    monkeypatch.setattr(InstructionToSVG, "DEFAULT_SVG_FOLDER",
+                        "missing-folder")
+    instruction_to_svg = default_instructions_to_svg()
+    assert instruction_to_svg.has_svg_for_instruction(instruction) == \
+        (type_ == "knit")
+    assert instruction_to_svg.instruction_to_svg(instruction) == expected
+    assert instruction_to_svg.instruction_to_svg(instruction) == expected
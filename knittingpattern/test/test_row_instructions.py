@@ -279,3 +279,58 @@ class TestInstructionColors(object):
         for instruction in specs:
             row.instructions.append(instruction)
         assert row.instruction_colors == result
+
+
+class TestInstructionColorsAreUpdated(object):
+
+    """Test that Row.instruction_colors follows the changes of a row."""
+
+    @fixture
+    def row(self):
+        row = Row("id", {"color": "green"}, default_parser())
+        for color in ["red", None, "blue", "red"]:
+            row.instructions.append({"color": color} if color else {})
+        return row
+
+    def expected_colors(self, row):
+        colors = []
+        for instruction in row.instructions:
+            if instruction.color not in colors:
+                colors.append(instruction.color)
+        return colors
+
+    @pytest.mark.parametrize("change", [
+        lambda instructions: instructions.append({"color": "yellow"}),
+        lambda instructions: instructions.append({"color": "red"}),
+        lambda instructions: instructions.insert(0, {"color": "blue"}),
+        lambda instructions: instructions.insert(2, {"color": "yellow"}),
+        lambda instructions: instructions.pop(),
+        lambda instructions: instructions.pop(0),
+        lambda instructions: instructions.pop(2),
+        lambda instructions: instructions.extend([{}, {"color": "black"}]),
+        lambda instructions: instructions.__delitem__(slice(1, 3))])
+    def test_change(self, row, change):
+        assert row.instruction_colors == ["red", "green", "blue"]
+        change(row.instructions)
+        assert row.instruction_colors == self.expected_colors(row)
+        counts = {}
+        for instruction in row.instructions:
+            counts[instruction.color] = counts.get(instruction.color, 0) + 1
+        assert row.instruction_color_counts == counts
+
+    def test_batch(self, row):
+        row.instruction_colors
+        with row.batch() as instructions:
+            instructions[1:3] = [{"color": "black"}]
+        assert row.instruction_colors == ["red", "black"]
+        assert row.instruction_color_counts == {"red": 2, "black": 1}
+
+    def test_counts(self, row):
+        assert row.instruction_color_counts == \
+            {"red": 2, "green": 1, "blue": 1}
+
+    def test_result_is_a_copy(self, row):
+        row.instruction_colors.append("black")
+        row.instruction_color_counts["black"] = 1
+        assert row.instruction_colors == ["red", "green", "blue"]
+        assert "black" not in row.instruction_color_counts
@@ -0,0 +1,275 @@
+"""Download urls from a local server."""
+from pytest import fixture, raises, mark
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from knittingpattern import load_from
+from knittingpattern.URLFetcher import URLFetcher
+from test_async import cafe_path, loop
+import os
+import time
+
+ETAG = '"version-1"'
+
+
+class Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, content):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.content = content
+        self.requests = []
+        self.clients = set()
+        self.active = 0
+        self.maximum_active = 0
+        self.lock = Lock()
+        self.delay = 0
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}".format(self.server_address[1])
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.clients.add(self.client_address)
+            server.active += 1
+            server.maximum_active = max(server.active, server.maximum_active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+        if self.path == "/redirect":
+            self.answer(302, b"", {"Location": "/pattern"})
+        elif self.path == "/missing":
+            self.answer(404, b"not found")
+        elif self.headers.get("If-None-Match") == ETAG:
+            self.answer(304, b"")
+        else:
+            self.answer(200, server.content, {"ETag": ETAG})
+
+    def answer(self, status, content, headers={}):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@fixture
+def content(cafe_path):
+    with open(cafe_path, "rb") as file:
+        return file.read()
+
+
+@fixture
+def server(content):
+    server = Server(content)
+    thread = Thread(target=server.serve_forever, args=(0.01,),
+                    daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@fixture
+def fetcher():
+    fetcher = URLFetcher()
+    yield fetcher
+    fetcher.close()
+
+
+@fixture
+def cached_fetcher(tmpdir):
+    fetcher = URLFetcher(cache_folder=tmpdir.join("cache").strpath)
+    yield fetcher
+    fetcher.close()
+
+
+def test_download(server, fetcher, content):
+    assert fetcher.url(server.url + "/pattern") == content
+
+
+def test_connection_is_reused(server, fetcher):
+    for _ in range(3):
+        fetcher.url(server.url + "/pattern")
+    assert len(server.requests) == 3
+    assert len(server.clients) == 1
+    assert fetcher.number_of_connections == 1
+
+
+def test_closed_connection_is_opened_again(server, fetcher, content):
+    fetcher.url(server.url + "/pattern")
+    key, connections = fetcher._idle_connections.popitem()
+    for connection in connections:
+        connection.sock.close()
+        fetcher._put_connection(key, connection)
+    assert fetcher.url(server.url + "/pattern") == content
+
+
+def test_redirect(server, fetcher, content):
+    assert fetcher.url(server.url + "/redirect") == content
+    assert [path for path, _ in server.requests] == ["/redirect", "/pattern"]
+
+
+def test_missing(server, fetcher):
+    with raises(HTTPError) as error:
+        fetcher.url(server.url + "/missing")
+    assert error.value.code == 404
+
+
+def test_no_validation_without_cache(server, fetcher):
+    fetcher.url(server.url + "/pattern")
+    fetcher.url(server.url + "/pattern")
+    assert "If-None-Match" not in server.requests[1][1]
+
+
+def test_unchanged_content_is_loaded_from_the_cache(
+        server, cached_fetcher, content):
+    assert cached_fetcher.url(server.url + "/pattern") == content
+    assert cached_fetcher.url(server.url + "/pattern") == content
+    assert server.requests[1][1]["If-None-Match"] == ETAG
+
+
+def test_cache_is_shared_between_fetchers(server, cached_fetcher, content):
+    cached_fetcher.url(server.url + "/pattern")
+    fetcher = URLFetcher(cache_folder=cached_fetcher.cache_folder)
+    assert fetcher.url(server.url + "/pattern") == content
+    assert server.requests[1][1]["If-None-Match"] == ETAG
+
+
+def test_concurrent_saves_of_the_same_url(cached_fetcher, content):
+    url = "http://patterns.example/pattern"
+    headers = {"etag": ETAG}
+
+    def save(_):
+        cached_fetcher._save_to_cache(url, headers, content)
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(save, range(32)))
+    files = os.listdir(cached_fetcher.cache_folder)
+    assert [os.path.splitext(file)[1] for file in files] == [".response"]
+    assert cached_fetcher._load_from_cache(url) == \
+        ({"If-None-Match": ETAG}, content)
+
+
+def test_validators_and_content_are_saved_together(cached_fetcher):
+    url = "http://patterns.example/pattern"
+    versions = [({"etag": '"version-{}"'.format(i)},
+                 "content {}".format(i).encode()) for i in range(16)]
+
+    def save(version):
+        cached_fetcher._save_to_cache(url, *version)
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(save, versions * 4))
+    headers, content = cached_fetcher._load_from_cache(url)
+    assert content == headers["If-None-Match"].replace(
+        '"version-', "content ").rstrip('"').encode()
+
+
+@mark.parametrize("cache_control", ["no-store", "private, No-Store"])
+def test_no_store_responses_are_not_cached(cached_fetcher, cache_control):
+    url = "http://patterns.example/pattern"
+    cached_fetcher._save_to_cache(
+        url, {"etag": ETAG, "cache-control": cache_control}, b"secret")
+    assert cached_fetcher._load_from_cache(url) is None
+
+
+def test_responses_with_credentials_are_not_cached(server, cached_fetcher):
+    url = server.url.replace("//", "//user:password@") + "/pattern"
+    cached_fetcher.url(url)
+    assert cached_fetcher._load_from_cache(url) is None
+    assert not os.path.exists(cached_fetcher.cache_folder)
+
+
+def test_bulk_download_is_bounded(server, content):
+    server.delay = 0.05
+    fetcher = URLFetcher(max_concurrent_downloads=2)
+    urls = [server.url + "/pattern?{}".format(i) for i in range(6)]
+    assert fetcher.urls(urls) == [content] * 6
+    assert server.maximum_active <= 2
+    assert fetcher.number_of_connections <= 2
+    fetcher.close()
+
+
+def test_user_and_password_are_sent(server, fetcher, content):
+    url = server.url.replace("//", "//user:pass%20word@") + "/pattern"
+    assert fetcher.url(url) == content
+    headers = server.requests[0][1]
+    assert headers["Authorization"] == "Basic dXNlcjpwYXNzIHdvcmQ="
+    assert headers["Host"] == server.url[7:]
+
+
+def test_http_proxy(server, content):
+    proxy = server.url.replace("//", "//proxy:secret@")
+    fetcher = URLFetcher(proxies={"http": proxy})
+    assert fetcher.url("http://patterns.example/pattern") == content
+    path, headers = server.requests[0]
+    assert path == "http://patterns.example/pattern"
+    assert headers["Host"] == "patterns.example"
+    assert headers["Proxy-Authorization"] == "Basic cHJveHk6c2VjcmV0"
+    fetcher.close()
+
+
+def test_no_proxy(server, content, monkeypatch):
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    fetcher = URLFetcher(proxies={"http": "http://127.0.0.1:1"})
+    assert fetcher.url(server.url + "/pattern") == content
+    fetcher.close()
+
+
+def test_https_is_tunneled_through_the_proxy():
+    fetcher = URLFetcher(proxies={"https": "http://u:p@proxy.example:3128"})
+    key, path, _ = fetcher._route("https://patterns.example/a?b", {})
+    assert key == ("https", "proxy.example:3128",
+                   ("patterns.example", None, "Basic dTpw"))
+    assert path == "/a?b"
+    connection = fetcher._new_connection(key)
+    assert (connection.host, connection.port) == ("proxy.example", 3128)
+
+
+def test_proxies_of_the_environment(monkeypatch):
+    monkeypatch.setenv("http_proxy", "http://proxy.example:8080")
+    assert URLFetcher()._proxies["http"] == "http://proxy.example:8080"
+
+
+def test_other_schemes_use_urllib(fetcher, cafe_path, content):
+    assert fetcher.url("file://" + cafe_path) == content
+
+
+def test_loader_urls(server, fetcher, cafe_path):
+    urls = [server.url + "/pattern", server.url + "/redirect"]
+    patterns = load_from().urls(urls, fetcher=fetcher)
+    expected = load_from().path(cafe_path).patterns.at(0).id
+    assert [pattern.patterns.at(0).id for pattern in patterns] == \
+        [expected, expected]
+
+
+def test_loader_url(server, cafe_path):
+    loaded = load_from().url(server.url + "/pattern")
+    assert loaded.patterns.at(0).id == \
+        load_from().path(cafe_path).patterns.at(0).id
+
+
+def test_loader_aurl(server, fetcher, cafe_path, loop):
+    async def load():
+        return await load_from().aurl(server.url + "/pattern",
+                                      fetcher=fetcher)
+    loaded = loop.run_until_complete(load())
+    assert loaded.patterns.at(0).id == \
+        load_from().path(cafe_path).patterns.at(0).id
+    assert fetcher.number_of_connections == 1
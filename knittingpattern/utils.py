@@ -22,4 +22,28 @@ def unique(iterables):
             if not included(element)]
 
 
-__all__ = ["unique"]
+def run_in_executor(function, *args, executor=None):
+    """Call a function in an executor of the running :mod:`asyncio` loop.
+
+    :param function: the function to call as ``function(*args)``
+    :param args: the arguments of the :paramref:`function`
+    :param concurrent.futures.Executor executor: the executor to call the
+      :paramref:`function` in or :obj:`None` to use the default executor of
+      the event loop
+    :return: an :class:`asyncio.Future` for the result of the
+      :paramref:`function`
+
+    Call this function while the event loop is running, e.g. in a
+    coroutine. While the :paramref:`function` is running, the event loop can
+    run other tasks.
+
+    .. code:: python
+
+        result = await run_in_executor(function, 1, 2)
+    """
+    import asyncio
+    get_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+    return get_loop().run_in_executor(executor, function, *args)
+
+
+__all__ = ["unique", "run_in_executor"]
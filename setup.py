@@ -9,7 +9,8 @@ import subprocess
 PACKAGE_NAME = "knittingpattern"
 PACKAGE_NAMES = [
         "knittingpattern",
-        "knittingpattern.convert", "knittingpattern.convert.test"
+        "knittingpattern.convert", "knittingpattern.convert.test",
+        "knittingpattern.benchmark", "knittingpattern.benchmark.test"
     ]
 
 HERE = os.path.abspath(os.path.dirname(__file__))
@@ -98,6 +99,27 @@ class LintCommand(TestCommandBase):
         Run(self.TEST_ARGS)
 
 
+# command for building the resource bundle
+
+
+class BuildResourcesCommand(Command):
+
+    description = "bundle the default instructions and svgs into one file "\
+        "which is faster to load."
+    user_options = []
+    name = "build_resources"
+
+    def initialize_options(self):
+        pass
+
+    def finalize_options(self):
+        pass
+
+    @staticmethod
+    def run():
+        from knittingpattern.resources import build_resource_bundle
+        print("built", build_resource_bundle())
+
 # command for linking
 
 
@@ -275,6 +297,7 @@ SETUPTOOLS_METADATA = dict(
         "lint": LintCommand,
         "link": LinkIntoSitePackagesCommand,
         PrintRequiredPackagesCommand.name: PrintRequiredPackagesCommand,
+        BuildResourcesCommand.name: BuildResourcesCommand,
         TagAndDeployCommand.name: TagAndDeployCommand
         },
 )